@@ -0,0 +1,231 @@
+"""Модуль контроля допуска запросов к базе данных.
+
+Чтения и записи получают раздельные бюджеты: ограничение числа
+одновременных запросов по емкости пула с ограниченной очередью
+ожидания и сроком ожидания, а также ограничение частоты запросов
+каждого клиента (token bucket). Запрос сверх бюджета сразу получает
+503 или 429 с заголовком Retry-After, а не ждет соединения из пула.
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.config import Settings, get_settings
+
+
+class Rejected(Exception):
+    """Запрос не допущен; retry_after — рекомендуемая пауза в секундах."""
+
+    def __init__(self, retry_after: float):
+        """Инициализация класса Rejected."""
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """Ограничение одновременных запросов с очередью и сроком ожидания.
+
+    Освободившееся место передается первому ожидающему, поэтому
+    очередь обслуживается по порядку поступления.
+    """
+
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        """Инициализация класса ConcurrencyLimiter."""
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        """Занимает место или ждет его не дольше timeout."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            raise Rejected(self.timeout)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                self.timeouts += 1
+                raise Rejected(self.timeout)
+            raise
+        self.admitted += 1
+
+    def release(self) -> None:
+        """Освобождает место или передает его первому ожидающему."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        """Возвращает заполненность и счетчики отказов."""
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": len(self._waiters),
+            "queue_size": self.queue_size,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+        }
+
+
+class TokenBucketLimiter:
+    """Ограничение частоты запросов по клиентам.
+
+    Для каждого клиента хранится ведро на burst запросов, которое
+    пополняется со скоростью rate в секунду. Хранится не больше
+    max_clients ведер, давно не использованные вытесняются.
+    """
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000):
+        """Инициализация класса TokenBucketLimiter."""
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_clients = max_clients
+        self.limited = 0
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def take(self, key: str) -> float:
+        """Берет маркер клиента.
+
+        Возвращает 0, если запрос допущен, иначе время в секундах
+        до появления маркера.
+        """
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+            self.limited += 1
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class AdmissionBudget:
+    """Бюджет допуска одного класса запросов (чтения или записи)."""
+
+    def __init__(self, name: str,
+                 concurrency: Optional[ConcurrencyLimiter] = None,
+                 rate: Optional[TokenBucketLimiter] = None):
+        """Инициализация класса AdmissionBudget."""
+        self.name = name
+        self.concurrency = concurrency
+        self.rate = rate
+
+    @asynccontextmanager
+    async def admit(self, client: str) -> AsyncIterator[None]:
+        """Допускает запрос клиента на время контекста.
+
+        Превышение частоты отклоняется с 429, нехватка мест —
+        с 503; в обоих случаях передается Retry-After.
+        """
+        if self.rate is not None:
+            wait = self.rate.take(client)
+            if wait:
+                raise _rejection(status.HTTP_429_TOO_MANY_REQUESTS, wait)
+        if self.concurrency is None:
+            yield
+            return
+        try:
+            await self.concurrency.acquire()
+        except Rejected as exc:
+            raise _rejection(
+                status.HTTP_503_SERVICE_UNAVAILABLE, exc.retry_after)
+        try:
+            yield
+        finally:
+            self.concurrency.release()
+
+    def stats(self) -> dict:
+        """Возвращает состояние бюджета."""
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency.stats()
+            if self.concurrency is not None else None,
+            "rate_limited": self.rate.limited if self.rate is not None else 0,
+        }
+
+
+def create_budgets(settings: Settings) -> tuple[AdmissionBudget, ...]:
+    """Создает бюджеты чтений и записей по настройкам.
+
+    Без явных лимитов емкость пула основной базы делится между
+    записями и чтениями, а пулы реплик целиком отдаются чтениям.
+    """
+    capacity = settings.worker_pool_size + settings.worker_max_overflow
+    write_limit = settings.admission_write_limit or max(capacity // 2, 1)
+    read_limit = settings.admission_read_limit or (
+        max(capacity - write_limit, 1)
+        + capacity * len(settings.database_replica_urls))
+    timeout = settings.admission_timeout_ms / 1000
+    budgets = []
+    for name, limit, rps in (
+            ("read", read_limit, settings.rate_limit_read_rps),
+            ("write", write_limit, settings.rate_limit_write_rps)):
+        concurrency = ConcurrencyLimiter(
+            limit, settings.admission_queue_size, timeout
+        ) if settings.admission_control else None
+        rate = TokenBucketLimiter(
+            rps, settings.rate_limit_burst or rps) if rps else None
+        budgets.append(AdmissionBudget(name, concurrency, rate))
+    return tuple(budgets)
+
+
+def client_key(request: Request) -> str:
+    """Ключ клиента для ограничения частоты: его адрес."""
+    return request.client.host if request.client else "unknown"
+
+
+def _rejection(status_code: int, retry_after: float) -> HTTPException:
+    """Ответ об отказе в допуске с заголовком Retry-After."""
+    return HTTPException(
+        status_code=status_code,
+        detail="Too many requests"
+        if status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        else "Server is overloaded",
+        headers={"Retry-After": str(max(math.ceil(retry_after), 1))}
+    )
+
+
+read_budget, write_budget = create_budgets(get_settings())
+
+
+async def admit_read(request: Request):
+    """Зависимость FastAPI: допуск запроса чтения."""
+    async with read_budget.admit(client_key(request)):
+        yield
+
+
+async def admit_write(request: Request):
+    """Зависимость FastAPI: допуск запроса записи."""
+    async with write_budget.admit(client_key(request)):
+        yield
@@ -0,0 +1,70 @@
+"""Команда переноса давно завершенных задач в архив.
+
+Задачи в статусе completed, завершенные раньше окна хранения,
+переносятся в таблицу tasks_archive пакетами ограниченного размера,
+каждый пакет — отдельной транзакцией. Запуск однократно или
+периодически:
+
+    python -m app.archive
+    python -m app.archive --retention-days 7 --interval 3600
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import timedelta
+
+from app import crud, models
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+async def archive_once(retention_days: float, batch_size: int,
+                       session_factory=AsyncSessionLocal) -> int:
+    """Переносит в архив все подходящие задачи и возвращает их число."""
+    completed_before = models.utcnow() - timedelta(days=retention_days)
+    total = 0
+    try:
+        while True:
+            async with session_factory() as session:
+                moved = await crud.TaskCRUD(session).archive_completed(
+                    completed_before, batch_size)
+            total += moved
+            if moved < batch_size:
+                break
+    finally:
+        # Одно событие reset на весь перенос, а не на каждый пакет.
+        if total:
+            async with session_factory() as session:
+                await crud.TaskCRUD(session).publish_reset()
+    logger.info("Archived %d tasks completed before %s",
+                total, completed_before.isoformat())
+    return total
+
+
+async def run(retention_days: float, batch_size: int, interval: float = 0):
+    """Выполняет перенос один раз или с заданным интервалом в секундах."""
+    while True:
+        await archive_once(retention_days, batch_size)
+        if not interval:
+            return
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Archive completed tasks")
+    parser.add_argument(
+        "--retention-days", type=float,
+        default=settings.archive_retention_days,
+        help="archive tasks completed more than N days ago")
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.archive_batch_size)
+    parser.add_argument(
+        "--interval", type=float, default=0,
+        help="repeat every N seconds instead of running once")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(args.retention_days, args.batch_size, args.interval))
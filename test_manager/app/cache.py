@@ -0,0 +1,366 @@
+"""Модуль кэша чтения задач с инвалидацией при записи."""
+
+import json
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Optional, Protocol
+from uuid import UUID
+
+from app import models
+from app.config import Settings, get_settings
+
+try:
+    from redis import asyncio as redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+TASK_CACHE_SIZE = 10000
+TASK_CACHE_TTL = 30.0
+
+TOMBSTONE_VERSION = sys.maxsize
+
+
+class CacheBackend(ABC):
+    """Базовый класс хранилища кэша.
+
+    Значения — JSON-совместимые словари с полем version. Запись
+    с версией меньше уже сохраненной отбрасывается, поэтому медленный
+    читатель не может вытеснить более свежие данные писателя.
+    """
+
+    def __init__(self):
+        """Инициализация счетчиков кэша."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[dict]:
+        """Возвращает значение по ключу или None."""
+
+    @abstractmethod
+    async def set(self, key: str, value: dict) -> None:
+        """Сохраняет значение, если оно не старее сохраненного."""
+
+    @abstractmethod
+    async def peek_many(self, keys: list[str]) -> dict[str, dict]:
+        """Возвращает найденные значения ключей без учета в статистике."""
+
+    @abstractmethod
+    async def put_many(self, values: dict[str, dict]) -> None:
+        """Сохраняет значения без сравнения версий."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Очищает кэш."""
+
+    def stats(self) -> dict:
+        """Возвращает счетчики попаданий, промахов и вытеснений."""
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class LRUCache(CacheBackend):
+    """Внутрипроцессный LRU-кэш с ограничением размера и TTL."""
+
+    def __init__(self, maxsize: int = TASK_CACHE_SIZE,
+                 ttl: float = TASK_CACHE_TTL):
+        """Инициализация класса LRUCache."""
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[dict]:
+        """Возвращает значение по ключу или None."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            del self._entries[key]
+            self.evictions += 1
+            entry = None
+        if entry is None or entry[1]["version"] == TOMBSTONE_VERSION:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    async def set(self, key: str, value: dict) -> None:
+        """Сохраняет значение, если оно не старее сохраненного."""
+        entry = self._entries.get(key)
+        if (entry is not None and entry[0] >= time.monotonic()
+                and entry[1]["version"] > value["version"]):
+            return
+
+        await self.put_many({key: value})
+
+    async def peek_many(self, keys: list[str]) -> dict[str, dict]:
+        """Возвращает найденные значения ключей без учета в статистике."""
+        now = time.monotonic()
+        return {
+            key: entry[1] for key in keys
+            if (entry := self._entries.get(key)) is not None
+            and entry[0] >= now
+        }
+
+    async def put_many(self, values: dict[str, dict]) -> None:
+        """Сохраняет значения без сравнения версий."""
+        expires = time.monotonic() + self.ttl
+        for key, value in values.items():
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def clear(self) -> None:
+        """Очищает кэш."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Возвращает счетчики и заполненность кэша."""
+        return {
+            **super().stats(),
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+
+class SharedCacheClient(Protocol):
+    """Интерфейс клиента общего хранилища (например, Redis)."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Возвращает значение по ключу."""
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Сохраняет значение на ttl секунд."""
+
+    async def delete(self, key: str) -> None:
+        """Удаляет значение по ключу."""
+
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        """Возвращает значения ключей одним запросом."""
+
+    async def set_many(self, values: dict[str, bytes], ttl: float) -> None:
+        """Сохраняет значения на ttl секунд одним запросом."""
+
+
+class SharedCache(CacheBackend):
+    """Кэш поверх общего хранилища, видимый всем процессам.
+
+    Сравнение версий выполняется на стороне приложения и не атомарно,
+    поэтому TTL ограничивает время жизни возможного устаревания.
+    """
+
+    def __init__(self, client: SharedCacheClient, ttl: float = TASK_CACHE_TTL,
+                 prefix: str = "task:"):
+        """Инициализация класса SharedCache."""
+        super().__init__()
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self._keys: set[str] = set()
+
+    async def get(self, key: str) -> Optional[dict]:
+        """Возвращает значение по ключу или None."""
+        raw = await self.client.get(self.prefix + key)
+        value = json.loads(raw) if raw is not None else None
+        if value is None or value["version"] == TOMBSTONE_VERSION:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: dict) -> None:
+        """Сохраняет значение, если оно не старее сохраненного."""
+        raw = await self.client.get(self.prefix + key)
+        if raw is not None and json.loads(raw)["version"] > value["version"]:
+            return
+        self._keys.add(key)
+        await self.client.set(
+            self.prefix + key, json.dumps(value).encode(), self.ttl)
+
+    async def peek_many(self, keys: list[str]) -> dict[str, dict]:
+        """Возвращает найденные значения ключей без учета в статистике."""
+        raws = await self.client.get_many([self.prefix + key for key in keys])
+        return {
+            key: json.loads(raw) for key, raw in zip(keys, raws)
+            if raw is not None
+        }
+
+    async def put_many(self, values: dict[str, dict]) -> None:
+        """Сохраняет значения без сравнения версий."""
+        self._keys.update(values)
+        await self.client.set_many({
+            self.prefix + key: json.dumps(value).encode()
+            for key, value in values.items()
+        }, self.ttl)
+
+    async def clear(self) -> None:
+        """Удаляет ключи, записанные этим процессом."""
+        for key in self._keys:
+            await self.client.delete(self.prefix + key)
+        self._keys.clear()
+
+
+class InMemorySharedClient:
+    """Локальная замена общего хранилища для тестов и разработки."""
+
+    def __init__(self):
+        """Инициализация класса InMemorySharedClient."""
+        self._data: dict[str, tuple[float, bytes]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Возвращает значение по ключу."""
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Сохраняет значение на ttl секунд."""
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    async def delete(self, key: str) -> None:
+        """Удаляет значение по ключу."""
+        self._data.pop(key, None)
+
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        """Возвращает значения ключей одним запросом."""
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, values: dict[str, bytes], ttl: float) -> None:
+        """Сохраняет значения на ttl секунд одним запросом."""
+        for key, value in values.items():
+            await self.set(key, value, ttl)
+
+
+class RedisCacheClient:
+    """Клиент общего хранилища поверх redis.asyncio."""
+
+    def __init__(self, url: str):
+        """Инициализация класса RedisCacheClient."""
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires redis package")
+        self.client = redis.Redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Возвращает значение по ключу."""
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Сохраняет значение на ttl секунд."""
+        await self.client.set(key, value, px=max(int(ttl * 1000), 1))
+
+    async def delete(self, key: str) -> None:
+        """Удаляет значение по ключу."""
+        await self.client.delete(key)
+
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        """Возвращает значения ключей одним запросом MGET."""
+        return await self.client.mget(keys)
+
+    async def set_many(self, values: dict[str, bytes], ttl: float) -> None:
+        """Сохраняет значения на ttl секунд одним конвейером."""
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in values.items():
+                pipe.set(key, value, px=max(int(ttl * 1000), 1))
+            await pipe.execute()
+
+
+class TaskCache:
+    """Кэш задач по UUID поверх выбранного хранилища."""
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        """Инициализация класса TaskCache."""
+        self.backend = backend or LRUCache()
+
+    async def get(self, task_uuid: UUID) -> Optional[models.Task]:
+        """Возвращает задачу из кэша без привязки к сессии."""
+        value = await self.backend.get(str(task_uuid))
+        return _load(value) if value is not None else None
+
+    async def set(self, task: models.Task) -> None:
+        """Сохраняет актуальное состояние задачи."""
+        await self.backend.set(str(task.uuid), _dump(task))
+
+    async def patch_many(
+            self, rows: list[tuple[UUID, int, dict[str, Any]]]) -> None:
+        """Обновляет поля сохраненных задач до новых версий.
+
+        rows — тройки (UUID, версия, поля). Задачи без записи в кэше
+        пропускаются, а запись не предыдущей версии заменяется меткой
+        удаления. Чтение и запись выполняются по одному разу на вызов.
+        """
+        versions = {str(task_uuid): (version, values)
+                    for task_uuid, version, values in rows}
+        cached = await self.backend.peek_many(list(versions))
+        updates = {}
+        for key, value in cached.items():
+            version, values = versions[key]
+            if value["version"] == version - 1:
+                updates[key] = {**value, **values, "version": version}
+            elif value["version"] != TOMBSTONE_VERSION:
+                updates[key] = {"version": TOMBSTONE_VERSION}
+        if updates:
+            await self.backend.put_many(updates)
+
+    async def invalidate(self, task_uuid: UUID) -> None:
+        """Помечает задачу удаленной, вытесняя любые старые версии."""
+        await self.backend.set(
+            str(task_uuid), {"version": TOMBSTONE_VERSION})
+
+    def stats(self) -> dict:
+        """Возвращает статистику хранилища."""
+        return self.backend.stats()
+
+
+def _dump(task: models.Task) -> dict[str, Any]:
+    """Преобразует задачу в JSON-совместимый словарь."""
+    return {
+        "uuid": str(task.uuid),
+        "title": task.title,
+        "description": task.description,
+        "status": task.status.value,
+        "created_at": task.created_at.isoformat(),
+        "version": task.version,
+        "updated_at": task.updated_at.isoformat(),
+    }
+
+
+def _load(value: dict[str, Any]) -> models.Task:
+    """Восстанавливает задачу из словаря кэша."""
+    return models.Task(
+        uuid=UUID(value["uuid"]),
+        title=value["title"],
+        description=value["description"],
+        status=models.TaskStatus(value["status"]),
+        created_at=datetime.fromisoformat(value["created_at"]),
+        version=value["version"],
+        updated_at=datetime.fromisoformat(value["updated_at"]),
+    )
+
+
+def create_task_cache(settings: Settings) -> TaskCache:
+    """Создает кэш задач по настройкам приложения.
+
+    Внутрипроцессный кэш годится только для одного рабочего
+    процесса: записи других процессов его не инвалидируют.
+    """
+    if settings.cache_backend == "redis":
+        return TaskCache(SharedCache(RedisCacheClient(settings.cache_url)))
+    if settings.cache_backend != "local":
+        raise ValueError(f"Unknown cache backend: {settings.cache_backend}")
+    return TaskCache()
+
+
+task_cache = create_task_cache(get_settings())
@@ -0,0 +1,107 @@
+"""Модуль объединения конкурентных созданий задач в одну транзакцию.
+
+Запросы на создание, пришедшие в пределах короткого окна, вставляются
+одним многострочным INSERT и одной фиксацией на одном соединении.
+Каждый вызывающий получает свою задачу или свою ошибку.
+"""
+
+import asyncio
+from typing import Optional
+
+from app import crud, models, schemas
+from app.metrics import http_metrics
+
+COALESCE_WINDOW_MS = 2.0
+COALESCE_MAX_BATCH = 100
+
+Pending = tuple[dict, asyncio.Future]
+
+
+class TaskCreateCoalescer:
+    """Групповая фиксация созданий задач.
+
+    Первый запрос пакета запускает таймер окна. Пакет уходит в базу
+    по истечении окна или сразу при наборе max_batch элементов. Если
+    общая вставка не удалась, элементы вставляются по одному, чтобы
+    ошибка одной задачи не влияла на остальные.
+    """
+
+    def __init__(self, session_factory,
+                 window_ms: float = COALESCE_WINDOW_MS,
+                 max_batch: int = COALESCE_MAX_BATCH):
+        """Инициализация класса TaskCreateCoalescer."""
+        self.session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: list[Pending] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def create_task(self, task: schemas.TaskCreate) -> models.Task:
+        """Ставит задачу в текущий пакет и ждет ее фиксации."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((task.dict(), future))
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._start_flush)
+        return await future
+
+    async def drain(self) -> None:
+        """Отправляет накопленный пакет и ждет завершения всех записей."""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _start_flush(self) -> None:
+        """Забирает накопленный пакет и запускает его запись."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            flush = asyncio.create_task(self._flush(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[Pending]) -> None:
+        """Записывает пакет одной транзакцией.
+
+        insert_tasks не завершается ошибкой после фиксации (ошибки
+        кэша и ленты событий записываются в журнал), поэтому запись
+        по одному выполняется, только если не удались INSERT или
+        фиксация, и повторно не вставляет зафиксированные строки.
+        """
+        http_metrics.write_batch_size.observe(("create",), len(batch))
+        try:
+            async with self.session_factory() as session:
+                task_crud = crud.TaskCRUD(session)
+                try:
+                    tasks = await task_crud.insert_tasks(
+                        [row for row, _ in batch])
+                except Exception:
+                    await session.rollback()
+                    await self._flush_each(task_crud, batch)
+                    return
+                for (_, future), db_task in zip(batch, tasks):
+                    if not future.done():
+                        future.set_result(db_task)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+
+    async def _flush_each(self, task_crud: crud.TaskCRUD,
+                          batch: list[Pending]) -> None:
+        """Записывает элементы пакета по одному после общей ошибки."""
+        for row, future in batch:
+            try:
+                db_task, = await task_crud.insert_tasks([row])
+            except Exception as exc:
+                await task_crud.db.rollback()
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(db_task)
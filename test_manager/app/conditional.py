@@ -0,0 +1,93 @@
+"""Модуль условных HTTP-запросов (ETag, If-Match) для задач."""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from app import models
+
+
+def task_etag(task: models.Task) -> str:
+    """Возвращает сильный ETag задачи по номеру ее версии."""
+    return version_etag(task.version)
+
+
+def task_headers(task: models.Task) -> dict[str, str]:
+    """Возвращает заголовки ETag и Last-Modified задачи."""
+    return {
+        "ETag": task_etag(task),
+        "Last-Modified": last_modified(task.updated_at),
+    }
+
+
+def version_etag(version: int) -> str:
+    """Возвращает сильный ETag по номеру версии задачи."""
+    return f'"{version}"'
+
+
+def collection_etag(version: str, variant: Optional[str] = None) -> str:
+    """Возвращает сильный ETag списка задач по метке состояния коллекции.
+
+    variant различает представления одного списка в разных форматах.
+    """
+    if variant:
+        return f'"{version}-{variant}"'
+    return f'"{version}"'
+
+
+def last_modified(updated_at: datetime) -> str:
+    """Форматирует время изменения для заголовка Last-Modified."""
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return format_datetime(updated_at.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(
+        etag: str, if_none_match: Optional[str],
+        updated_at: Optional[datetime] = None,
+        if_modified_since: Optional[str] = None) -> bool:
+    """Проверяет, можно ли ответить 304 Not Modified.
+
+    If-None-Match сравнивается слабым сравнением и имеет приоритет;
+    If-Modified-Since учитывается только в его отсутствие.
+    """
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {
+            candidate.strip().removeprefix("W/")
+            for candidate in if_none_match.split(",")
+        }
+        return etag in candidates
+
+    if if_modified_since is None or updated_at is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return updated_at.replace(microsecond=0) <= since
+
+
+def parse_if_match(header: Optional[str]) -> Optional[list[int]]:
+    """Разбирает заголовок If-Match в список ожидаемых версий.
+
+    Возвращает None, если условие не задано или равно "*".
+    Слабые и нераспознанные ETag в сравнение не попадают.
+    """
+    if header is None or header.strip() == "*":
+        return None
+
+    versions = []
+    for etag in header.split(","):
+        etag = etag.strip()
+        if etag.startswith('"') and etag.endswith('"'):
+            try:
+                versions.append(int(etag[1:-1]))
+            except ValueError:
+                continue
+    return versions
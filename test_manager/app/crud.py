@@ -1,25 +1,53 @@
 """CRUD операций с задачами."""
 
-from typing import Optional
+import enum
+import hashlib
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable, Optional, Sequence
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import (
+    any_, bindparam, cast, delete, func, insert, literal, text, tuple_,
+    union_all, update
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import expression
 from sqlalchemy.future import select
 from uuid import UUID
-from app import models, schemas
+from app import models, permissions, schemas
+from app.cache import TaskCache, task_cache
+from app.events import (
+    CREATED, DELETED, RESET, UPDATED, EventBroker, task_events
+)
+from app.pagination import Cursor
+from app.search import scan_condition, search_condition
+
+logger = logging.getLogger(__name__)
 
 
 class TaskCRUD:
     """Класс для CRUD операций с задачами."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: Optional[TaskCache] = None,
+                 events: Optional[EventBroker] = None):
         """Инициализация класса TaskCRUD."""
         self.db = db
+        self.cache = cache or task_cache
+        self.events = events or task_events
 
     async def create_task(self, task: schemas.TaskCreate) -> models.Task:
         """Создает новую задачу в базе данных."""
-        db_task = models.Task(**task.dict())
+        db_task = models.Task(**_with_completed_at(task.dict()))
         self.db.add(db_task)
-        await self.db.commit()
+        await self._update_counters(Counter([_status_counter(task.status)]))
+        await self.db.flush()
         await self.db.refresh(db_task)
+        await self._commit([(CREATED, db_task)])
+        await self._update_cache([db_task])
         return db_task
 
     async def get_task(self, task_uuid: UUID) -> models.Task:
@@ -29,37 +57,973 @@ class TaskCRUD:
         )
         return result.scalar_one_or_none()
 
+    async def get_task_cached(self, task_uuid: UUID,
+                              loader=None) -> models.Task:
+        """Получает задачу через кэш; объект из кэша только для чтения."""
+        db_task = await self.cache.get(task_uuid)
+        if db_task is None:
+            if loader is not None:
+                db_task = await loader.load(task_uuid)
+            else:
+                db_task = await self.find_task(task_uuid)
+            if db_task is not None:
+                await self.cache.set(db_task)
+        return db_task
+
+    async def get_archived_task(
+            self, task_uuid: UUID) -> Optional[models.ArchivedTask]:
+        """Получает задачу из архива по UUID."""
+        result = await self.db.execute(
+            select(models.ArchivedTask)
+            .where(models.ArchivedTask.uuid == task_uuid)
+        )
+        return result.scalar_one_or_none()
+
+    async def find_task(self, task_uuid: UUID):
+        """Получает задачу по UUID из рабочей таблицы или из архива."""
+        db_task = await self.get_task(task_uuid)
+        if db_task is None:
+            db_task = await self.get_archived_task(task_uuid)
+        return db_task
+
+    async def get_tasks_by_uuids(self, uuids: Sequence[UUID]) -> dict:
+        """Получает задачи по UUID одним запросом к каждой таблице."""
+        found = {}
+        remaining = list(dict.fromkeys(uuids))
+        for model in (models.Task, models.ArchivedTask):
+            if not remaining:
+                break
+            result = await self.db.execute(
+                select(model).where(self._uuid_in(model.uuid, remaining)))
+            found.update((task.uuid, task) for task in result.scalars())
+            remaining = [uuid for uuid in remaining if uuid not in found]
+        return found
+
+    async def get_task_marker(self, task_uuid: UUID) -> Optional[tuple]:
+        """Получает маркер изменения задачи (version, updated_at)."""
+        db_task = await self.cache.get(task_uuid)
+        if db_task is not None:
+            return db_task.version, db_task.updated_at
+        for model in (models.Task, models.ArchivedTask):
+            result = await self.db.execute(
+                select(model.version, model.updated_at)
+                .where(model.uuid == task_uuid)
+            )
+            marker = result.one_or_none()
+            if marker is not None:
+                return marker
+        return None
+
+    async def get_task_fields(
+            self, task_uuid: UUID, fields: Sequence[str]) -> Optional[Any]:
+        """Получает поля fields задачи и ее маркер изменения."""
+        db_task = await self.cache.get(task_uuid)
+        if db_task is not None:
+            return db_task
+        for model in (models.Task, models.ArchivedTask):
+            result = await self.db.execute(
+                select(*(getattr(model, field) for field in fields),
+                       model.version, model.updated_at)
+                .where(model.uuid == task_uuid)
+            )
+            row = result.one_or_none()
+            if row is not None:
+                return row
+        return None
+
+    async def get_revision(self) -> int:
+        """Получает последний выделенный номер изменения коллекции."""
+        if self._dialect.name == "postgresql":
+            result = await self.db.execute(
+                text("SELECT last_value FROM task_revision_seq"))
+            return result.scalar_one()
+        result = await self.db.execute(
+            select(models.TaskCounter.value)
+            .where(models.TaskCounter.name == models.TaskCounter.REVISION)
+        )
+        return result.scalar_one_or_none() or 0
+
+    async def get_collection_version(self) -> str:
+        """Получает метку состояния коллекции задач для ETag списка."""
+        if self._dialect.name == "postgresql":
+            # Номер последовательности выделяется до фиксации, а снимок
+            # транзакций меняется с каждой фиксацией записи.
+            result = await self.db.execute(
+                text("SELECT pg_current_snapshot()::text"))
+            snapshot = result.scalar_one().encode()
+            return "s" + hashlib.blake2s(snapshot, digest_size=8).hexdigest()
+        return f"r{await self.get_revision()}"
+
     async def get_tasks(
-            self, skip: int = 0, limit: int = 100) -> list[models.Task]:
+            self, skip: int = 0, limit: int = 100,
+            after: Optional[Cursor] = None,
+            status: Optional[schemas.TaskStatus] = None,
+            search: Optional[str] = None
+    ) -> list[models.Task]:
         """Получает список задач с пагинацией."""
         result = await self.db.execute(
-            select(models.Task).offset(skip).limit(limit)
-        )
+            self._page_query(skip, limit, after, status, search))
         return result.scalars().all()
 
+    async def get_task_rows(
+            self, skip: int = 0, limit: int = 100,
+            after: Optional[Cursor] = None,
+            status: Optional[schemas.TaskStatus] = None,
+            search: Optional[str] = None,
+            include_archived: bool = False,
+            fields: Optional[Sequence[str]] = None
+    ) -> list[Row]:
+        """Получает страницу задач как строки только нужных колонок."""
+        if include_archived:
+            query = self._archived_page_query(
+                skip, limit, after, status, search, fields)
+        else:
+            query = self._page_query(
+                skip, limit, after, status, search,
+                _list_columns(models.Task, fields))
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def stream_tasks(
+            self, status: Optional[schemas.TaskStatus] = None,
+            yield_per: int = 1000, search: Optional[str] = None
+    ) -> AsyncIterator[list[Row]]:
+        """Потоково отдает строки задач порциями через серверный курсор."""
+        query = self._list_query(
+            status, search, LIST_COLUMNS
+        ).execution_options(yield_per=yield_per)
+        result = await self.db.stream(query)
+        try:
+            async for partition in result.partitions():
+                yield partition
+        finally:
+            await result.close()
+
     async def update_task(
             self, task_uuid: UUID,
-            task_update: schemas.TaskUpdate) -> Optional[models.Task]:
-        """Обновляет существующую задачу."""
-        db_task = await self.get_task(task_uuid)
-        if not db_task:
+            task_update: schemas.TaskUpdate,
+            expected_versions: Optional[list[int]] = None
+    ) -> Optional[models.Task]:
+        """Обновляет существующую задачу одним UPDATE ... RETURNING."""
+        update_data = task_update.dict(exclude_unset=True)
+        db_task = await self._update_row(
+            task_uuid, update_data, expected_versions)
+        if db_task is None:
+            db_task = await self._update_archived(
+                task_uuid, update_data, expected_versions)
+        return db_task
+
+    async def _update_archived(
+            self, task_uuid: UUID, update_data: dict,
+            expected_versions: Optional[list[int]]):
+        """Обновляет задачу архива под блокировкой ее строки."""
+        result = await self.db.execute(
+            select(models.ArchivedTask.status, models.ArchivedTask.version)
+            .where(models.ArchivedTask.uuid == task_uuid)
+            .with_for_update()
+        )
+        archived = result.one_or_none()
+        if archived is None:
+            # Параллельный запрос мог уже вернуть задачу из архива.
+            await self.db.rollback()
+            return await self._update_row(
+                task_uuid, update_data, expected_versions)
+        if _restores(archived, update_data, expected_versions):
+            await self._move_tasks(
+                models.ArchivedTask, models.Task, [task_uuid])
+            return await self._update_row(
+                task_uuid, update_data, expected_versions)
+        if update_data.get("status") not in (None, archived.status):
+            await self.db.rollback()
             return None
+        update_data = {
+            field: value for field, value in update_data.items()
+            if field != "status"
+        }
+        return await self._update_row(
+            task_uuid, update_data, expected_versions, models.ArchivedTask)
 
-        update_data = task_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_task, field, value)
+    async def _update_row(
+            self, task_uuid: UUID, update_data: dict,
+            expected_versions: Optional[list[int]], model=models.Task):
+        """Выполняет условный UPDATE задачи и фиксирует транзакцию."""
+        update_data = dict(update_data)
+        query = update(model).where(model.uuid == task_uuid)
+        returning = [model]
+        previous_status = None
 
-        self.db.add(db_task)
-        await self.db.commit()
-        await self.db.refresh(db_task)
+        if update_data.get("status") is not None:
+            allowed = [
+                models.TaskStatus(value) for value in
+                permissions.TaskPermissions.allowed_predecessors(
+                    update_data["status"])
+            ]
+            if self._dialect.name == "postgresql":
+                previous = (
+                    select(model.uuid, model.status)
+                    .where(model.uuid == task_uuid)
+                    .with_for_update()
+                    .subquery()
+                )
+                query = query.where(
+                    model.uuid == previous.c.uuid,
+                    model.status.in_(allowed)
+                )
+                returning.append(previous.c.status)
+            else:
+                # SQLite не разрешает ссылаться на FROM в RETURNING:
+                # прежний статус читается заранее и фиксируется в WHERE.
+                result = await self.db.execute(
+                    select(model.status)
+                    .where(model.uuid == task_uuid)
+                )
+                previous_status = result.scalar_one_or_none()
+                if previous_status not in allowed:
+                    await self.db.rollback()
+                    return None
+                query = query.where(model.status == previous_status)
+            update_data["completed_at"] = _completed_at_value(
+                update_data["status"])
+        else:
+            update_data.pop("status", None)
+        if expected_versions is not None:
+            query = query.where(model.version.in_(expected_versions))
+
+        result = await self.db.execute(
+            query.values(**update_data, version=model.version + 1)
+            .returning(*returning),
+            execution_options={"synchronize_session": False}
+        )
+        row = result.one_or_none()
+        if row is None:
+            await self.db.rollback()
+            return None
+
+        db_task = row[0]
+        if len(row) > 1:
+            previous_status = row[1]
+        counters = Counter()
+        if previous_status is not None and previous_status != db_task.status:
+            counters[_status_counter(previous_status)] -= 1
+            counters[_status_counter(db_task.status)] += 1
+        await self._update_counters(counters)
+        await self._commit([(UPDATED, db_task)])
+        await self._update_cache([db_task])
         return db_task
 
     async def delete_task(self, task_uuid: UUID) -> bool:
-        """Удаляет задачу по UUID."""
-        db_task = await self.get_task(task_uuid)
+        """Удаляет задачу по UUID из рабочей таблицы или из архива."""
+        db_task = await self.find_task(task_uuid)
         if not db_task:
             return False
 
         await self.db.delete(db_task)
-        await self.db.commit()
+        await self._update_counters(
+            Counter({_status_counter(db_task.status): -1}))
+        await self._commit([(DELETED, task_uuid)])
+        await self._update_cache(invalidated=[task_uuid])
         return True
+
+    async def create_tasks(
+            self, items: list[dict]) -> list[schemas.BatchItemResult]:
+        """Создает пакет задач одной транзакцией."""
+        results = [None] * len(items)
+        rows, indexes = [], []
+        for index, item in enumerate(items):
+            try:
+                rows.append(schemas.TaskCreate(**item).dict())
+                indexes.append(index)
+            except ValidationError as exc:
+                results[index] = _validation_error(index, exc)
+
+        if rows:
+            tasks = await self.insert_tasks(rows)
+            for index, db_task in zip(indexes, tasks):
+                results[index] = schemas.BatchItemResult(
+                    index=index, status_code=201,
+                    uuid=db_task.uuid,
+                    task=schemas.Task.model_validate(db_task)
+                )
+        return results
+
+    async def insert_tasks(self, rows: list[dict]) -> list[models.Task]:
+        """Вставляет проверенные строки задач одной транзакцией."""
+        tasks = await self._insert_many(
+            [_with_completed_at(row) for row in rows])
+        await self._update_counters(
+            Counter(_status_counter(row["status"]) for row in rows))
+        await self._commit([(CREATED, db_task) for db_task in tasks])
+        await self._update_cache(tasks)
+        return tasks
+
+    async def update_tasks(
+            self, items: list[dict]) -> list[schemas.BatchItemResult]:
+        """Обновляет пакет задач одной транзакцией."""
+        results = [None] * len(items)
+        updates = []
+        for index, item in enumerate(items):
+            try:
+                updates.append((index, schemas.TaskBatchUpdateItem(**item)))
+            except ValidationError as exc:
+                results[index] = _validation_error(index, exc)
+
+        db_tasks = {}
+        if updates:
+            uuids = {item.uuid for _, item in updates}
+            result = await self.db.execute(
+                select(models.Task)
+                .where(models.Task.uuid.in_(uuids))
+                .with_for_update()
+            )
+            db_tasks = {db_task.uuid: db_task for db_task in result.scalars()}
+            db_tasks.update(await self._restore_for_update([
+                (item.uuid, item.dict(exclude_unset=True, exclude={"uuid"}))
+                for _, item in updates if item.uuid not in db_tasks
+            ]))
+
+        counters = Counter()
+        changed = {}
+        for index, item in updates:
+            db_task = db_tasks.get(item.uuid)
+            try:
+                permissions.TaskPermissions.check_task_exists(db_task)
+                task_values = changed.setdefault(
+                    item.uuid, _batch_update_values(db_task))
+                if item.status and task_values["status"] != item.status:
+                    permissions.TaskPermissions.validate_status_transition(
+                        task_values["status"], item.status
+                    )
+            except HTTPException as exc:
+                results[index] = schemas.BatchItemResult(
+                    index=index, status_code=exc.status_code,
+                    uuid=item.uuid, detail=exc.detail
+                )
+                continue
+
+            update_data = item.dict(exclude_unset=True, exclude={"uuid"})
+            if update_data.get("status") is None:
+                update_data.pop("status", None)
+            else:
+                if update_data["status"] != task_values["status"]:
+                    counters[_status_counter(task_values["status"])] -= 1
+                    counters[_status_counter(update_data["status"])] += 1
+                update_data["completed_at"] = (
+                    task_values["completed_at"] or models.utcnow()
+                    if update_data["status"] == models.TaskStatus.COMPLETED
+                    else None
+                )
+            task_values.update(
+                update_data, version=task_values["version"] + 1)
+            results[index] = schemas.BatchItemResult(
+                index=index, status_code=200, uuid=item.uuid)
+
+        changed = {
+            task_uuid: task_values
+            for task_uuid, task_values in changed.items()
+            if task_values["version"] != db_tasks[task_uuid].version
+        }
+        if changed:
+            db_tasks.update(await self._write_updates(db_tasks, changed))
+        await self._update_counters(counters)
+        changes = []
+        for item_result in results:
+            if item_result.status_code == 200:
+                db_task = db_tasks[item_result.uuid]
+                item_result.task = schemas.Task.model_validate(db_task)
+                changes.append((UPDATED, db_task))
+        await self._commit(changes)
+        await self._update_cache(db_tasks.values())
+        return results
+
+    async def _write_updates(
+            self, db_tasks: dict, changed: dict) -> dict:
+        """Записывает итоговые значения пакетного обновления."""
+        if self._dialect.name != "postgresql":
+            for task_uuid, values in changed.items():
+                for field, value in values.items():
+                    setattr(db_tasks[task_uuid], field, value)
+            await self.db.flush()
+            return {task_uuid: db_tasks[task_uuid] for task_uuid in changed}
+
+        written = {}
+        for model in (models.Task, models.ArchivedTask):
+            model_changed = [
+                (task_uuid, task_values)
+                for task_uuid, task_values in changed.items()
+                if isinstance(db_tasks[task_uuid], model)
+            ]
+            if not model_changed:
+                continue
+            table = model.__table__
+            rows = expression.values(
+                *(expression.column(name, table.c[name].type)
+                  for name in ("uuid", *BATCH_UPDATE_COLUMNS)),
+                name="changes"
+            ).data([
+                (task_uuid,
+                 *(task_values[name] for name in BATCH_UPDATE_COLUMNS))
+                for task_uuid, task_values in model_changed
+            ])
+            result = await self.db.execute(
+                update(model)
+                .where(model.uuid == rows.c.uuid)
+                .values({
+                    name: cast(rows.c[name], table.c[name].type)
+                    for name in BATCH_UPDATE_COLUMNS
+                })
+                .returning(model),
+                execution_options={
+                    "synchronize_session": False, "populate_existing": True}
+            )
+            written.update(
+                (db_task.uuid, db_task) for db_task in result.scalars())
+        return written
+
+    async def delete_tasks(
+            self, uuids: list[UUID]) -> list[schemas.BatchItemResult]:
+        """Удаляет пакет задач из рабочей таблицы и архива."""
+        deleted = {}
+        remaining = set(uuids)
+        for model in (models.Task, models.ArchivedTask):
+            if remaining:
+                deleted.update(await self._delete_rows(model, remaining))
+                remaining -= deleted.keys()
+        counters = Counter()
+        for task_status in deleted.values():
+            counters[_status_counter(task_status)] -= 1
+        await self._update_counters(counters)
+        await self._commit([(DELETED, task_uuid) for task_uuid in deleted])
+        await self._update_cache(invalidated=deleted)
+
+        # Как в update_tasks, элементы применяются по порядку: повтор
+        # UUID видит задачу уже удаленной.
+        results = []
+        for index, task_uuid in enumerate(uuids):
+            found = deleted.pop(task_uuid, None) is not None
+            results.append(schemas.BatchItemResult(
+                index=index, uuid=task_uuid,
+                status_code=204 if found else 404,
+                detail=None if found else "Task not found"
+            ))
+        return results
+
+    async def _delete_rows(self, model, uuids: set[UUID]) -> dict:
+        """Удаляет строки таблицы model и возвращает их статусы по UUID."""
+        condition = model.uuid.in_(uuids)
+        if self._dialect.delete_returning:
+            result = await self.db.execute(
+                delete(model).where(condition)
+                .returning(model.uuid, model.status)
+            )
+            return dict(result.all())
+        result = await self.db.execute(
+            select(model.uuid, model.status)
+            .where(condition).with_for_update())
+        deleted = dict(result.all())
+        await self.db.execute(delete(model).where(model.uuid.in_(deleted)))
+        return deleted
+
+    async def _restore_for_update(
+            self, items: list[tuple[UUID, dict]]) -> dict:
+        """Блокирует задачи архива, возвращая сменяющие статус в работу."""
+        if not items:
+            return {}
+        result = await self.db.execute(
+            select(models.ArchivedTask)
+            .where(models.ArchivedTask.uuid.in_(
+                {task_uuid for task_uuid, _ in items}))
+            .with_for_update()
+        )
+        archived = {db_task.uuid: db_task for db_task in result.scalars()}
+        restore = list(dict.fromkeys(
+            task_uuid for task_uuid, update_data in items
+            if task_uuid in archived
+            and _restores(archived[task_uuid], update_data, None)
+        ))
+        if not restore:
+            return archived
+        for task_uuid in restore:
+            self.db.expunge(archived.pop(task_uuid))
+        await self._move_tasks(models.ArchivedTask, models.Task, restore)
+        result = await self.db.execute(
+            select(models.Task)
+            .where(models.Task.uuid.in_(restore))
+            .with_for_update()
+        )
+        archived.update(
+            (db_task.uuid, db_task) for db_task in result.scalars())
+        return archived
+
+    async def transition_tasks(
+            self, transition: schemas.TaskTransition
+    ) -> schemas.TaskTransitionResult:
+        """Переводит задачи, подходящие под фильтр, в целевой статус."""
+        target = models.TaskStatus(transition.target.value)
+        predecessors = [
+            models.TaskStatus(value) for value in
+            permissions.TaskPermissions.allowed_predecessors(target.value)
+            if value != target.value
+        ]
+        queries, counts = {}, {}
+        for model in (models.Task, models.ArchivedTask):
+            query = self._transition_query(model, transition)
+            result = await self.db.execute(
+                query.with_only_columns(model.status, func.count())
+                .group_by(model.status)
+            )
+            queries[model], counts[model] = query, Counter(dict(result.all()))
+
+        matched = sum(sum(table.values()) for table in counts.values())
+        if transition.dry_run:
+            changed = sum(
+                table[previous] for table in counts.values()
+                for previous in predecessors)
+        else:
+            changed = 0
+            try:
+                for previous in predecessors:
+                    if counts[models.ArchivedTask][previous]:
+                        changed += await self._restore_chunks(
+                            queries[models.ArchivedTask], previous, target,
+                            transition.chunk_size)
+                    if counts[models.Task][previous]:
+                        changed += await self._transition_chunks(
+                            queries[models.Task].where(
+                                models.Task.status == previous),
+                            previous, target, transition.chunk_size)
+            except Exception:
+                # Часть порций могла быть зафиксирована.
+                await self.db.rollback()
+                await self.publish_reset()
+                raise
+            await self.db.rollback()
+            if changed:
+                await self.publish_reset()
+        return schemas.TaskTransitionResult(
+            matched=matched, changed=changed,
+            skipped=max(matched - changed, 0), dry_run=transition.dry_run)
+
+    def _transition_query(self, model, transition: schemas.TaskTransition):
+        """Строит выборку UUID таблицы model по фильтру перехода."""
+        query = self._filter(
+            select(model.uuid), model, transition.status, transition.q)
+        if transition.uuids is not None:
+            query = query.where(
+                self._uuid_in(model.uuid, set(transition.uuids)))
+        if transition.updated_before is not None:
+            query = query.where(model.updated_at < transition.updated_before)
+        return query
+
+    async def _transition_chunks(
+            self, query, previous: models.TaskStatus,
+            target: models.TaskStatus, chunk_size: Optional[int]) -> int:
+        """Переводит задачи запроса из previous в target порциями."""
+        changed = 0
+        while True:
+            if chunk_size is None:
+                condition = query.whereclause
+            else:
+                condition = models.Task.uuid.in_(
+                    query.order_by(models.Task.created_at, models.Task.uuid)
+                    .limit(chunk_size)
+                    .with_for_update()
+                )
+            count = await self._apply_transition(condition, previous, target)
+            changed += count
+            if chunk_size is None or count < chunk_size:
+                break
+        return changed
+
+    async def _restore_chunks(
+            self, query, previous: models.TaskStatus,
+            target: models.TaskStatus, chunk_size: Optional[int]) -> int:
+        """Возвращает задачи архива в рабочую таблицу и переводит их."""
+        changed = 0
+        # UUID порции передаются списком, поэтому порции есть всегда.
+        chunk_size = chunk_size or schemas.TRANSITION_CHUNK_SIZE
+        query = query.where(models.ArchivedTask.status == previous).order_by(
+            models.ArchivedTask.created_at, models.ArchivedTask.uuid
+        ).limit(chunk_size).with_for_update()
+        while True:
+            result = await self.db.execute(query)
+            uuids = list(result.scalars())
+            if not uuids:
+                break
+            await self._move_tasks(models.ArchivedTask, models.Task, uuids)
+            changed += await self._apply_transition(
+                self._uuid_in(models.Task.uuid, uuids), previous, target)
+            if len(uuids) < chunk_size:
+                break
+        return changed
+
+    async def _apply_transition(
+            self, condition, previous: models.TaskStatus,
+            target: models.TaskStatus) -> int:
+        """Переводит задачи из previous в target и фиксирует транзакцию."""
+        result = await self.db.execute(
+            update(models.Task)
+            .where(condition, models.Task.status == previous)
+            .values(
+                status=target,
+                completed_at=_completed_at_value(target),
+                version=models.Task.version + 1,
+            )
+            .returning(models.Task.uuid, models.Task.version,
+                       models.Task.updated_at),
+            execution_options={"synchronize_session": False}
+        )
+        rows = result.all()
+        if not rows:
+            return 0
+
+        await self._update_counters(Counter({
+            _status_counter(previous): -len(rows),
+            _status_counter(target): len(rows),
+        }))
+        await self._commit()
+        await self._update_cache(patched=[
+            (task_uuid, version, {
+                "status": target.value,
+                "updated_at": updated_at.isoformat(),
+            })
+            for task_uuid, version, updated_at in rows
+        ])
+        return len(rows)
+
+    async def bulk_insert(self, rows: list[dict]) -> None:
+        """Вставляет строки без RETURNING и фиксирует транзакцию."""
+        rows = [_with_completed_at(row) for row in rows]
+        if self._dialect.driver == "asyncpg":
+            await self._copy_rows(rows)
+        else:
+            await self.db.execute(insert(models.Task), rows)
+        await self._update_counters(
+            Counter(_status_counter(row["status"]) for row in rows))
+        await self._commit()
+
+    async def _copy_rows(self, rows: list[dict]) -> None:
+        """Вставляет строки через COPY соединения asyncpg."""
+        columns = list(models.Task.__table__.columns)
+        records = [_copy_record(row, columns) for row in rows]
+
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            models.Task.__tablename__, records=records,
+            columns=[column.name for column in columns]
+        )
+
+    async def _update_counters(self, deltas: Counter) -> None:
+        """Применяет ненулевые изменения счетчиков статусов."""
+        counters = models.TaskCounter.__table__
+        # Порядок имен — общий порядок блокировок для всех транзакций.
+        rows = [
+            {"counter_name": name, "delta": delta}
+            for name, delta in sorted(deltas.items()) if delta
+        ]
+        if rows:
+            await self.db.execute(
+                counters.update()
+                .where(counters.c.name == bindparam("counter_name"))
+                .values(value=counters.c.value + bindparam("delta")),
+                rows
+            )
+
+    async def _next_revision(self) -> int:
+        """Выделяет номер изменения коллекции для текущей транзакции."""
+        if self._dialect.name == "postgresql":
+            result = await self.db.execute(
+                select(models.task_revision_seq.next_value()))
+            return result.scalar_one()
+        counters = models.TaskCounter.__table__
+        result = await self.db.execute(
+            counters.update()
+            .where(counters.c.name == models.TaskCounter.REVISION)
+            .values(value=counters.c.value + 1)
+            .returning(counters.c.value)
+        )
+        return result.scalar_one()
+
+    async def publish_reset(self) -> None:
+        """Публикует одно событие reset после массового изменения."""
+        await self._commit([(RESET, None)])
+
+    async def _commit(self, changes: Sequence = ()) -> None:
+        """Фиксирует транзакцию и публикует события ее изменений."""
+        revision = await self._next_revision()
+        if self.events.transactional:
+            # NOTIFY доставляется только вместе с фиксацией и в ее порядке.
+            await self.events.publish(revision, changes, self.db)
+            await self.db.commit()
+        else:
+            await self.db.commit()
+            await self.events.publish(revision, changes)
+
+    async def _update_cache(
+            self, tasks: Iterable[models.Task] = (),
+            invalidated: Iterable[UUID] = (),
+            patched: Sequence[tuple[UUID, int, dict]] = ()) -> None:
+        """Обновляет кэш после фиксации, записывая ошибки в журнал."""
+        try:
+            for db_task in tasks:
+                await self.cache.set(db_task)
+            for task_uuid in invalidated:
+                await self.cache.invalidate(task_uuid)
+            if patched:
+                await self.cache.patch_many(patched)
+        except Exception:
+            logger.exception("Failed to update task cache after commit")
+
+    async def get_stats(self) -> schemas.TaskStats:
+        """Получает количество задач по статусам из таблицы счетчиков."""
+        result = await self.db.execute(
+            select(models.TaskCounter.name, models.TaskCounter.value)
+            .where(models.TaskCounter.name.in_(STATUS_COUNTERS.values()))
+        )
+        values = dict(result.all())
+        counts = {
+            task_status.value: values.get(name, 0)
+            for task_status, name in STATUS_COUNTERS.items()
+        }
+        return schemas.TaskStats(counts=counts, total=sum(counts.values()))
+
+    async def reconcile_stats(self) -> schemas.TaskStats:
+        """Пересчитывает счетчики статусов по задачам и архиву."""
+        await self.db.execute(
+            select(models.TaskCounter.name)
+            .where(models.TaskCounter.name.in_(STATUS_COUNTERS.values()))
+            .order_by(models.TaskCounter.name)
+            .with_for_update()
+        )
+        actual = Counter()
+        for model in (models.Task, models.ArchivedTask):
+            result = await self.db.execute(
+                select(model.status, func.count()).group_by(model.status))
+            actual.update(dict(result.all()))
+
+        counters = models.TaskCounter.__table__
+        for task_status, name in STATUS_COUNTERS.items():
+            value = actual.get(task_status, 0)
+            updated = await self.db.execute(
+                counters.update().where(counters.c.name == name)
+                .values(value=value)
+            )
+            if updated.rowcount == 0:
+                await self.db.execute(
+                    counters.insert().values(name=name, value=value))
+        await self.db.commit()
+        return await self.get_stats()
+
+    async def archive_completed(
+            self, completed_before: datetime, batch_size: int) -> int:
+        """Переносит в архив пакет задач, завершенных до completed_before."""
+        result = await self.db.execute(
+            select(models.Task.uuid)
+            .where(
+                models.Task.status == models.TaskStatus.COMPLETED,
+                models.Task.completed_at < completed_before
+            )
+            .order_by(models.Task.completed_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        uuids = list(result.scalars())
+        if not uuids:
+            await self.db.rollback()
+            return 0
+
+        await self._move_tasks(
+            models.Task, models.ArchivedTask, uuids,
+            archived_at=models.utcnow())
+        await self._commit()
+        return len(uuids)
+
+    async def _move_tasks(self, source, target, uuids: list[UUID],
+                          **values) -> None:
+        """Переносит строки задач между рабочей таблицей и архивом."""
+        source_table, target_table = source.__table__, target.__table__
+        names = [column.name for column in models.Task.__table__.columns]
+        await self.db.execute(
+            insert(target_table).from_select(
+                names + list(values),
+                select(
+                    *(source_table.c[name] for name in names),
+                    *(literal(value, target_table.c[name].type)
+                      for name, value in values.items())
+                ).where(source_table.c.uuid.in_(uuids))
+            )
+        )
+        await self.db.execute(
+            delete(source_table).where(source_table.c.uuid.in_(uuids)))
+
+    def _archived_page_query(self, skip, limit, after, status, search,
+                             fields=None):
+        """Строит страницу списка по рабочей таблице и архиву вместе."""
+        branches = []
+        for model in (models.Task, models.ArchivedTask):
+            query = self._filter(
+                select(*_list_columns(model, fields)), model, status, search)
+            query = query.order_by(model.created_at, model.uuid)
+            if after is not None:
+                query = query.where(
+                    tuple_(model.created_at, model.uuid) > after)
+                query = query.limit(limit)
+            else:
+                query = query.limit(skip + limit)
+            branches.append(select(*query.subquery().c))
+
+        merged = union_all(*branches).subquery()
+        query = select(*merged.c).order_by(
+            merged.c.created_at, merged.c.uuid)
+        if after is None:
+            query = query.offset(skip)
+        return query.limit(limit)
+
+    def _page_query(self, skip, limit, after, status, search,
+                    entities=(models.Task,)):
+        """Строит запрос одной страницы списка задач."""
+        query = self._list_query(status, search, entities)
+        if after is not None:
+            query = query.where(
+                tuple_(models.Task.created_at, models.Task.uuid) > after
+            )
+        else:
+            query = query.offset(skip)
+        return query.limit(limit)
+
+    def _list_query(
+            self, status: Optional[schemas.TaskStatus] = None,
+            search: Optional[str] = None, entities=(models.Task,)):
+        """Строит упорядоченный запрос списка задач с фильтрами."""
+        query = select(*entities).order_by(
+            models.Task.created_at, models.Task.uuid
+        )
+        return self._filter(query, models.Task, status, search)
+
+    def _filter(self, query, model, status, search):
+        """Добавляет к запросу фильтры по статусу и тексту."""
+        if status is not None:
+            query = query.where(model.status == status)
+        if search and search.strip():
+            if model is models.Task or self._dialect.name == "postgresql":
+                condition = search_condition(
+                    self._dialect.name, search, model.title,
+                    model.description)
+            else:
+                condition = scan_condition(
+                    search, model.title, model.description)
+            query = query.where(condition)
+        return query
+
+    def _uuid_in(self, column, uuids: Sequence[UUID]):
+        """Условие column = ANY(массив) или IN для других диалектов."""
+        if self._dialect.name == "postgresql":
+            return column == any_(
+                literal(list(uuids), postgresql.ARRAY(column.type)))
+        return column.in_(uuids)
+
+    @property
+    def _dialect(self):
+        """Диалект базы данных текущей сессии."""
+        return self.db.get_bind().dialect
+
+    async def _insert_many(self, rows: list[dict]) -> list[models.Task]:
+        """Вставляет строки одним INSERT ... RETURNING, если он доступен."""
+        if self._dialect.insert_executemany_returning_sort_by_parameter_order:
+            result = await self.db.execute(
+                insert(models.Task).returning(
+                    models.Task, sort_by_parameter_order=True),
+                rows
+            )
+            return list(result.scalars())
+
+        db_tasks = [models.Task(**row) for row in rows]
+        self.db.add_all(db_tasks)
+        await self.db.flush()
+        return db_tasks
+
+
+LIST_COLUMNS = (
+    models.Task.uuid, models.Task.title, models.Task.description,
+    models.Task.status, models.Task.created_at,
+)
+
+CURSOR_FIELDS = ("uuid", "created_at")
+
+BATCH_UPDATE_COLUMNS = (
+    "title", "description", "status", "completed_at", "version")
+
+STATUS_COUNTERS = {
+    task_status: f"status:{task_status.value}"
+    for task_status in models.TaskStatus
+}
+
+
+def _list_columns(model, fields: Optional[Sequence[str]] = None) -> list:
+    """Колонки списка модели: поля fields и колонки курсора."""
+    if fields is None:
+        return [getattr(model, column.key) for column in LIST_COLUMNS]
+    names = [*CURSOR_FIELDS, *(
+        field for field in fields if field not in CURSOR_FIELDS)]
+    return [getattr(model, name) for name in names]
+
+
+def _status_counter(task_status) -> str:
+    """Возвращает имя счетчика задач в статусе task_status."""
+    return STATUS_COUNTERS[models.TaskStatus(task_status)]
+
+
+def _copy_record(row: dict, columns: list) -> tuple:
+    """Формирует запись для COPY с применением значений по умолчанию."""
+    values = []
+    for column in columns:
+        value = row.get(column.name)
+        if value is None and column.default is not None:
+            default = column.default
+            value = default.arg(None) if default.is_callable else default.arg
+        if isinstance(value, enum.Enum):
+            value = value.name
+        values.append(value)
+    return tuple(values)
+
+
+def _batch_update_values(db_task: models.Task) -> dict:
+    """Текущие значения задачи, изменяемые пакетным обновлением."""
+    return {name: getattr(db_task, name) for name in BATCH_UPDATE_COLUMNS}
+
+
+def _with_completed_at(row: dict) -> dict:
+    """Заполняет время завершения для задачи, созданной завершенной."""
+    if (row.get("status") == models.TaskStatus.COMPLETED
+            and row.get("completed_at") is None):
+        row = {**row, "completed_at": models.utcnow()}
+    return row
+
+
+def _completed_at_value(new_status):
+    """Возвращает completed_at задачи, переходящей в new_status."""
+    if new_status == models.TaskStatus.COMPLETED:
+        return func.coalesce(models.Task.completed_at, literal(
+            models.utcnow(), models.Task.completed_at.type))
+    return None
+
+
+def _restores(task, update_data: dict,
+              expected_versions: Optional[list[int]]) -> bool:
+    """Проверяет, возвращает ли обновление задачу из архива."""
+    if expected_versions is not None and task.version not in expected_versions:
+        return False
+    new_status = update_data.get("status")
+    return new_status not in (None, task.status) and task.status in [
+        models.TaskStatus(value) for value in
+        permissions.TaskPermissions.allowed_predecessors(new_status)
+    ]
+
+
+def _validation_error(
+        index: int, exc: ValidationError) -> schemas.BatchItemResult:
+    """Формирует результат элемента пакета с ошибкой валидации."""
+    return schemas.BatchItemResult(
+        index=index, status_code=422,
+        detail=exc.errors(include_url=False, include_context=False)
+    )
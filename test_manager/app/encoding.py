@@ -0,0 +1,58 @@
+"""Модуль быстрой сериализации задач в JSON.
+
+Строки с выбранными колонками кодируются напрямую в байты, минуя
+построение ORM-объектов и валидацию через schemas.Task. Результат
+совпадает с ответом по схеме schemas.Task.
+"""
+
+import json
+from typing import Any, Iterable, Optional, Sequence
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+FIELD_ENCODERS = {
+    "title": lambda row: row.title,
+    "description": lambda row: row.description,
+    "status": lambda row: row.status.value,
+    "uuid": lambda row: str(row.uuid),
+}
+
+
+def task_row_to_dict(row: Any,
+                     fields: Optional[Sequence[str]] = None) -> dict[str, Any]:
+    """Преобразует строку задачи в словарь в порядке полей schemas.Task.
+
+    С fields в словарь попадают только перечисленные поля.
+    """
+    if fields is None:
+        return {
+            "title": row.title,
+            "description": row.description,
+            "status": row.status.value,
+            "uuid": str(row.uuid),
+        }
+    return {field: FIELD_ENCODERS[field](row) for field in fields}
+
+
+def dumps(content: Any) -> bytes:
+    """Кодирует данные в компактный JSON в UTF-8."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def encode_tasks(rows: Iterable[Any],
+                 fields: Optional[Sequence[str]] = None) -> bytes:
+    """Кодирует строки задач в JSON-массив."""
+    return dumps([task_row_to_dict(row, fields) for row in rows])
+
+
+def encode_tasks_ndjson(rows: Iterable[Any]) -> bytes:
+    """Кодирует строки задач в NDJSON, по одной задаче на строку."""
+    return b"".join(dumps(task_row_to_dict(row)) + b"\n" for row in rows)
@@ -0,0 +1,567 @@
+"""Модуль ленты изменений задач для подписчиков Server-Sent Events.
+
+TaskCRUD публикует события транзакции в EventBroker. Брокер рассылает
+их через выбранный канал: внутри процесса (после фиксации) или через
+общий канал PostgreSQL LISTEN/NOTIFY, чтобы события получали
+подписчики всех процессов. NOTIFY выполняется в самой транзакции
+записи, поэтому события доставляются только при ее фиксации и в
+порядке фиксаций. Идентификатор события строится из счетчика
+изменений коллекции, общего для всех процессов, поэтому клиент может
+переподключиться к любому процессу и продолжить с Last-Event-ID.
+"""
+
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Callable, Optional, Protocol, Union
+from uuid import UUID
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.config import Settings, get_settings
+from app.encoding import dumps, task_row_to_dict
+
+EVENT_QUEUE_SIZE = 1000
+EVENT_HISTORY_SIZE = 10000
+HEARTBEAT_INTERVAL = 15.0
+NOTIFY_PAYLOAD_LIMIT = 7900
+RECONNECT_DELAY = 0.5
+RECONNECT_MAX_DELAY = 30.0
+
+logger = logging.getLogger(__name__)
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+RESET = "reset"
+
+Deliver = Callable[[list[dict]], None]
+Lost = Callable[[], None]
+Change = tuple[str, Union[models.Task, UUID, None]]
+
+
+@dataclass(frozen=True)
+class TaskEvent:
+    """Событие изменения задачи.
+
+    Событие reset означает, что клиенту нужно перечитать список:
+    после массового импорта или если часть событий была потеряна.
+    """
+
+    revision: int
+    index: int
+    type: str
+    uuid: Optional[str] = None
+    version: Optional[int] = None
+    task: Optional[dict] = None
+
+    @property
+    def id(self) -> str:
+        """Идентификатор события для заголовка Last-Event-ID."""
+        return f"{self.revision}-{self.index}"
+
+    @property
+    def key(self) -> tuple[int, int]:
+        """Ключ упорядочивания событий."""
+        return self.revision, self.index
+
+
+def parse_event_id(value: str) -> tuple[int, int]:
+    """Разбирает идентификатор события вида revision-index.
+
+    Raises:
+        ValueError: если идентификатор имеет неверный формат.
+    """
+    revision, separator, index = value.strip().partition("-")
+    if not separator:
+        raise ValueError("Invalid event id")
+    return int(revision), int(index)
+
+
+def make_events(revision: int, changes: list[Change]) -> list[TaskEvent]:
+    """Строит события одной транзакции с общим номером изменения."""
+    events = []
+    for index, (event_type, target) in enumerate(changes):
+        if isinstance(target, models.Task):
+            events.append(TaskEvent(
+                revision, index, event_type, str(target.uuid),
+                target.version, task_row_to_dict(target)))
+        else:
+            events.append(TaskEvent(
+                revision, index, event_type,
+                str(target) if target is not None else None))
+    return events
+
+
+class Subscription:
+    """Подписка с ограниченной очередью событий.
+
+    Если подписчик не успевает читать и очередь переполняется,
+    накопленные события отбрасываются и вместо них ставится событие
+    reset, после которого поток закрывается. Клиент переподключается
+    с Last-Event-ID и дочитывает историю или перечитывает список.
+    """
+
+    def __init__(self, queue_size: int):
+        """Инициализация класса Subscription."""
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.overflowed = False
+
+    def put(self, event: TaskEvent):
+        """Добавляет событие в очередь без ожидания."""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(TaskEvent(event.revision, -1, RESET))
+
+    async def get(self, timeout: float) -> Optional[TaskEvent]:
+        """Ждет следующее событие не дольше timeout секунд."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBackend(ABC):
+    """Базовый класс канала доставки событий брокерам.
+
+    Транзакционный канал отправляет сообщения в транзакции записи,
+    остальные — после ее фиксации.
+    """
+
+    transactional = False
+
+    @abstractmethod
+    async def start(self, deliver: Deliver,
+                    lost: Optional[Lost] = None) -> None:
+        """Подписывает брокер на сообщения канала.
+
+        lost вызывается, если часть сообщений могла быть потеряна
+        (например, при переподключении к каналу).
+        """
+
+    @abstractmethod
+    async def publish(self, messages: list[dict],
+                      session: Optional[AsyncSession] = None) -> None:
+        """Отправляет сообщения всем подписанным брокерам.
+
+        session — транзакция записи для транзакционного канала.
+        """
+
+    async def stop(self) -> None:
+        """Освобождает ресурсы канала."""
+
+
+class LocalEventBackend(EventBackend):
+    """Доставка событий только внутри текущего процесса."""
+
+    def __init__(self):
+        """Инициализация класса LocalEventBackend."""
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver,
+                    lost: Optional[Lost] = None) -> None:
+        """Подписывает брокер на сообщения канала."""
+        self._deliver = deliver
+
+    async def publish(self, messages: list[dict],
+                      session: Optional[AsyncSession] = None) -> None:
+        """Передает сообщения брокеру текущего процесса."""
+        if self._deliver is not None:
+            self._deliver(messages)
+
+
+class EventChannel(Protocol):
+    """Интерфейс общего канала сообщений (например, LISTEN/NOTIFY)."""
+
+    transactional: bool
+
+    async def listen(self, callback: Callable[[str], None],
+                     reconnected: Optional[Lost] = None) -> None:
+        """Подписывается на сообщения канала."""
+
+    async def notify(self, payload: str,
+                     session: Optional[AsyncSession] = None) -> None:
+        """Отправляет сообщение всем слушателям."""
+
+    async def close(self) -> None:
+        """Закрывает соединения канала."""
+
+
+class ChannelEventBackend(EventBackend):
+    """Доставка событий всем процессам через общий канал.
+
+    Сообщения упаковываются в полезную нагрузку не длиннее
+    payload_limit байт. Событие, которое не помещается целиком,
+    отправляется без полей задачи: клиент дочитает ее запросом GET.
+    """
+
+    def __init__(self, channel: EventChannel,
+                 payload_limit: int = NOTIFY_PAYLOAD_LIMIT):
+        """Инициализация класса ChannelEventBackend."""
+        self.channel = channel
+        self.payload_limit = payload_limit
+        self.transactional = channel.transactional
+
+    async def start(self, deliver: Deliver,
+                    lost: Optional[Lost] = None) -> None:
+        """Подписывает брокер на сообщения канала."""
+        await self.channel.listen(
+            lambda payload: deliver(json.loads(payload)), lost)
+
+    async def publish(self, messages: list[dict],
+                      session: Optional[AsyncSession] = None) -> None:
+        """Отправляет сообщения пакетами в пределах лимита."""
+        batch, size = [], 2
+        for message in messages:
+            encoded = dumps(message)
+            if len(encoded) + 2 > self.payload_limit:
+                message = {**message, "task": None}
+                encoded = dumps(message)
+            if batch and size + len(encoded) + 1 > self.payload_limit:
+                await self.channel.notify(dumps(batch).decode(), session)
+                batch, size = [], 2
+            batch.append(message)
+            size += len(encoded) + 1
+        if batch:
+            await self.channel.notify(dumps(batch).decode(), session)
+
+    async def stop(self) -> None:
+        """Закрывает канал."""
+        await self.channel.close()
+
+
+class InMemoryEventChannel:
+    """Локальная замена общего канала для тестов и разработки."""
+
+    transactional = False
+
+    def __init__(self):
+        """Инициализация класса InMemoryEventChannel."""
+        self._callbacks: list[Callable[[str], None]] = []
+
+    async def listen(self, callback: Callable[[str], None],
+                     reconnected: Optional[Lost] = None) -> None:
+        """Подписывается на сообщения канала."""
+        self._callbacks.append(callback)
+
+    async def notify(self, payload: str,
+                     session: Optional[AsyncSession] = None) -> None:
+        """Отправляет сообщение всем слушателям."""
+        for callback in self._callbacks:
+            callback(payload)
+
+    async def close(self) -> None:
+        """Закрывает соединения канала."""
+        self._callbacks.clear()
+
+
+class PostgresNotifyChannel:
+    """Канал поверх PostgreSQL LISTEN/NOTIFY.
+
+    NOTIFY выполняется в транзакции записи: PostgreSQL доставляет
+    уведомления только при фиксации и в порядке фиксаций. Слушатель
+    работает на отдельном соединении; если оно обрывается, канал
+    переподключается с экспоненциальной паузой и сообщает об этом
+    через reconnected: уведомления, отправленные за время разрыва,
+    потеряны.
+    """
+
+    transactional = True
+
+    def __init__(self, dsn: str, name: str = "task_events"):
+        """Инициализация класса PostgresNotifyChannel."""
+        self.dsn = dsn
+        self.name = name
+        self.reconnects = 0
+        self._listener = None
+        self._callback: Optional[Callable[[str], None]] = None
+        self._reconnected: Optional[Lost] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def listen(self, callback: Callable[[str], None],
+                     reconnected: Optional[Lost] = None) -> None:
+        """Подписывается на сообщения канала."""
+        self._callback = callback
+        self._reconnected = reconnected
+        self._closed = False
+        await self._connect_listener()
+
+    async def notify(self, payload: str,
+                     session: Optional[AsyncSession] = None) -> None:
+        """Отправляет сообщение в транзакции session.
+
+        Raises:
+            ValueError: если транзакция записи не передана.
+        """
+        if session is None:
+            raise ValueError("NOTIFY requires a write transaction")
+        await session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": self.name, "payload": payload}
+        )
+
+    async def close(self) -> None:
+        """Закрывает соединения канала."""
+        self._closed = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._listener is not None:
+            await self._listener.close()
+        self._listener = None
+
+    async def _connect_listener(self) -> None:
+        """Открывает соединение слушателя и подписывается на канал."""
+        self._listener = await asyncpg.connect(self.dsn)
+        await self._listener.add_listener(
+            self.name, lambda connection, pid, channel, payload:
+            self._callback(payload))
+        self._listener.add_termination_listener(self._terminated)
+
+    def _terminated(self, connection) -> None:
+        """Запускает переподключение после обрыва соединения."""
+        if self._closed or connection is not self._listener:
+            return
+        logger.warning("Event listener connection lost, reconnecting")
+        self._reconnect_task = asyncio.get_running_loop().create_task(
+            self._reconnect())
+
+    async def _reconnect(self) -> None:
+        """Переподключает слушателя, пока канал не закрыт."""
+        delay = RECONNECT_DELAY
+        while not self._closed:
+            try:
+                await self._connect_listener()
+            except Exception as exc:
+                logger.warning("Event listener reconnect failed: %s", exc)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+                continue
+            self.reconnects += 1
+            if self._reconnected is not None:
+                self._reconnected()
+            return
+
+
+class EventBroker:
+    """Рассылка событий подписчикам с историей для возобновления."""
+
+    def __init__(self, backend: Optional[EventBackend] = None,
+                 queue_size: int = EVENT_QUEUE_SIZE,
+                 history_size: int = EVENT_HISTORY_SIZE):
+        """Инициализация класса EventBroker."""
+        self.backend = backend or LocalEventBackend()
+        self.queue_size = queue_size
+        self.history: deque[TaskEvent] = deque(maxlen=history_size)
+        self.published = 0
+        self.failed = 0
+        self.dropped_subscribers = 0
+        self._subscribers: set[Subscription] = set()
+        self._evicted: Optional[tuple[int, int]] = None
+        self._first_revision: Optional[int] = None
+        self._started = False
+        self._start_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Подключает брокер к каналу при первом обращении."""
+        if self._started:
+            return
+        async with self._start_lock:
+            if not self._started:
+                await self.backend.start(self._dispatch, self._lost)
+                self._started = True
+
+    async def stop(self) -> None:
+        """Отключает брокер от канала."""
+        if self._started:
+            self._started = False
+            await self.backend.stop()
+
+    @property
+    def transactional(self) -> bool:
+        """Отправляются ли события в транзакции записи."""
+        return self.backend.transactional
+
+    async def publish(self, revision: int, changes: list[Change],
+                      session: Optional[AsyncSession] = None) -> None:
+        """Публикует изменения транзакции.
+
+        С session события отправляются транзакционным каналом до
+        фиксации, и ошибка канала отменяет запись. Без session
+        транзакция уже зафиксирована, поэтому ошибка канала не
+        передается вызывающему: она записывается в журнал, а
+        подписчики процесса получают reset.
+        """
+        events = make_events(revision, changes)
+        if not events:
+            return
+        messages = [asdict(event) for event in events]
+        if session is not None:
+            await self.start()
+            await self.backend.publish(messages, session)
+            return
+        try:
+            await self.start()
+            await self.backend.publish(messages)
+        except Exception:
+            logger.exception(
+                "Failed to publish events of revision %d", revision)
+            self.failed += 1
+            self._lost(revision)
+
+    async def subscribe(
+            self, last_event_id: Optional[str] = None,
+            revision: Optional[int] = None) -> Subscription:
+        """Создает подписку и ставит в очередь пропущенные события.
+
+        Если пропущенные события уже вытеснены из истории или
+        произошли до запуска брокера, первым ставится событие reset.
+        revision — текущий счетчик изменений коллекции: по нему
+        брокер без истории определяет, пропустил ли клиент события.
+        """
+        await self.start()
+        subscription = Subscription(self.queue_size)
+        if last_event_id is not None:
+            for event in self._replay(
+                    parse_event_id(last_event_id), revision):
+                subscription.put(event)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Удаляет подписку."""
+        self._subscribers.discard(subscription)
+        if subscription.overflowed:
+            self.dropped_subscribers += 1
+
+    def stats(self) -> dict:
+        """Возвращает число подписчиков и размер истории."""
+        return {
+            "backend": type(self.backend).__name__,
+            "subscribers": len(self._subscribers),
+            "history": len(self.history),
+            "published": self.published,
+            "failed": self.failed,
+            "dropped_subscribers": self.dropped_subscribers,
+        }
+
+    def _replay(self, after: tuple[int, int],
+                revision: Optional[int] = None) -> list[TaskEvent]:
+        """Возвращает события истории после after или reset.
+
+        История хранится в порядке фиксаций, а номера на PostgreSQL
+        выделяются до фиксации и могут идти не по порядку, поэтому
+        события отдаются по позиции after в истории. Событие reset
+        получает идентификатор текущей головы ленты, поэтому клиент,
+        перечитавший список, продолжает с нее, а не с прежнего
+        Last-Event-ID.
+        """
+        keys = [event.key for event in self.history]
+        if after in keys:
+            return list(self.history)[keys.index(after) + 1:]
+        if self.history:
+            covered = (self._evicted is None
+                       and after[0] == self._first_revision - 1)
+        else:
+            covered = revision is None or after[0] >= revision
+        if covered:
+            return list(self.history)
+        if self.history:
+            head = self.history[-1].key
+        elif revision is not None:
+            head = (revision, 0)
+        else:
+            head = (after[0], -1)
+        return [TaskEvent(*head, RESET)]
+
+    def _lost(self, revision: Optional[int] = None) -> None:
+        """Сбрасывает историю и подписчиков после потери событий.
+
+        Без истории возобновление проверяется по счетчику изменений
+        (см. subscribe), поэтому отставшие клиенты получат reset.
+        """
+        self.history.clear()
+        self._evicted = None
+        self._first_revision = None
+        reset = (TaskEvent(revision, 0, RESET) if revision is not None
+                 else TaskEvent(0, -1, RESET))
+        for subscription in list(self._subscribers):
+            subscription.put(reset)
+
+    def _dispatch(self, messages: list[dict]) -> None:
+        """Добавляет события в историю и раздает подписчикам."""
+        for message in messages:
+            event = TaskEvent(**message)
+            if self._first_revision is None:
+                self._first_revision = event.revision
+            if len(self.history) == self.history.maxlen:
+                self._evicted = self.history[0].key
+            self.history.append(event)
+            self.published += 1
+            for subscription in list(self._subscribers):
+                subscription.put(event)
+
+
+async def sse_stream(broker: EventBroker,
+                     last_event_id: Optional[str] = None,
+                     heartbeat: float = HEARTBEAT_INTERVAL,
+                     revision: Optional[int] = None
+                     ) -> AsyncIterator[bytes]:
+    """Подписывается на брокер и отдает события в формате text/event-stream.
+
+    При простое отправляется комментарий, чтобы прокси не закрывали
+    соединение. После события reset поток завершается.
+    """
+    subscription = await broker.subscribe(last_event_id, revision)
+    try:
+        while True:
+            event = await subscription.get(heartbeat)
+            if event is None:
+                yield b": keep-alive\n\n"
+                continue
+            yield format_sse(event)
+            if event.type == RESET:
+                return
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def format_sse(event: TaskEvent) -> bytes:
+    """Кодирует событие в формат Server-Sent Events."""
+    data = dumps({
+        "type": event.type, "uuid": event.uuid,
+        "version": event.version, "task": event.task,
+    })
+    head = f"event: {event.type}\n"
+    if event.index >= 0:
+        head = f"id: {event.id}\n" + head
+    return head.encode() + b"data: " + data + b"\n\n"
+
+
+def create_event_broker(settings: Settings) -> EventBroker:
+    """Создает брокер событий по настройкам приложения."""
+    backend = None
+    if settings.events_backend == "postgres":
+        url = make_url(settings.database_url).set(drivername="postgresql")
+        backend = ChannelEventBackend(PostgresNotifyChannel(
+            url.render_as_string(hide_password=False)))
+    return EventBroker(
+        backend, queue_size=settings.events_queue_size,
+        history_size=settings.events_history_size)
+
+
+task_events = create_event_broker(get_settings())
@@ -0,0 +1,216 @@
+"""Модуль двоичных форматов списка задач и выбора формата по Accept.
+
+MessagePack повторяет структуру JSON-ответа. Arrow IPC (stream) —
+колоночный формат: статус хранится словарным столбцом, UUID —
+16-байтовыми значениями фиксированной длины. Столбцы строятся
+напрямую из строк выборки, пакетами по мере их поступления.
+Форматы, библиотеки которых не установлены, не предлагаются.
+"""
+
+import io
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from app import encoding, models
+from app.schemas import TASK_FIELDS
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+MSGPACK = "application/msgpack"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+LIST_MEDIA_TYPES = (JSON, MSGPACK, ARROW_STREAM)
+EXPORT_MEDIA_TYPES = (NDJSON, MSGPACK, ARROW_STREAM)
+MEDIA_ALIASES = {"application/x-msgpack": MSGPACK}
+ETAG_VARIANTS = {MSGPACK: "msgpack", ARROW_STREAM: "arrow"}
+
+STATUS_VALUES = [task_status.value for task_status in models.TaskStatus]
+STATUS_INDEX = {value: index for index, value in enumerate(STATUS_VALUES)}
+STATUS_DICTIONARY = (
+    pa.array(STATUS_VALUES, pa.string()) if pa is not None else None)
+
+
+def is_available(media_type: str) -> bool:
+    """Проверяет, установлена ли библиотека формата."""
+    if media_type == MSGPACK:
+        return msgpack is not None
+    if media_type == ARROW_STREAM:
+        return pa is not None
+    return True
+
+
+def negotiate(accept: Optional[str], offered: Sequence[str]) -> str:
+    """Выбирает формат ответа по заголовку Accept.
+
+    Побеждает формат с наибольшим q, при равенстве — ранее
+    предложенный. Если ни один формат не подходит, возвращается
+    первый (формат по умолчанию).
+    """
+    offered = [
+        media_type for media_type in offered if is_available(media_type)]
+    if not accept:
+        return offered[0]
+    ranges = _parse_accept(accept)
+    best, best_quality = offered[0], 0.0
+    for media_type in offered:
+        quality = _quality(media_type, ranges)
+        if quality > best_quality:
+            best, best_quality = media_type, quality
+    return best
+
+
+def encode_tasks(rows: Iterable[Any], media_type: str,
+                 fields: Optional[Sequence[str]] = None) -> bytes:
+    """Кодирует страницу задач в выбранном формате."""
+    if media_type == MSGPACK:
+        return msgpack.packb(
+            [encoding.task_row_to_dict(row, fields) for row in rows])
+    if media_type == ARROW_STREAM:
+        encoder = ArrowStreamEncoder(fields)
+        return encoder.encode(rows) + encoder.close()
+    return encoding.encode_tasks(rows, fields)
+
+
+def encode_tasks_msgpack_stream(rows: Iterable[Any]) -> bytes:
+    """Кодирует задачи последовательностью значений MessagePack."""
+    return b"".join(
+        msgpack.packb(encoding.task_row_to_dict(row)) for row in rows)
+
+
+class StreamEncoder:
+    """Кодировщик потока, в котором каждая задача — отдельное значение."""
+
+    def __init__(self, encode: Callable[[Iterable[Any]], bytes]):
+        """Инициализация класса StreamEncoder."""
+        self._encode = encode
+
+    def encode(self, rows: Iterable[Any]) -> bytes:
+        """Кодирует очередную порцию строк."""
+        return self._encode(rows)
+
+    def close(self) -> bytes:
+        """Завершает поток."""
+        return b""
+
+
+class ArrowStreamEncoder:
+    """Кодировщик потока Arrow IPC по пакетам строк.
+
+    Схема и словарь статусов передаются один раз, перед первым
+    пакетом; close дописывает маркер конца потока.
+    """
+
+    def __init__(self, fields: Optional[Sequence[str]] = None):
+        """Инициализация класса ArrowStreamEncoder."""
+        self.fields = tuple(fields or TASK_FIELDS)
+        self.schema = arrow_schema(self.fields)
+        self._sink = io.BytesIO()
+        self._writer = pa.ipc.new_stream(self._sink, self.schema)
+
+    def encode(self, rows: Iterable[Any]) -> bytes:
+        """Кодирует порцию строк в один пакет колонок."""
+        rows = list(rows)
+        if rows:
+            self._writer.write_batch(pa.record_batch(
+                [ARROW_COLUMNS[field](rows) for field in self.fields],
+                schema=self.schema))
+        return self._take()
+
+    def close(self) -> bytes:
+        """Завершает поток маркером конца."""
+        self._writer.close()
+        return self._take()
+
+    def _take(self) -> bytes:
+        """Забирает накопленные байты из буфера."""
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
+
+
+def stream_encoder(media_type: str):
+    """Возвращает кодировщик потоковой выгрузки для формата."""
+    if media_type == ARROW_STREAM:
+        return ArrowStreamEncoder()
+    if media_type == MSGPACK:
+        return StreamEncoder(encode_tasks_msgpack_stream)
+    return StreamEncoder(encoding.encode_tasks_ndjson)
+
+
+def arrow_schema(fields: Sequence[str]) -> "pa.Schema":
+    """Возвращает схему Arrow для выбранных полей задачи."""
+    types = {
+        "title": pa.string(),
+        "description": pa.string(),
+        "status": pa.dictionary(pa.int8(), pa.string()),
+        "uuid": pa.binary(16),
+    }
+    return pa.schema([
+        pa.field(field, types[field], nullable=field == "description")
+        for field in fields
+    ])
+
+
+def _status_column(rows: list) -> "pa.DictionaryArray":
+    """Столбец статусов: индексы в общем словаре значений."""
+    return pa.DictionaryArray.from_arrays(
+        pa.array([STATUS_INDEX[row.status.value] for row in rows], pa.int8()),
+        STATUS_DICTIONARY)
+
+
+ARROW_COLUMNS = {
+    "title": lambda rows: pa.array([row.title for row in rows], pa.string()),
+    "description": lambda rows: pa.array(
+        [row.description for row in rows], pa.string()),
+    "status": _status_column,
+    "uuid": lambda rows: pa.array(
+        [row.uuid.bytes for row in rows], pa.binary(16)),
+}
+
+
+def _parse_accept(accept: str) -> list[tuple[str, float]]:
+    """Разбирает Accept в список (диапазон типов, q)."""
+    ranges = []
+    for item in accept.split(","):
+        media_range, *params = (part.strip() for part in item.split(";"))
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media_range = media_range.lower()
+        ranges.append((MEDIA_ALIASES.get(media_range, media_range), quality))
+    return ranges
+
+
+def _quality(media_type: str, ranges: list[tuple[str, float]]) -> float:
+    """Возвращает q самого точного диапазона, подходящего под тип."""
+    main_type = media_type.split("/")[0]
+    best_specificity, quality = -1, 0.0
+    for media_range, range_quality in ranges:
+        if media_range == media_type:
+            specificity = 2
+        elif media_range == f"{main_type}/*":
+            specificity = 1
+        elif media_range == "*/*":
+            specificity = 0
+        else:
+            continue
+        if specificity > best_specificity:
+            best_specificity, quality = specificity, range_quality
+    return quality
@@ -0,0 +1,116 @@
+"""Модуль потокового импорта задач из файлов NDJSON и CSV."""
+
+import csv
+import io
+import json
+from itertools import islice
+from typing import Any, BinaryIO, Iterator, Optional, Tuple
+
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app import crud, schemas
+
+IMPORT_FORMATS = ("ndjson", "csv")
+MAX_REPORTED_ERRORS = 100
+
+Row = Tuple[int, Any]
+
+
+def detect_format(filename: str, content_type: str) -> Optional[str]:
+    """Определяет формат файла по расширению или типу содержимого."""
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in (
+            "application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+def _iter_ndjson(text: io.TextIOBase) -> Iterator[Row]:
+    """Итерирует строки NDJSON как пары (номер строки, объект)."""
+    for line_no, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as exc:
+            yield line_no, exc
+
+
+def _iter_csv(text: io.TextIOBase) -> Iterator[Row]:
+    """Итерирует записи CSV с заголовком как пары (номер строки, dict)."""
+    reader = csv.DictReader(text)
+    for record in reader:
+        yield reader.line_num, {
+            key: value for key, value in record.items()
+            if key is not None and value not in ("", None)
+        }
+
+
+class TaskImporter:
+    """Класс для импорта задач порциями ограниченного размера."""
+
+    def __init__(self, task_crud: crud.TaskCRUD, chunk_size: int = 1000):
+        """Инициализация класса TaskImporter."""
+        self.task_crud = task_crud
+        self.chunk_size = chunk_size
+
+    async def import_file(
+            self, fileobj: BinaryIO, file_format: str) -> schemas.ImportResult:
+        """Импортирует задачи из файла, читая его порциями.
+
+        В памяти одновременно находится не больше chunk_size строк;
+        каждая порция валидируется и записывается отдельной транзакцией.
+        """
+        text = io.TextIOWrapper(
+            fileobj, encoding="utf-8", errors="replace", newline="")
+        rows = _iter_csv(text) if file_format == "csv" else _iter_ndjson(text)
+        result = schemas.ImportResult(accepted=0, rejected=0, errors=[])
+
+        try:
+            while True:
+                chunk = await run_in_threadpool(
+                    lambda: list(islice(rows, self.chunk_size)))
+                if not chunk:
+                    break
+
+                valid = []
+                for line_no, item in chunk:
+                    try:
+                        valid.append(self._validate(item).dict())
+                    except (ValueError, TypeError) as exc:
+                        result.rejected += 1
+                        if len(result.errors) < MAX_REPORTED_ERRORS:
+                            result.errors.append(
+                                schemas.ImportRowError(
+                                    line=line_no, detail=_error_detail(exc)))
+
+                if valid:
+                    await self.task_crud.bulk_insert(valid)
+                    result.accepted += len(valid)
+        finally:
+            # Одно событие reset на весь импорт, а не на каждую порцию.
+            if result.accepted:
+                await self.task_crud.db.rollback()
+                await self.task_crud.publish_reset()
+
+        text.detach()
+        return result
+
+    @staticmethod
+    def _validate(item: Any) -> schemas.TaskCreate:
+        """Валидирует разобранную строку файла."""
+        if isinstance(item, Exception):
+            raise item
+        if not isinstance(item, dict):
+            raise TypeError("Expected a JSON object")
+        return schemas.TaskCreate(**item)
+
+
+def _error_detail(exc: Exception) -> Any:
+    """Формирует описание ошибки строки импорта."""
+    if isinstance(exc, ValidationError):
+        return exc.errors(include_url=False, include_context=False)
+    return str(exc)
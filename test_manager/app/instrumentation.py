@@ -0,0 +1,140 @@
+"""Модуль инструментирования пула соединений и запросов к базе данных."""
+
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger("app.db")
+
+SlowQueryHook = Callable[[str, float], None]
+
+
+@dataclass
+class RequestDatabaseStats:
+    """Число запросов к базе и их суммарное время в рамках HTTP-запроса."""
+
+    statements: int = 0
+    duration: float = 0.0
+
+
+request_db_stats: ContextVar[Optional[RequestDatabaseStats]] = ContextVar(
+    "request_db_stats", default=None)
+
+
+class DatabaseMetrics:
+    """Счетчики ожидания соединений и медленных запросов."""
+
+    def __init__(self):
+        """Инициализация класса DatabaseMetrics."""
+        self.slow_query_hooks: list[SlowQueryHook] = []
+        self.reset()
+
+    def reset(self):
+        """Сбрасывает накопленные значения."""
+        self.acquisitions = 0
+        self.acquire_wait_total = 0.0
+        self.acquire_wait_max = 0.0
+        self.acquire_timeouts = 0
+        self.slow_queries = 0
+
+    def record_acquire(self, wait: float):
+        """Учитывает получение соединения из пула."""
+        self.acquisitions += 1
+        self.acquire_wait_total += wait
+        self.acquire_wait_max = max(self.acquire_wait_max, wait)
+
+    def record_slow_query(self, statement: str, duration: float):
+        """Учитывает медленный запрос и вызывает подписчиков."""
+        self.slow_queries += 1
+        logger.warning(
+            "Slow query (%.1f ms): %s", duration * 1000, statement[:1000])
+        for hook in self.slow_query_hooks:
+            hook(statement, duration)
+
+    def snapshot(self, engine: AsyncEngine) -> dict:
+        """Возвращает состояние пула и накопленные значения."""
+        pool = engine.pool
+        acquisitions = self.acquisitions
+        return {
+            "pool_class": type(pool).__name__,
+            "size": pool_value(pool, "size"),
+            "checked_out": pool_value(pool, "checkedout"),
+            "checked_in": pool_value(pool, "checkedin"),
+            "overflow": pool_value(pool, "overflow"),
+            "acquisitions": acquisitions,
+            "acquire_wait_avg_ms": round(
+                self.acquire_wait_total / acquisitions * 1000, 3)
+            if acquisitions else 0.0,
+            "acquire_wait_max_ms": round(self.acquire_wait_max * 1000, 3),
+            "acquire_timeouts": self.acquire_timeouts,
+            "slow_queries": self.slow_queries,
+        }
+
+
+db_metrics = DatabaseMetrics()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений, измеряющий время ожидания соединения.
+
+    Время измеряется вокруг публичного Pool.connect, через который
+    Engine.connect получает соединения, вместе с pre-ping и
+    переподключением.
+    """
+
+    def connect(self):
+        """Выдает соединение и учитывает время ожидания."""
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            db_metrics.acquire_timeouts += 1
+            raise
+        finally:
+            db_metrics.record_acquire(time.perf_counter() - started)
+
+
+def instrument_engine(engine: AsyncEngine, slow_query_ms: float):
+    """Подключает к движку учет запросов и журнал медленных запросов.
+
+    Время и число запросов добавляются к статистике текущего
+    HTTP-запроса, если она установлена в request_db_stats.
+    """
+    threshold = slow_query_ms / 1000
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters,
+                              context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(context):
+        # after_cursor_execute не вызывается для упавшего запроса.
+        if (context.connection is not None
+                and context.execution_context is not None):
+            started = context.connection.info.get("query_started")
+            if started:
+                started.pop()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters,
+                             context, executemany):
+        duration = time.perf_counter() - conn.info["query_started"].pop()
+        stats = request_db_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.duration += duration
+        if duration >= threshold:
+            db_metrics.record_slow_query(statement, duration)
+
+
+def pool_value(pool, name: str):
+    """Возвращает значение метода пула, если пул его поддерживает."""
+    method = getattr(pool, name, None)
+    return method() if callable(method) else None
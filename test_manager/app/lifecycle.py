@@ -0,0 +1,112 @@
+"""Модуль жизненного цикла рабочего процесса: прогрев и готовность.
+
+Процесс готов принимать запросы после прогрева пула соединений и
+компиляции основных запросов. После начала останова проба готовности
+отвечает отказом, а запросы продолжают обслуживаться, пока
+балансировщик не выведет процесс из ротации.
+"""
+
+import asyncio
+import logging
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app import crud, schemas
+from app.cache import TaskCache
+from app.instrumentation import pool_value
+
+logger = logging.getLogger(__name__)
+
+WARMUP_UUID = UUID(int=0)
+
+
+class Lifecycle:
+    """Состояние готовности рабочего процесса."""
+
+    def __init__(self):
+        """Инициализация класса Lifecycle."""
+        self.warmed = False
+        self.draining = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """Процесс прогрет и не останавливается."""
+        return self.warmed and not self.draining
+
+    async def warmup(self, engines: Sequence[AsyncEngine],
+                     session_factory) -> bool:
+        """Прогревает движки, если это еще не сделано.
+
+        Ошибка подключения не прерывает запуск: процесс остается
+        неготовым, и прогрев повторяется при следующей пробе.
+        """
+        async with self._lock:
+            if self.warmed:
+                return True
+            try:
+                for engine in engines:
+                    await warm_engine(engine, session_factory)
+            except (OSError, DBAPIError, PoolTimeoutError) as exc:
+                logger.warning("Database warmup failed: %s", exc)
+                return False
+            self.warmed = True
+            return True
+
+    def start_draining(self) -> None:
+        """Переводит процесс в режим останова."""
+        self.draining = True
+
+    def stats(self) -> dict:
+        """Возвращает состояние готовности."""
+        return {
+            "status": "ready" if self.ready else "unavailable",
+            "warmed": self.warmed,
+            "draining": self.draining,
+        }
+
+
+async def warm_engine(engine: AsyncEngine, session_factory) -> None:
+    """Заполняет пул соединений и кэш компиляции запросов движка."""
+    await warm_pool(engine, pool_value(engine.pool, "size") or 1)
+    async with session_factory(bind=engine) as session:
+        await warm_queries(crud.TaskCRUD(session, cache=TaskCache()))
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> None:
+    """Открывает connections соединений одновременно и возвращает в пул."""
+    async def connect() -> AsyncConnection:
+        connection = engine.connect()
+        await connection.start()
+        return connection
+
+    results = await asyncio.gather(
+        *(connect() for _ in range(connections)), return_exceptions=True)
+    await asyncio.gather(*(
+        result.close() for result in results
+        if isinstance(result, AsyncConnection)
+    ))
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+async def warm_queries(task_crud: crud.TaskCRUD) -> None:
+    """Выполняет запросы чтения горячих эндпоинтов.
+
+    Первое выполнение компилирует запрос и кладет его в кэш движка,
+    поэтому первые запросы клиентов не платят за компиляцию. Кэш
+    задач передается отдельный, чтобы не искажать его счетчики.
+    """
+    await task_crud.get_collection_version()
+    await task_crud.get_stats()
+    await task_crud.get_task_rows(limit=1, fields=schemas.LIST_DEFAULT_FIELDS)
+    await task_crud.get_task_rows(limit=1)
+    await task_crud.get_task_marker(WARMUP_UUID)
+    await task_crud.find_task(WARMUP_UUID)
+
+
+lifecycle = Lifecycle()
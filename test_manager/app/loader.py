@@ -0,0 +1,84 @@
+"""Модуль объединения одиночных чтений задач в пакетные запросы.
+
+Чтения задач по UUID, начатые в одном такте цикла событий,
+выполняются одним запросом WHERE uuid = ANY(...) на одной сессии.
+Повторяющиеся UUID пакета запрашиваются один раз.
+"""
+
+import asyncio
+from typing import Optional
+from uuid import UUID
+
+from app import crud
+from app.metrics import http_metrics
+from app.routing import ReplicaRouter
+from app.schemas import MAX_BATCH_SIZE
+
+
+class TaskLoader:
+    """Пакетная загрузка задач по UUID в стиле DataLoader.
+
+    Первое чтение такта планирует выборку через call_soon, поэтому
+    в пакет попадают все чтения, начатые до возврата в цикл событий.
+    Пакет из max_batch UUID уходит сразу. С router сессия пакета
+    открывается на реплике по его политике.
+    """
+
+    def __init__(self, session_factory,
+                 router: Optional[ReplicaRouter] = None,
+                 max_batch: int = MAX_BATCH_SIZE):
+        """Инициализация класса TaskLoader."""
+        self.session_factory = session_factory
+        self.router = router
+        self.max_batch = max_batch
+        self.loads = 0
+        self.batches = 0
+        self._pending: dict[UUID, asyncio.Future] = {}
+        self._scheduled = False
+        self._fetches: set[asyncio.Task] = set()
+
+    async def load(self, task_uuid: UUID):
+        """Ставит UUID в текущий пакет и ждет задачу или None."""
+        self.loads += 1
+        future = self._pending.get(task_uuid)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[task_uuid] = future
+            if len(self._pending) >= self.max_batch:
+                self._dispatch()
+            elif not self._scheduled:
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        """Забирает накопленный пакет и запускает его выборку."""
+        self._scheduled = False
+        batch, self._pending = self._pending, {}
+        if batch:
+            fetch = asyncio.create_task(self._fetch(batch))
+            self._fetches.add(fetch)
+            fetch.add_done_callback(self._fetches.discard)
+
+    async def _fetch(self, batch: dict[UUID, asyncio.Future]) -> None:
+        """Выбирает задачи пакета одним запросом."""
+        self.batches += 1
+        http_metrics.read_batch_size.observe(("get",), len(batch))
+        try:
+            if self.router is not None:
+                session = await self.router.read_session(
+                    self.session_factory)
+            else:
+                session = self.session_factory()
+            async with session:
+                found = await crud.TaskCRUD(session).get_tasks_by_uuids(
+                    list(batch))
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for task_uuid, future in batch.items():
+            if not future.done():
+                future.set_result(found.get(task_uuid))
@@ -1,19 +1,75 @@
 """Модуль с API эндпоинтами для управления задачами."""
 
+from contextlib import asynccontextmanager
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import (
+    FastAPI, Depends, Header, HTTPException, Query, Request, Response,
+    UploadFile, status
+)
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app import schemas, models, crud, permissions
-from app.database import get_db
+from app import (
+    schemas, models, crud, admission, coalescing, conditional, encoding,
+    formats, importer, loader, metrics, pagination, permissions
+)
+from app.cache import task_cache
+from app.config import get_settings
+from app.database import (
+    AsyncSessionLocal, engine, get_db, get_read_db, get_session_factory,
+    read_router
+)
+from app.events import parse_event_id, sse_stream, task_events
+from app.instrumentation import db_metrics
+from app.lifecycle import lifecycle
+from app.routing import prefers_primary
+
+EXPORT_BATCH_SIZE = 1000
+IMPORT_CHUNK_SIZE = 1000
+
+settings = get_settings()
+
+create_coalescer = coalescing.TaskCreateCoalescer(
+    AsyncSessionLocal, settings.write_coalesce_window_ms,
+    settings.write_coalesce_max_batch
+) if settings.write_coalescing else None
+
+task_loader = loader.TaskLoader(
+    AsyncSessionLocal, read_router
+) if settings.read_coalescing else None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Прогревает базу перед приемом запросов и освобождает ресурсы.
+
+    При останове накопленные создания задач записываются, лента
+    событий отключается от канала, а соединения пулов закрываются.
+    """
+    await lifecycle.warmup(read_router.engines, AsyncSessionLocal)
+    yield
+    lifecycle.start_draining()
+    if create_coalescer is not None:
+        await create_coalescer.drain()
+    await task_events.stop()
+    for db_engine in read_router.engines:
+        await db_engine.dispose()
 
 
 app = FastAPI(
     title="Task Manager API",
     description="CRUD API for managing tasks",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+app.add_middleware(
+    metrics.MetricsMiddleware,
+    profiler=metrics.SlowRequestProfiler(
+        settings.profile_slow_request_ms, settings.profile_interval_ms)
+    if settings.profile_slow_request_ms else None
 )
 
 
@@ -21,34 +77,291 @@ app = FastAPI(
           status_code=status.HTTP_201_CREATED)
 async def create_task(
     task: schemas.TaskCreate,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
-    """Создает новую задачу."""
-    task_crud = crud.TaskCRUD(db)
-    return await task_crud.create_task(task)
+    """Создает новую задачу.
+
+    При включенном объединении записей задача вставляется вместе
+    с конкурентными созданиями одной транзакцией, а сессия запроса
+    не занимает соединение.
+    """
+    if create_coalescer is not None:
+        db_task = await create_coalescer.create_task(task)
+    else:
+        db_task = await crud.TaskCRUD(db).create_task(task)
+    response.headers.update(conditional.task_headers(db_task))
+    return db_task
 
 
-@app.get("/tasks/", response_model=List[schemas.Task])
+@app.get("/tasks/", response_model=None, responses={200: {
+    "model": List[schemas.TaskListItem],
+    "content": {formats.MSGPACK: {}, formats.ARROW_STREAM: {}},
+}})
 async def get_tasks(
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
+    status_filter: Optional[schemas.TaskStatus] = Query(None, alias="status"),
+    q: Optional[str] = Query(None, max_length=255),
+    include_archived: bool = False,
+    fields: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Получает список задач с пагинацией.
+
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor
+    и передается обратно в параметре after. ETag списка строится по
+    счетчику изменений коллекции, который читается до загрузки строк.
+    Выбираются только нужные колонки, и ответ кодируется в JSON
+    напрямую, без ORM-объектов и повторной валидации схемой.
+
+    Параметр fields (через запятую, "*" — все) ограничивает поля
+    ответа и колонки запроса. Описание по умолчанию не загружается
+    и включается явным fields. По заголовку Accept ответ кодируется
+    в MessagePack или Arrow IPC, по умолчанию — в JSON.
+    """
+    selected_fields = _parse_fields(fields, schemas.LIST_DEFAULT_FIELDS)
+    media_type = formats.negotiate(accept, formats.LIST_MEDIA_TYPES)
+    cursor = None
+    if after is not None:
+        try:
+            cursor = pagination.decode_cursor(after)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
+    task_crud = crud.TaskCRUD(db)
+    etag = conditional.collection_etag(
+        await task_crud.get_collection_version(),
+        formats.ETAG_VARIANTS.get(media_type))
+    headers = {"ETag": etag, "Vary": "Accept"}
+    if conditional.is_not_modified(etag, if_none_match):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    rows = await task_crud.get_task_rows(
+        skip, limit, after=cursor, status=status_filter, search=q,
+        include_archived=include_archived, fields=selected_fields)
+    next_cursor = pagination.next_cursor(rows, limit)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(
+        formats.encode_tasks(rows, media_type, selected_fields),
+        media_type=media_type, headers=headers
+    )
+
+
+@app.get("/tasks/stats", response_model=schemas.TaskStats)
+async def get_task_stats(db: AsyncSession = Depends(get_read_db)):
+    """Возвращает количество задач по статусам без сканирования задач."""
+    task_crud = crud.TaskCRUD(db)
+    return await task_crud.get_stats()
+
+
+@app.get("/tasks/export")
+async def export_tasks(
+    status_filter: Optional[schemas.TaskStatus] = Query(None, alias="status"),
+    q: Optional[str] = Query(None, max_length=255),
+    batch_size: int = Query(EXPORT_BATCH_SIZE, ge=1, le=10000),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Выгружает все задачи потоком.
+
+    По умолчанию формат NDJSON; по заголовку Accept — поток значений
+    MessagePack или поток Arrow IPC с пакетом колонок на каждую
+    порцию batch_size строк.
+    """
+    task_crud = crud.TaskCRUD(db)
+    media_type = formats.negotiate(accept, formats.EXPORT_MEDIA_TYPES)
+    encoder = formats.stream_encoder(media_type)
+
+    async def generate():
+        async for partition in task_crud.stream_tasks(
+                status_filter, yield_per=batch_size, search=q):
+            yield encoder.encode(partition)
+        yield encoder.close()
+
+    return StreamingResponse(
+        generate(), media_type=media_type, headers={"Vary": "Accept"})
+
+
+@app.post("/tasks/import", response_model=schemas.ImportResult)
+async def import_tasks(
+    file: UploadFile,
+    import_format: Optional[str] = Query(None, alias="format"),
+    chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=10000),
+    db: AsyncSession = Depends(get_db)
+):
+    """Импортирует задачи из загруженного файла NDJSON или CSV."""
+    if import_format is None:
+        import_format = importer.detect_format(
+            file.filename, file.content_type)
+    if import_format not in importer.IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported import format"
+        )
+
+    task_importer = importer.TaskImporter(crud.TaskCRUD(db), chunk_size)
+    return await task_importer.import_file(file.file, import_format)
+
+
+@app.get("/tasks/events")
+async def stream_task_events(
+    last_event_id: Optional[str] = Header(None),
+    since: Optional[str] = None,
+    session_factory=Depends(get_session_factory)
+):
+    """Отдает поток изменений задач в формате Server-Sent Events.
+
+    Клиент, переподключаясь, передает Last-Event-ID (или параметр
+    since) и получает пропущенные события из истории. Если они уже
+    недоступны, приходит событие reset и список нужно перечитать.
+    Счетчик изменений читается короткой сессией, которая не
+    удерживается на время потока.
+    """
+    last_event_id = last_event_id or since
+    revision = None
+    if last_event_id is not None:
+        try:
+            parse_event_id(last_event_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid event id"
+            )
+        async with session_factory() as session:
+            revision = await crud.TaskCRUD(session).get_revision()
+    return StreamingResponse(
+        sse_stream(task_events, last_event_id, revision=revision),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/tasks/lookup", response_model=schemas.TaskLookupResult)
+async def lookup_tasks(
+    lookup: schemas.TaskLookup,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Получает задачи по списку UUID одним запросом.
+
+    Задачи возвращаются в порядке запроса без повторов, а UUID,
+    которых нет ни в рабочей таблице, ни в архиве, — в missing.
+    """
+    found = await crud.TaskCRUD(db).get_tasks_by_uuids(lookup.uuids)
+    uuids = list(dict.fromkeys(lookup.uuids))
+    return Response(encoding.dumps({
+        "tasks": [
+            encoding.task_row_to_dict(found[task_uuid])
+            for task_uuid in uuids if task_uuid in found
+        ],
+        "missing": [
+            str(task_uuid) for task_uuid in uuids if task_uuid not in found
+        ],
+    }), media_type="application/json")
+
+
+@app.post("/tasks/batch", response_model=schemas.BatchResult)
+async def create_tasks_batch(
+    batch: schemas.TaskBatchCreate,
     db: AsyncSession = Depends(get_db)
 ):
-    """Получает список задач с пагинацией."""
+    """Создает пакет задач с результатом для каждого элемента."""
     task_crud = crud.TaskCRUD(db)
-    tasks = await task_crud.get_tasks(skip, limit)
-    return tasks
+    return {"results": await task_crud.create_tasks(batch.items)}
+
+
+@app.patch("/tasks/batch", response_model=schemas.BatchResult)
+async def update_tasks_batch(
+    batch: schemas.TaskBatchUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Обновляет пакет задач с результатом для каждого элемента."""
+    task_crud = crud.TaskCRUD(db)
+    return {"results": await task_crud.update_tasks(batch.items)}
+
+
+@app.delete("/tasks/batch", response_model=schemas.BatchResult)
+async def delete_tasks_batch(
+    batch: schemas.TaskBatchDelete,
+    db: AsyncSession = Depends(get_db)
+):
+    """Удаляет пакет задач с результатом для каждого элемента."""
+    task_crud = crud.TaskCRUD(db)
+    return {"results": await task_crud.delete_tasks(batch.uuids)}
+
+
+@app.post("/tasks/transition", response_model=schemas.TaskTransitionResult)
+async def transition_tasks(
+    transition: schemas.TaskTransition,
+    db: AsyncSession = Depends(get_db)
+):
+    """Переводит задачи, подходящие под фильтр, в целевой статус.
+
+    Переход выполняется на стороне базы данных, порциями по
+    chunk_size задач. С dry_run возвращаются только количества.
+    """
+    task_crud = crud.TaskCRUD(db)
+    return await task_crud.transition_tasks(transition)
 
 
 @app.get("/tasks/{task_uuid}", response_model=schemas.Task)
 async def get_task(
     task_uuid: UUID,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Получает задачу по UUID."""
+    """Получает задачу по UUID.
+
+    Для условного запроса сначала проверяется только маркер изменения,
+    и при совпадении возвращается 304 без загрузки задачи. С параметром
+    fields загружаются и возвращаются только перечисленные поля.
+    При включенном объединении чтений промах кэша загружается одним
+    запросом вместе с конкурентными чтениями других задач; клиенты,
+    закрепленные за основной базой, читают через свою сессию.
+    """
+    selected_fields = _parse_fields(fields)
     task_crud = crud.TaskCRUD(db)
-    task = await task_crud.get_task(task_uuid)
+    if if_none_match is not None or if_modified_since is not None:
+        marker = await task_crud.get_task_marker(task_uuid)
+        permissions.TaskPermissions.check_task_exists(marker)
+        version, updated_at = marker
+        etag = conditional.version_etag(version)
+        if conditional.is_not_modified(
+                etag, if_none_match, updated_at, if_modified_since):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={
+                    "ETag": etag,
+                    "Last-Modified": conditional.last_modified(updated_at),
+                }
+            )
+
+    if selected_fields != schemas.TASK_FIELDS:
+        row = await task_crud.get_task_fields(task_uuid, selected_fields)
+        permissions.TaskPermissions.check_task_exists(row)
+        return Response(
+            encoding.dumps(encoding.task_row_to_dict(row, selected_fields)),
+            media_type="application/json",
+            headers=conditional.task_headers(row)
+        )
+
+    task = await task_crud.get_task_cached(
+        task_uuid,
+        None if prefers_primary(request) else task_loader)
     permissions.TaskPermissions.check_task_exists(task)
+    response.headers.update(conditional.task_headers(task))
     return task
 
 
@@ -56,20 +369,31 @@ async def get_task(
 async def update_task(
     task_uuid: UUID,
     task_update: schemas.TaskUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
-    """Обновляет существующую задачу."""
-    task_crud = crud.TaskCRUD(db)
+    """Обновляет существующую задачу.
 
-    existing_task = await task_crud.get_task(task_uuid)
-    permissions.TaskPermissions.check_task_exists(existing_task)
+    При успехе выполняется один запрос. Причина отказа (404, 400
+    или 412) выясняется дополнительным чтением только при неудаче.
+    Задача архива возвращается в работу только сменой статуса.
+    """
+    task_crud = crud.TaskCRUD(db)
+    expected_versions = conditional.parse_if_match(if_match)
 
-    if task_update.status and existing_task.status != task_update.status:
-        permissions.TaskPermissions.validate_status_transition(
-            existing_task.status, task_update.status
-        )
+    updated_task = await task_crud.update_task(
+        task_uuid, task_update, expected_versions)
+    if updated_task is None:
+        existing_task = await task_crud.find_task(task_uuid)
+        permissions.TaskPermissions.check_task_exists(existing_task)
+        if task_update.status and existing_task.status != task_update.status:
+            permissions.TaskPermissions.validate_status_transition(
+                existing_task.status, task_update.status
+            )
+    permissions.TaskPermissions.check_precondition(updated_task)
 
-    updated_task = await task_crud.update_task(task_uuid, task_update)
+    response.headers.update(conditional.task_headers(updated_task))
     return updated_task
 
 
@@ -81,7 +405,7 @@ async def delete_task(
     """Удаляет задачу по UUID."""
     task_crud = crud.TaskCRUD(db)
 
-    existing_task = await task_crud.get_task(task_uuid)
+    existing_task = await task_crud.find_task(task_uuid)
     permissions.TaskPermissions.check_task_exists(existing_task)
 
     success = await task_crud.delete_task(task_uuid)
@@ -90,3 +414,75 @@ async def delete_task(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete task"
         )
+
+
+def _parse_fields(
+        value: Optional[str],
+        default: tuple[str, ...] = schemas.TASK_FIELDS) -> tuple[str, ...]:
+    """Разбирает параметр fields или отвечает 400."""
+    try:
+        return schemas.parse_fields(value, default)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        )
+
+
+@app.get("/internal/cache", response_model=schemas.CacheStats)
+async def get_cache_stats():
+    """Возвращает счетчики кэша задач."""
+    return task_cache.stats()
+
+
+@app.get("/internal/db-pool", response_model=schemas.PoolStats)
+async def get_db_pool_stats():
+    """Возвращает состояние пула соединений и счетчики запросов."""
+    return db_metrics.snapshot(engine)
+
+
+@app.get("/internal/admission", response_model=schemas.AdmissionStats)
+async def get_admission_stats():
+    """Возвращает заполненность бюджетов чтений и записей."""
+    return {"budgets": [
+        budget.stats()
+        for budget in (admission.read_budget, admission.write_budget)
+    ]}
+
+
+@app.get("/internal/events", response_model=schemas.EventStats)
+async def get_event_stats():
+    """Возвращает число подписчиков и размер истории событий."""
+    return task_events.stats()
+
+
+@app.get("/internal/db-routing", response_model=schemas.RoutingStats)
+async def get_db_routing_stats():
+    """Возвращает состояние реплик и распределение чтений."""
+    return read_router.stats()
+
+
+@app.get("/health/live", response_model=schemas.Liveness)
+async def get_liveness():
+    """Проба живости: цикл событий процесса отвечает."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready", response_model=schemas.Readiness,
+         responses={503: {"model": schemas.Readiness}})
+async def get_readiness(response: Response):
+    """Проба готовности: процесс прогрет и не останавливается.
+
+    Если прогрев при запуске не удался, он повторяется здесь.
+    """
+    if not lifecycle.draining:
+        await lifecycle.warmup(read_router.engines, AsyncSessionLocal)
+    if not lifecycle.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return lifecycle.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Возвращает метрики в текстовом формате Prometheus."""
+    return PlainTextResponse(
+        metrics.http_metrics.render(engine), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,277 @@
+"""Модуль метрик HTTP-запросов в текстовом формате Prometheus.
+
+Middleware измеряет время ответа по шаблону маршрута, а также число
+и суммарное время запросов к базе, которые собирают события движка
+из app.instrumentation. Для запросов дольше порога можно включить
+сэмплирующий профилировщик.
+"""
+
+import logging
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.instrumentation import (
+    RequestDatabaseStats, db_metrics, request_db_stats
+)
+
+logger = logging.getLogger("app.metrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 4, 5, 10, 25, 50, 100)
+BATCH_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин и метками."""
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: tuple, buckets: tuple):
+        """Инициализация класса Histogram."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float):
+        """Добавляет наблюдение в серию с заданными метками."""
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * len(self.buckets) + [0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def clear(self):
+        """Удаляет все серии."""
+        self._series.clear()
+
+    def render(self) -> list[str]:
+        """Формирует строки гистограммы в формате Prometheus."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for labels, series in sorted(self._series.items()):
+            label_text = ",".join(
+                f'{name}="{_escape(value)}"'
+                for name, value in zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{{label_text},le="{bound}"}} '
+                    f'{cumulative}')
+            lines.append(
+                f'{self.name}_bucket{{{label_text},le="+Inf"}} {series[-1]}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {series[-2]}")
+            lines.append(f"{self.name}_count{{{label_text}}} {series[-1]}")
+        return lines
+
+
+class HttpMetrics:
+    """Набор метрик HTTP-запросов и объединения записей и чтений."""
+
+    def __init__(self):
+        """Инициализация класса HttpMetrics."""
+        self.latency = Histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by route and status.",
+            ("method", "route", "status"), LATENCY_BUCKETS)
+        self.db_statements = Histogram(
+            "http_request_db_statements",
+            "Database statements executed per HTTP request.",
+            ("method", "route"), STATEMENT_BUCKETS)
+        self.db_duration = Histogram(
+            "http_request_db_duration_seconds",
+            "Time spent in database statements per HTTP request.",
+            ("method", "route"), LATENCY_BUCKETS)
+        self.write_batch_size = Histogram(
+            "write_coalesced_batch_size",
+            "Writes merged into one transaction by the write coalescer.",
+            ("operation",), BATCH_BUCKETS)
+        self.read_batch_size = Histogram(
+            "read_coalesced_batch_size",
+            "Single-task reads merged into one query by the task loader.",
+            ("operation",), BATCH_BUCKETS)
+
+    @property
+    def histograms(self) -> tuple[Histogram, ...]:
+        """Все гистограммы набора."""
+        return (self.latency, self.db_statements, self.db_duration,
+                self.write_batch_size, self.read_batch_size)
+
+    def observe(self, method: str, route: str, status: int,
+                duration: float, stats: RequestDatabaseStats):
+        """Учитывает завершенный HTTP-запрос."""
+        self.latency.observe((method, route, str(status)), duration)
+        self.db_statements.observe((method, route), stats.statements)
+        self.db_duration.observe((method, route), stats.duration)
+
+    def clear(self):
+        """Сбрасывает все метрики."""
+        for histogram in self.histograms:
+            histogram.clear()
+
+    def render(self, engine: Optional[AsyncEngine] = None) -> str:
+        """Формирует все метрики, включая состояние пула соединений."""
+        lines = []
+        for histogram in self.histograms:
+            lines.extend(histogram.render())
+        if engine is not None:
+            pool = db_metrics.snapshot(engine)
+            gauges = {
+                "db_pool_checked_out": pool["checked_out"],
+                "db_pool_overflow": pool["overflow"],
+            }
+            counters = {
+                "db_pool_acquisitions_total": pool["acquisitions"],
+                "db_pool_acquire_wait_seconds_total": round(
+                    db_metrics.acquire_wait_total, 6),
+                "db_pool_acquire_timeouts_total": pool["acquire_timeouts"],
+                "db_slow_queries_total": pool["slow_queries"],
+            }
+            for name, value in gauges.items():
+                if value is not None:
+                    lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+            for name, value in counters.items():
+                lines += [f"# TYPE {name} counter", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+http_metrics = HttpMetrics()
+
+ProfileHook = Callable[[dict], None]
+
+
+class SlowRequestProfiler:
+    """Сэмплирующий профилировщик медленных запросов.
+
+    Пока есть активные запросы, фоновый поток снимает стек потока
+    цикла событий. Для запроса дольше порога отчет строится по снимкам
+    из интервала его выполнения. Цикл событий общий для всех запросов,
+    поэтому при конкурентной нагрузке атрибуция приблизительна.
+    """
+
+    def __init__(self, threshold_ms: float, interval_ms: float = 5.0,
+                 max_samples: int = 20000, top: int = 10):
+        """Инициализация класса SlowRequestProfiler."""
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.top = top
+        self.hooks: list[ProfileHook] = []
+        self.samples: deque = deque(maxlen=max_samples)
+        self._active = 0
+        self._thread_id: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+
+    def start_request(self):
+        """Отмечает начало запроса и запускает сэмплирование."""
+        self._active += 1
+        if self._sampler is None:
+            self._thread_id = threading.get_ident()
+            self._sampler = threading.Thread(
+                target=self._run, name="slow-request-profiler", daemon=True)
+            self._sampler.start()
+
+    def finish_request(self, method: str, route: str,
+                       started: float, duration: float):
+        """Отмечает окончание запроса и сообщает о медленном."""
+        self._active -= 1
+        if duration < self.threshold:
+            return
+
+        finished = started + duration
+        stacks = [
+            stack for timestamp, stack in list(self.samples)
+            if started <= timestamp <= finished
+        ]
+        report = {
+            "method": method,
+            "route": route,
+            "duration_ms": round(duration * 1000, 1),
+            "samples": len(stacks),
+            "top_frames": Counter(
+                stack[0] for stack in stacks).most_common(self.top),
+            "top_stacks": Counter(stacks).most_common(3),
+        }
+        logger.warning(
+            "Slow request %s %s (%.1f ms), top frames: %s",
+            method, route, report["duration_ms"], report["top_frames"])
+        for hook in self.hooks:
+            hook(report)
+
+    def _run(self):
+        """Снимает стек потока цикла событий с заданным интервалом."""
+        while True:
+            time.sleep(self.interval)
+            if not self._active:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.samples.append((time.perf_counter(), _stack(frame)))
+
+
+class MetricsMiddleware:
+    """ASGI middleware для учета времени ответа и запросов к базе."""
+
+    def __init__(self, app, profiler: Optional[SlowRequestProfiler] = None):
+        """Инициализация класса MetricsMiddleware."""
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        """Обрабатывает запрос и записывает его метрики."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                response_status[0] = message["status"]
+            await send(message)
+
+        stats = RequestDatabaseStats()
+        token = request_db_stats.set(stats)
+        if self.profiler is not None:
+            self.profiler.start_request()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started
+            request_db_stats.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_metrics.observe(
+                scope["method"], route, response_status[0], duration, stats)
+            if self.profiler is not None:
+                self.profiler.finish_request(
+                    scope["method"], route, started, duration)
+
+
+def _stack(frame, limit: int = 30) -> tuple:
+    """Возвращает стек вызовов от текущего кадра вверх."""
+    frames = []
+    while frame is not None and len(frames) < limit:
+        code = frame.f_code
+        frames.append(f"{code.co_filename}:{frame.f_lineno}:{code.co_name}")
+        frame = frame.f_back
+    return tuple(frames)
+
+
+def _escape(value: str) -> str:
+    """Экранирует значение метки Prometheus."""
+    return (str(value).replace("\\", "\\\\").replace('"', '\\"')
+            .replace("\n", "\\n"))
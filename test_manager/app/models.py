@@ -2,10 +2,20 @@
 
 import enum
 import uuid
-from sqlalchemy import Column, Enum, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    DDL, BigInteger, Column, DateTime, Enum, Index, Integer, Sequence, String,
+    Text, Uuid, event, text
+)
 
 from app.database import Base
+from app.search import SEARCH_VECTOR, SQLITE_FTS_DROP, sqlite_fts_ddl
+
+
+def utcnow() -> datetime:
+    """Возвращает текущее время в UTC."""
+    return datetime.now(timezone.utc)
 
 
 class TaskStatus(str, enum.Enum):
@@ -20,9 +30,86 @@ class Task(Base):
     """Модель задачи в базе данных."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_created_at_uuid", "created_at", "uuid"),
+        Index(
+            "ix_tasks_status_created_at_uuid", "status", "created_at", "uuid"
+        ),
+        Index(
+            "ix_tasks_status_completed_at", "status", "completed_at"
+        ),
+        Index(
+            "ix_tasks_search", text(SEARCH_VECTOR), postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
 
-    uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    uuid = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     status = Column(
         Enum(TaskStatus), default=TaskStatus.CREATED, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), default=utcnow, nullable=False)
+    version = Column(Integer, default=1, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), default=utcnow, onupdate=utcnow,
+        nullable=False)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+
+for statement in sqlite_fts_ddl():
+    event.listen(Task.__table__, "after_create", statement)
+event.listen(
+    Task.__table__, "after_drop",
+    DDL(SQLITE_FTS_DROP).execute_if(dialect="sqlite")
+)
+
+
+class ArchivedTask(Base):
+    """Модель завершенной задачи, перенесенной в архив.
+
+    Колонки совпадают с колонками Task, поэтому строки переносятся
+    между таблицами одним INSERT ... SELECT.
+    """
+
+    __tablename__ = "tasks_archive"
+    __table_args__ = (
+        Index("ix_tasks_archive_created_at_uuid", "created_at", "uuid"),
+    )
+
+    uuid = Column(Uuid(as_uuid=True), primary_key=True)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    status = Column(Enum(TaskStatus), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    version = Column(Integer, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), onupdate=utcnow, nullable=False)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(
+        DateTime(timezone=True), default=utcnow, nullable=False)
+
+
+class TaskCounter(Base):
+    """Модель счетчика, поддерживаемого при каждой записи задач."""
+
+    __tablename__ = "task_counters"
+
+    REVISION = "revision"
+
+    name = Column(String(64), primary_key=True)
+    value = Column(BigInteger, default=0, nullable=False)
+
+
+# Номера изменений на PostgreSQL; SQLite хранит их строкой "revision".
+task_revision_seq = Sequence("task_revision_seq", metadata=Base.metadata)
+
+
+event.listen(
+    TaskCounter.__table__, "after_create",
+    DDL("INSERT INTO task_counters (name, value) VALUES " + ", ".join(
+        f"('{name}', 0)" for name in [TaskCounter.REVISION] + [
+            f"status:{task_status.value}" for task_status in TaskStatus
+        ]
+    ))
+)
@@ -0,0 +1,35 @@
+"""Модуль курсорной (keyset) пагинации списка задач."""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from app import models
+
+Cursor = Tuple[datetime, UUID]
+
+
+def encode_cursor(task: models.Task) -> str:
+    """Кодирует позицию задачи в непрозрачный курсор."""
+    payload = json.dumps([task.created_at.isoformat(), str(task.uuid)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Декодирует курсор в ключ сортировки (created_at, uuid)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, task_uuid = json.loads(
+            base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), UUID(task_uuid)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def next_cursor(tasks: list, limit: int) -> Optional[str]:
+    """Возвращает курсор следующей страницы, если она может существовать."""
+    if not tasks or len(tasks) < limit:
+        return None
+    return encode_cursor(tasks[-1])
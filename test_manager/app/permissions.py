@@ -6,6 +6,12 @@ from fastapi import HTTPException, status
 class TaskPermissions:
     """Класс для проверки прав доступа и валидации операций с задачами."""
 
+    VALID_TRANSITIONS = {
+        "created": ["in_progress", "completed"],
+        "in_progress": ["completed"],
+        "completed": ["in_progress"]
+    }
+
     @staticmethod
     def check_task_exists(task):
         """Проверяет существование задачи."""
@@ -18,14 +24,32 @@ class TaskPermissions:
     @staticmethod
     def validate_status_transition(current_status, new_status):
         """Валидирует переход между статусами задачи."""
-        valid_transitions = {
-            "created": ["in_progress", "completed"],
-            "in_progress": ["completed"],
-            "completed": ["in_progress"]
-        }
-
+        valid_transitions = TaskPermissions.VALID_TRANSITIONS
         if new_status not in valid_transitions.get(current_status, []):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Cannot transition from {current_status} to {new_status}"
             )
+
+    @staticmethod
+    def allowed_predecessors(new_status) -> list[str]:
+        """Возвращает статусы, из которых допустим переход в new_status.
+
+        Текущий статус, совпадающий с новым, тоже допустим: такое
+        обновление не является переходом.
+        """
+        return [new_status] + [
+            current_status
+            for current_status, targets in
+            TaskPermissions.VALID_TRANSITIONS.items()
+            if new_status in targets
+        ]
+
+    @staticmethod
+    def check_precondition(task):
+        """Проверяет, что условное обновление задачи применилось."""
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Task has been modified"
+            )
@@ -0,0 +1,49 @@
+"""Команда пересчета счетчиков задач по статусам.
+
+Запуск однократно или периодически:
+
+    python -m app.reconcile
+    python -m app.reconcile --interval 3600
+"""
+
+import argparse
+import asyncio
+import logging
+
+from app import crud
+from app.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_once():
+    """Пересчитывает счетчики и сообщает о найденном расхождении."""
+    async with AsyncSessionLocal() as session:
+        task_crud = crud.TaskCRUD(session)
+        before = await task_crud.get_stats()
+        await session.rollback()
+        after = await task_crud.reconcile_stats()
+    if before != after:
+        logger.warning("Task counters drifted: %s -> %s", before, after)
+    else:
+        logger.info("Task counters are exact: %s", after)
+    return after
+
+
+async def run(interval: float = 0):
+    """Выполняет пересчет один раз или с заданным интервалом в секундах."""
+    while True:
+        await reconcile_once()
+        if not interval:
+            return
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile task counters")
+    parser.add_argument(
+        "--interval", type=float, default=0,
+        help="repeat every N seconds instead of running once")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(args.interval))
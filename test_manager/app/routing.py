@@ -0,0 +1,201 @@
+"""Модуль маршрутизации чтений между основной базой и репликами."""
+
+import itertools
+import time
+from contextvars import ContextVar, Token
+from typing import Optional, Sequence
+
+from fastapi import Request, Response
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.instrumentation import pool_value
+
+PRIMARY_COOKIE = "read_primary_until"
+ROUND_ROBIN = "round_robin"
+LEAST_BUSY = "least_busy"
+
+wrote_in_request: ContextVar[bool] = ContextVar(
+    "wrote_in_request", default=False)
+
+
+class ReplicaSession(AsyncSession):
+    """Сессия чтения с реплики с откатом на основную базу.
+
+    Соединение берется при первом запросе, а не при открытии сессии:
+    чтения из кэша и условные запросы не занимают соединений. Если
+    к реплике не удалось подключиться, сессия переключается на
+    основную базу.
+    """
+
+    def __init__(self, router: "ReplicaRouter", **kw):
+        """Инициализация класса ReplicaSession."""
+        super().__init__(**kw)
+        self.router = router
+        self._connected = False
+
+    async def execute(self, *args, **kwargs):
+        """Выполняет запрос после подключения."""
+        await self._connect()
+        return await super().execute(*args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        """Выполняет запрос после подключения."""
+        await self._connect()
+        return await super().scalar(*args, **kwargs)
+
+    async def scalars(self, *args, **kwargs):
+        """Выполняет запрос после подключения."""
+        await self._connect()
+        return await super().scalars(*args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """Получает объект по ключу после подключения."""
+        await self._connect()
+        return await super().get(*args, **kwargs)
+
+    async def stream(self, *args, **kwargs):
+        """Выполняет потоковый запрос после подключения."""
+        await self._connect()
+        return await super().stream(*args, **kwargs)
+
+    async def stream_scalars(self, *args, **kwargs):
+        """Выполняет потоковый запрос после подключения."""
+        await self._connect()
+        return await super().stream_scalars(*args, **kwargs)
+
+    async def _connect(self) -> None:
+        """Подключается к реплике или переключается на основную базу."""
+        if self._connected:
+            return
+        self._connected = True
+        replica = self.bind
+        try:
+            await self.connection()
+        except (OSError, DBAPIError, PoolTimeoutError):
+            await self.close()
+            self.bind = self.router.primary
+            self.sync_session.bind = self.router.primary.sync_engine
+            self.router.fall_back(replica)
+
+
+class ReplicaRouter:
+    """Выбор движка для чтения: реплика по политике или основная база.
+
+    Реплика, к которой не удалось подключиться, исключается из выбора
+    на retry_seconds, а чтение выполняется на основной базе.
+    """
+
+    def __init__(self, primary: AsyncEngine,
+                 replicas: Sequence[AsyncEngine] = (),
+                 selection: str = ROUND_ROBIN,
+                 retry_seconds: float = 30.0):
+        """Инициализация класса ReplicaRouter."""
+        if selection not in (ROUND_ROBIN, LEAST_BUSY):
+            raise ValueError(f"Unknown replica selection: {selection}")
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.selection = selection
+        self.retry_seconds = retry_seconds
+        self.reads = {id(engine): 0 for engine in self.engines}
+        self.fallbacks = 0
+        self._down_until: dict[int, float] = {}
+        self._counter = itertools.count()
+
+    @property
+    def engines(self) -> list[AsyncEngine]:
+        """Основная база и реплики."""
+        return [self.primary, *self.replicas]
+
+    def healthy_replicas(self) -> list[AsyncEngine]:
+        """Реплики, не исключенные после ошибки подключения."""
+        now = time.monotonic()
+        return [
+            replica for replica in self.replicas
+            if self._down_until.get(id(replica), 0) <= now
+        ]
+
+    def choose(self) -> AsyncEngine:
+        """Выбирает реплику по политике или основную базу."""
+        replicas = self.healthy_replicas()
+        if not replicas:
+            return self.primary
+        start = next(self._counter) % len(replicas)
+        replicas = replicas[start:] + replicas[:start]
+        if self.selection == LEAST_BUSY:
+            return min(replicas, key=_checked_out)
+        return replicas[0]
+
+    def mark_down(self, engine: AsyncEngine) -> None:
+        """Исключает реплику из выбора на retry_seconds."""
+        self._down_until[id(engine)] = time.monotonic() + self.retry_seconds
+
+    def fall_back(self, replica: AsyncEngine) -> None:
+        """Учитывает переключение чтения с реплики на основную базу."""
+        self.mark_down(replica)
+        self.fallbacks += 1
+        self.reads[id(replica)] -= 1
+        self.reads[id(self.primary)] += 1
+
+    async def read_session(self, session_factory,
+                           use_primary: bool = False) -> AsyncSession:
+        """Открывает сессию чтения с откатом на основную базу.
+
+        Сессия реплики подключается при первом запросе (см.
+        ReplicaSession), поэтому открытие сессии не занимает
+        соединение и не выполняет проверку pool_pre_ping.
+        """
+        engine = self.primary if use_primary else self.choose()
+        self.reads[id(engine)] += 1
+        if engine is self.primary:
+            return session_factory(bind=engine)
+        return ReplicaSession(self, **{**session_factory.kw, "bind": engine})
+
+    def stats(self) -> dict:
+        """Возвращает состояние движков и число чтений."""
+        now = time.monotonic()
+        return {
+            "selection": self.selection,
+            "fallbacks": self.fallbacks,
+            "engines": [
+                {
+                    "url": engine.url.render_as_string(hide_password=True),
+                    "role": "primary" if engine is self.primary
+                    else "replica",
+                    "healthy": self._down_until.get(id(engine), 0) <= now,
+                    "checked_out": pool_value(engine.pool, "checkedout"),
+                    "reads": self.reads[id(engine)],
+                }
+                for engine in self.engines
+            ],
+        }
+
+
+def mark_write(response: Response, sticky_seconds: float) -> Token:
+    """Закрепляет чтения клиента за основной базой после записи.
+
+    В рамках текущего запроса закрепление хранится в контексте
+    (возвращается токен для его сброса), для следующих запросов
+    клиента — в cookie на sticky_seconds.
+    """
+    if sticky_seconds > 0:
+        response.set_cookie(
+            PRIMARY_COOKIE, f"{time.time() + sticky_seconds:.3f}",
+            max_age=int(sticky_seconds) + 1, httponly=True, samesite="lax")
+    return wrote_in_request.set(True)
+
+
+def prefers_primary(request: Request) -> bool:
+    """Проверяет, должен ли запрос читать с основной базы."""
+    if wrote_in_request.get():
+        return True
+    value: Optional[str] = request.cookies.get(PRIMARY_COOKIE)
+    try:
+        return value is not None and float(value) > time.time()
+    except ValueError:
+        return False
+
+
+def _checked_out(engine: AsyncEngine) -> int:
+    """Число занятых соединений пула движка."""
+    return pool_value(engine.pool, "checkedout") or 0
@@ -1,10 +1,14 @@
 """Модуль Pydantic схем для валидации данных задач."""
 
+from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+MAX_BATCH_SIZE = 1000
+TRANSITION_CHUNK_SIZE = 1000
 
 
 class TaskStatus(str, Enum):
@@ -46,3 +50,250 @@ class Task(TaskBase):
         """Конфигурация Pydantic модели."""
 
         from_attributes = True
+
+
+class TaskListItem(BaseModel):
+    """Схема строки списка задач: только поля, выбранные fields."""
+
+    uuid: Optional[UUID] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[TaskStatus] = None
+
+
+TASK_FIELDS = tuple(Task.model_fields)
+LIST_DEFAULT_FIELDS = tuple(
+    field for field in TASK_FIELDS if field != "description")
+ALL_FIELDS = "*"
+
+
+def parse_fields(value: Optional[str],
+                 default: tuple[str, ...] = TASK_FIELDS) -> tuple[str, ...]:
+    """Разбирает параметр fields в поля schemas.Task в порядке схемы.
+
+    Без параметра возвращаются поля по умолчанию, значение "*"
+    выбирает все поля. Неизвестное поле вызывает ValueError.
+    """
+    if value is None:
+        return default
+    requested = {field.strip() for field in value.split(",")} - {""}
+    if requested == {ALL_FIELDS}:
+        return TASK_FIELDS
+    if not requested:
+        raise ValueError("No fields requested")
+    unknown = requested - set(TASK_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(field for field in TASK_FIELDS if field in requested)
+
+
+class TaskBatchCreate(BaseModel):
+    """Схема пакетного создания задач.
+
+    Элементы валидируются по отдельности, поэтому ошибка в одном из них
+    не отклоняет весь пакет.
+    """
+
+    items: List[Dict[str, Any]] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchUpdateItem(TaskUpdate):
+    """Схема элемента пакетного обновления задач."""
+
+    uuid: UUID
+
+
+class TaskBatchUpdate(BaseModel):
+    """Схема пакетного обновления задач."""
+
+    items: List[Dict[str, Any]] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchDelete(BaseModel):
+    """Схема пакетного удаления задач."""
+
+    uuids: List[UUID] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskLookup(BaseModel):
+    """Схема запроса задач по списку UUID."""
+
+    uuids: List[UUID] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskLookupResult(BaseModel):
+    """Схема ответа на запрос задач по списку UUID."""
+
+    tasks: List[Task]
+    missing: List[UUID]
+
+
+class TaskTransition(BaseModel):
+    """Схема массового перехода задач в статус по фильтру.
+
+    chunk_size ограничивает число задач в одной транзакции;
+    null — все подходящие задачи одной транзакцией.
+    """
+
+    target: TaskStatus
+    status: Optional[TaskStatus] = None
+    uuids: Optional[List[UUID]] = Field(
+        None, min_length=1, max_length=MAX_BATCH_SIZE)
+    q: Optional[str] = Field(None, max_length=255)
+    updated_before: Optional[datetime] = None
+    chunk_size: Optional[int] = Field(TRANSITION_CHUNK_SIZE, ge=1)
+    dry_run: bool = False
+
+    @model_validator(mode="after")
+    def check_filter(self):
+        """Проверяет, что задан хотя бы один фильтр."""
+        if (self.status is None and self.uuids is None
+                and not (self.q and self.q.strip())
+                and self.updated_before is None):
+            raise ValueError(
+                "At least one of status, uuids, q, updated_before is required")
+        return self
+
+
+class TaskTransitionResult(BaseModel):
+    """Схема ответа массового перехода задач."""
+
+    matched: int
+    changed: int
+    skipped: int
+    dry_run: bool
+
+
+class BatchItemResult(BaseModel):
+    """Результат обработки одного элемента пакета."""
+
+    index: int
+    status_code: int
+    uuid: Optional[UUID] = None
+    task: Optional[Task] = None
+    detail: Optional[Any] = None
+
+
+class BatchResult(BaseModel):
+    """Схема ответа пакетной операции."""
+
+    results: List[BatchItemResult]
+
+
+class ImportRowError(BaseModel):
+    """Ошибка в строке импортируемого файла."""
+
+    line: int
+    detail: Any
+
+
+class ImportResult(BaseModel):
+    """Схема ответа импорта задач."""
+
+    accepted: int
+    rejected: int
+    errors: List[ImportRowError]
+
+
+class TaskStats(BaseModel):
+    """Схема статистики задач по статусам."""
+
+    counts: Dict[TaskStatus, int]
+    total: int
+
+
+class CacheStats(BaseModel):
+    """Схема статистики кэша задач."""
+
+    backend: str
+    hits: int
+    misses: int
+    evictions: int
+    size: Optional[int] = None
+    maxsize: Optional[int] = None
+
+
+class PoolStats(BaseModel):
+    """Схема состояния пула соединений с базой данных."""
+
+    pool_class: str
+    size: Optional[int] = None
+    checked_out: Optional[int] = None
+    checked_in: Optional[int] = None
+    overflow: Optional[int] = None
+    acquisitions: int
+    acquire_wait_avg_ms: float
+    acquire_wait_max_ms: float
+    acquire_timeouts: int
+    slow_queries: int
+
+
+class EngineStats(BaseModel):
+    """Схема состояния одной базы данных для чтения."""
+
+    url: str
+    role: str
+    healthy: bool
+    checked_out: Optional[int] = None
+    reads: int
+
+
+class RoutingStats(BaseModel):
+    """Схема распределения чтений между основной базой и репликами."""
+
+    selection: str
+    fallbacks: int
+    engines: List[EngineStats]
+
+
+class ConcurrencyStats(BaseModel):
+    """Схема заполненности ограничения одновременных запросов."""
+
+    limit: int
+    active: int
+    waiting: int
+    queue_size: int
+    admitted: int
+    rejected: int
+    timeouts: int
+
+
+class BudgetStats(BaseModel):
+    """Схема состояния бюджета допуска запросов."""
+
+    name: str
+    concurrency: Optional[ConcurrencyStats] = None
+    rate_limited: int
+
+
+class AdmissionStats(BaseModel):
+    """Схема состояния контроля допуска запросов."""
+
+    budgets: List[BudgetStats]
+
+
+class EventStats(BaseModel):
+    """Схема состояния ленты событий."""
+
+    backend: str
+    subscribers: int
+    history: int
+    published: int
+    failed: int
+    dropped_subscribers: int
+
+
+class Liveness(BaseModel):
+    """Схема ответа пробы живости."""
+
+    status: str
+
+
+class Readiness(BaseModel):
+    """Схема ответа пробы готовности."""
+
+    status: str
+    warmed: bool
+    draining: bool
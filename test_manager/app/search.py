@@ -0,0 +1,85 @@
+"""Модуль полнотекстового поиска задач.
+
+На PostgreSQL поиск идет по GIN-индексу на выражении tsvector,
+на SQLite — по внешней таблице FTS5, синхронизируемой триггерами.
+"""
+
+from sqlalchemy import DDL, and_, or_, text
+
+SEARCH_CONFIG = "simple"
+SEARCH_VECTOR = (
+    f"to_tsvector('{SEARCH_CONFIG}', "
+    "coalesce(title, '') || ' ' || coalesce(description, ''))"
+)
+
+# Первичный ключ tasks — UUID, поэтому неявный rowid таблицы может
+# перенумероваться при VACUUM. Таблица FTS5 ссылается на отдельную
+# колонку search_id, которую заполняет триггер вставки.
+SQLITE_FTS_DDL = [
+    "ALTER TABLE tasks ADD COLUMN search_id INTEGER",
+    "UPDATE tasks SET search_id = rowid WHERE search_id IS NULL",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_tasks_search_id "
+    "ON tasks (search_id)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='search_id')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "UPDATE tasks SET search_id = ("
+    "SELECT coalesce(max(search_id), 0) + 1 FROM tasks) "
+    "WHERE rowid = new.rowid; "
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "SELECT search_id, title, description FROM tasks "
+    "WHERE rowid = new.rowid; END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.search_id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au "
+    "AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.search_id, old.title, old.description); "
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "VALUES (new.search_id, new.title, new.description); END",
+    "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+]
+SQLITE_FTS_DROP = "DROP TABLE IF EXISTS tasks_fts"
+
+
+def sqlite_fts_ddl() -> list[DDL]:
+    """Возвращает DDL таблицы FTS5, выполняемый только на SQLite."""
+    return [DDL(statement).execute_if(dialect="sqlite")
+            for statement in SQLITE_FTS_DDL]
+
+
+def fts5_query(query: str) -> str:
+    """Экранирует пользовательский запрос для FTS5 MATCH.
+
+    Каждое слово берется в кавычки, слова объединяются по И,
+    как и в plainto_tsquery.
+    """
+    return " ".join(
+        '"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+def search_condition(dialect_name: str, query: str, title, description):
+    """Строит условие поиска задач по названию и описанию."""
+    if dialect_name == "postgresql":
+        return text(
+            f"{SEARCH_VECTOR} @@ plainto_tsquery('{SEARCH_CONFIG}', :query)"
+        ).bindparams(query=query)
+    if dialect_name == "sqlite":
+        return text(
+            "tasks.search_id IN (SELECT rowid FROM tasks_fts "
+            "WHERE tasks_fts MATCH :query)"
+        ).bindparams(query=fts5_query(query))
+
+    return scan_condition(query, title, description)
+
+
+def scan_condition(query: str, title, description):
+    """Строит условие поиска без полнотекстового индекса.
+
+    Каждое слово запроса должно встретиться в названии или описании.
+    """
+    return and_(*(
+        or_(title.ilike(f"%{word}%"), description.ilike(f"%{word}%"))
+        for word in query.split()
+    ))
@@ -0,0 +1,150 @@
+"""Модуль запуска приложения в продакшене.
+
+Запускает рабочие процессы uvicorn с uvloop и httptools, если они
+установлены. Несколько процессов (по умолчанию по числу доступных
+ядер) запускаются только с общим кэшем и общей лентой событий. По SIGTERM
+процесс сначала выводится из балансировки через пробу готовности
+и только после паузы перестает принимать соединения и дожидается
+текущих запросов.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import logging
+import os
+from types import FrameType
+from typing import Optional
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.config import Settings, get_settings
+from app.lifecycle import lifecycle
+
+APP = "app.main:app"
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class DrainingServer(uvicorn.Server):
+    """Сервер uvicorn с выводом из балансировки перед остановом."""
+
+    def __init__(self, config: uvicorn.Config, drain_seconds: float = 0):
+        """Инициализация класса DrainingServer."""
+        super().__init__(config)
+        self.drain_seconds = drain_seconds
+
+    def handle_exit(self, sig: int, frame: Optional[FrameType]) -> None:
+        """Откладывает останов на drain_seconds после первого сигнала.
+
+        Повторный сигнал останавливает сервер сразу.
+        """
+        if self.drain_seconds <= 0 or lifecycle.draining or self.should_exit:
+            super().handle_exit(sig, frame)
+            return
+        lifecycle.start_draining()
+        logger.info("Draining for %.1f seconds before shutdown",
+                    self.drain_seconds)
+        asyncio.get_event_loop().call_later(
+            self.drain_seconds, super().handle_exit, sig, frame)
+
+
+class DrainingMultiprocess(Multiprocess):
+    """Супервизор рабочих процессов с одновременным остановом.
+
+    Сигнал получают сразу все рабочие процессы, поэтому общее время
+    останова не растет с их числом.
+    """
+
+    def shutdown(self) -> None:
+        """Останавливает все рабочие процессы и дожидается их."""
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join()
+        logger.info("Stopping parent process [%d]", self.pid)
+
+
+def default_workers() -> int:
+    """Число рабочих процессов по доступным процессу ядрам."""
+    try:
+        return max(len(os.sched_getaffinity(0)), 1)
+    except AttributeError:  # pragma: no cover
+        return os.cpu_count() or 1
+
+
+def installed(module: str) -> bool:
+    """Проверяет, установлен ли модуль."""
+    return importlib.util.find_spec(module) is not None
+
+
+def resolve_workers(settings: Settings, workers: int = 0) -> int:
+    """Число рабочих процессов с учетом общего состояния.
+
+    Без общего кэша (CACHE_BACKEND) и общей ленты событий
+    (EVENTS_BACKEND=postgres) процессы видят записи друг друга
+    с опозданием, поэтому по умолчанию запускается один процесс,
+    а явный запрос нескольких процессов отклоняется.
+
+    Raises:
+        ValueError: если запрошено несколько процессов без общего
+            состояния.
+    """
+    requested = workers or settings.web_workers
+    if settings.shared_state:
+        return requested or default_workers()
+    if requested > 1:
+        raise ValueError(
+            "Multiple workers require CACHE_BACKEND=redis and "
+            "EVENTS_BACKEND=postgres")
+    return 1
+
+
+def build_config(settings: Settings, host: str, port: int,
+                 workers: int = 0) -> uvicorn.Config:
+    """Собирает конфигурацию uvicorn для продакшена."""
+    return uvicorn.Config(
+        APP, host=host, port=port,
+        workers=resolve_workers(settings, workers),
+        loop="uvloop" if installed("uvloop") else "asyncio",
+        http="httptools" if installed("httptools") else "h11",
+        lifespan="on",
+        proxy_headers=True,
+        timeout_graceful_shutdown=int(settings.web_graceful_timeout),
+    )
+
+
+def run(config: uvicorn.Config, drain_seconds: float) -> None:
+    """Запускает сервер в одном или нескольких рабочих процессах."""
+    # Рабочие процессы делят пул соединений по WEB_WORKERS.
+    os.environ["WEB_WORKERS"] = str(config.workers)
+    server = DrainingServer(config, drain_seconds)
+    logger.info("Starting %d worker(s), loop=%s, http=%s",
+                config.workers, config.loop, config.http)
+    if config.workers > 1:
+        sock = config.bind_socket()
+        DrainingMultiprocess(
+            config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run()
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run the API server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int, default=0,
+        help="number of worker processes (default: WEB_WORKERS, cores "
+             "with shared cache and events, otherwise 1)")
+    parser.add_argument(
+        "--drain-seconds", type=float, default=settings.web_drain_seconds,
+        help="keep serving for N seconds after SIGTERM")
+    args = parser.parse_args()
+    try:
+        config = build_config(settings, args.host, args.port, args.workers)
+    except ValueError as exc:
+        parser.error(str(exc))
+    run(config, args.drain_seconds)
@@ -0,0 +1,138 @@
+"""Микробенчмарки методов TaskCRUD и сериализации схем.
+
+Каждый случай выполняется заданное время после прогрева, в отчет
+попадают число вызовов в секунду и перцентили длительности вызова
+в микросекундах. Запуск из каталога проекта:
+
+    python -m benchmarks.crud --rows 10000 --output crud.json
+    python -m benchmarks.crud --only crud.get_task,schema.task_list
+"""
+
+import argparse
+import asyncio
+import inspect
+import random
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, encoding, models, schemas
+from app.cache import TaskCache
+from app.database import Base
+from benchmarks.report import environment, summarize, write_report
+
+TASK_LIST = TypeAdapter(List[schemas.Task])
+PAGE_SIZE = 100
+
+
+def make_cases(task_crud: crud.TaskCRUD, uuids: list, tasks: list,
+               rows: list, rng: random.Random) -> dict:
+    """Возвращает именованные случаи: функции без аргументов."""
+    payload = {"title": "Benchmark task", "description": "x" * 200}
+
+    return {
+        "crud.create_task": lambda: task_crud.create_task(
+            schemas.TaskCreate(**payload)),
+        "crud.get_task": lambda: task_crud.get_task(rng.choice(uuids)),
+        "crud.get_task_cached": lambda: task_crud.get_task_cached(
+            rng.choice(uuids)),
+        "crud.get_tasks": lambda: task_crud.get_tasks(limit=PAGE_SIZE),
+        "crud.get_task_rows": lambda: task_crud.get_task_rows(
+            limit=PAGE_SIZE),
+        "crud.get_task_rows_default_fields": lambda: task_crud.get_task_rows(
+            limit=PAGE_SIZE, fields=schemas.LIST_DEFAULT_FIELDS),
+        "crud.update_task": lambda: task_crud.update_task(
+            rng.choice(uuids),
+            schemas.TaskUpdate(title=f"Updated {rng.random()}")),
+        "crud.get_stats": task_crud.get_stats,
+        "schema.task_create": lambda: schemas.TaskCreate.model_validate(
+            payload),
+        "schema.task_from_orm": lambda: schemas.Task.model_validate(
+            rng.choice(tasks)),
+        "schema.task_list": lambda: TASK_LIST.dump_json(
+            TASK_LIST.validate_python(tasks, from_attributes=True)),
+        "encoding.encode_tasks": lambda: encoding.encode_tasks(rows),
+    }
+
+
+async def measure(session: AsyncSession, case, seconds: float,
+                  warmup: int) -> dict:
+    """Измеряет длительность вызовов случая."""
+    async def call():
+        value = case()
+        if inspect.isawaitable(value):
+            await value
+        session.expunge_all()
+
+    for _ in range(warmup):
+        await call()
+
+    durations = []
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        call_started = time.perf_counter()
+        await call()
+        durations.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "calls_per_sec": round(len(durations) / elapsed, 1),
+        "latency_us": summarize(durations, scale=1_000_000),
+    }
+
+
+async def main(args):
+    """Заполняет базу и выполняет выбранные случаи."""
+    engine = create_async_engine(args.url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False)
+
+    rng = random.Random(args.seed)
+    report = {
+        "benchmark": "crud",
+        "environment": environment(),
+        "config": {
+            "url": args.url, "rows": args.rows, "seconds": args.seconds,
+            "seed": args.seed, "page_size": PAGE_SIZE,
+        },
+        "cases": {},
+    }
+    async with session_factory() as session:
+        task_crud = crud.TaskCRUD(session, cache=TaskCache())
+        await task_crud.bulk_insert([
+            {"title": f"Task {index}", "description": "x" * 200,
+             "status": models.TaskStatus.CREATED}
+            for index in range(args.rows)
+        ])
+        tasks = await task_crud.get_tasks(limit=PAGE_SIZE)
+        rows = await task_crud.get_task_rows(limit=PAGE_SIZE)
+        uuids = [task.uuid for task in await task_crud.get_tasks(
+            limit=args.rows)]
+        session.expunge_all()
+
+        cases = make_cases(task_crud, uuids, tasks, rows, rng)
+        selected = args.only.split(",") if args.only else list(cases)
+        for name in selected:
+            report["cases"][name] = await measure(
+                session, cases[name], args.seconds, args.warmup)
+
+    await engine.dispose()
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///./bench.db")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", default=None)
+    parser.add_argument("--output", default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,135 @@
+"""Бенчмарк форматов списка задач: размер, кодирование и разбор.
+
+Сравнивает JSON по схеме schemas.Task, быстрый JSON, MessagePack
+и Arrow IPC на одной выборке строк. Для Arrow отдельно измеряется
+разбор в таблицу (колоночные потребители) и в список словарей.
+Запуск из каталога проекта:
+
+    python -m benchmarks.formats --rows 10000
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import statistics
+import time
+from typing import List, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, encoding, formats, models, schemas
+from app.database import Base
+from benchmarks.report import environment, write_report
+
+TASK_LIST = TypeAdapter(List[schemas.Task])
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # pragma: no cover
+    json_loads = json.loads
+
+
+def schema_json(rows) -> bytes:
+    """JSON через валидацию и сериализацию List[schemas.Task]."""
+    return TASK_LIST.dump_json(
+        TASK_LIST.validate_python(rows, from_attributes=True))
+
+
+def encode_msgpack(rows) -> bytes:
+    """Кодирует строки в MessagePack."""
+    return formats.encode_tasks(rows, formats.MSGPACK)
+
+
+def encode_arrow(rows) -> bytes:
+    """Кодирует строки в поток Arrow IPC."""
+    return formats.encode_tasks(rows, formats.ARROW_STREAM)
+
+
+def arrow_table(body: bytes):
+    """Разбирает поток Arrow в таблицу."""
+    return formats.pa.ipc.open_stream(body).read_all()
+
+
+def arrow_rows(body: bytes) -> list[dict]:
+    """Разбирает поток Arrow в список словарей."""
+    return arrow_table(body).to_pylist()
+
+
+def cases() -> dict:
+    """Возвращает форматы: (кодирование, разбор) для доступных библиотек."""
+    result = {
+        "schema_json": (schema_json, json_loads),
+        "json": (encoding.encode_tasks, json_loads),
+    }
+    if formats.is_available(formats.MSGPACK):
+        result["msgpack"] = (encode_msgpack, formats.msgpack.unpackb)
+    if formats.is_available(formats.ARROW_STREAM):
+        result["arrow"] = (encode_arrow, arrow_table)
+        result["arrow_to_pylist"] = (encode_arrow, arrow_rows)
+    return result
+
+
+def timed(function, argument, repeat: int) -> float:
+    """Медианное время вызова в миллисекундах."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(argument)
+        durations.append(time.perf_counter() - started)
+    return round(statistics.median(durations) * 1000, 3)
+
+
+async def load_rows(url: str, rows: int, description_size: int) -> list:
+    """Заполняет базу и выбирает строки списка задач."""
+    engine = create_async_engine(url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+        statuses = list(models.TaskStatus)
+        await connection.execute(insert(models.Task), [
+            {"title": f"Task {index}",
+             "description": "x" * description_size,
+             "status": statuses[index % len(statuses)]}
+            for index in range(rows)
+        ])
+    session_factory = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        result = await crud.TaskCRUD(session).get_task_rows(limit=rows)
+    await engine.dispose()
+    return result
+
+
+async def main(url: str, rows: int, description_size: int, repeat: int,
+               output: Optional[str] = None):
+    """Сравнивает размер и время кодирования и разбора форматов."""
+    task_rows = await load_rows(url, rows, description_size)
+    report = {"benchmark": "formats", "environment": environment(),
+              "rows": rows, "description_size": description_size,
+              "formats": {}}
+    for name, (encode, decode) in cases().items():
+        body = encode(task_rows)
+        report["formats"][name] = {
+            "body_bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body)),
+            "encode_ms": timed(encode, task_rows, repeat),
+            "decode_ms": timed(decode, body, repeat),
+        }
+    write_report(report, output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///./bench.db")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--description-size", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.rows, args.description_size,
+                     args.repeat, args.output))
@@ -0,0 +1,239 @@
+"""Нагрузочный тест API задач с конкурентными асинхронными клиентами.
+
+По умолчанию приложение запускается в том же процессе поверх базы
+из --url (SQLite или локальный PostgreSQL). С --base-url нагрузка
+подается на уже запущенный uvicorn. Запуск из каталога проекта:
+
+    python -m benchmarks.load --concurrency 32 --duration 30
+    python -m benchmarks.load --base-url http://127.0.0.1:8000 \\
+        --mix create=1,list=2,get=6,update=1,delete=0.5 --output run.json
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Optional
+
+import httpx
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.admission import admit_read, admit_write
+from app.database import Base, get_db, get_read_db
+from app.schemas import MAX_BATCH_SIZE
+from benchmarks.report import environment, summarize, write_report
+
+OPERATIONS = ("create", "list", "get", "update", "delete")
+DEFAULT_MIX = "create=1,list=2,get=5,update=1.5,delete=0.5"
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    """Разбирает смесь операций вида create=1,get=4."""
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class LoadRun:
+    """Состояние прогона: известные задачи и замеры по операциям."""
+
+    def __init__(self, client: httpx.AsyncClient, list_limit: int):
+        """Инициализация класса LoadRun."""
+        self.client = client
+        self.list_limit = list_limit
+        self.uuids: list[str] = []
+        self.recording = False
+        self.durations: dict[str, list[float]] = defaultdict(list)
+        self.status_codes: dict[str, Counter] = defaultdict(Counter)
+        self.errors: Counter = Counter()
+
+    async def seed(self, rows: int):
+        """Создает исходные задачи пакетными запросами."""
+        for start in range(0, rows, MAX_BATCH_SIZE):
+            items = [
+                {"title": f"Seed {index}", "description": "x" * 100}
+                for index in range(start, min(rows, start + MAX_BATCH_SIZE))
+            ]
+            response = await self.client.post(
+                "/tasks/batch", json={"items": items})
+            response.raise_for_status()
+            self.uuids.extend(
+                item["uuid"] for item in response.json()["results"])
+
+    async def request(self, operation: str, rng: random.Random):
+        """Выполняет одну операцию и записывает ее длительность."""
+        if operation in ("get", "update", "delete") and not self.uuids:
+            operation = "create"
+
+        started = time.perf_counter()
+        try:
+            response = await self._send(operation, rng)
+        except httpx.HTTPError as error:
+            if self.recording:
+                self.errors[f"{operation}:{type(error).__name__}"] += 1
+            return
+        duration = time.perf_counter() - started
+
+        if operation == "create" and response.status_code == 201:
+            self.uuids.append(response.json()["uuid"])
+        if self.recording:
+            self.durations[operation].append(duration)
+            self.status_codes[operation][str(response.status_code)] += 1
+
+    async def _send(self, operation: str,
+                    rng: random.Random) -> httpx.Response:
+        """Отправляет HTTP-запрос для операции."""
+        if operation == "create":
+            return await self.client.post("/tasks/", json={
+                "title": f"Task {rng.random():.6f}", "description": "x" * 100})
+        if operation == "list":
+            return await self.client.get(
+                "/tasks/", params={"limit": self.list_limit})
+        if operation == "delete":
+            index = rng.randrange(len(self.uuids))
+            self.uuids[index] = self.uuids[-1]
+            task_uuid = self.uuids.pop()
+            return await self.client.delete(f"/tasks/{task_uuid}")
+        task_uuid = rng.choice(self.uuids)
+        if operation == "get":
+            return await self.client.get(f"/tasks/{task_uuid}")
+        return await self.client.put(
+            f"/tasks/{task_uuid}", json={"title": f"Updated {rng.random()}"})
+
+    def report(self, elapsed: float) -> dict:
+        """Формирует отчет о пропускной способности и задержках."""
+        operations = {}
+        for operation in OPERATIONS:
+            durations = self.durations.get(operation)
+            if not durations:
+                continue
+            operations[operation] = {
+                "throughput_rps": round(len(durations) / elapsed, 1),
+                "latency_ms": summarize(durations),
+                "status_codes": dict(self.status_codes[operation]),
+            }
+        all_durations = [
+            duration for durations in self.durations.values()
+            for duration in durations
+        ]
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "requests": len(all_durations),
+            "throughput_rps": round(len(all_durations) / elapsed, 1),
+            "latency_ms": summarize(all_durations),
+            "transport_errors": dict(self.errors),
+            "operations": operations,
+        }
+
+
+async def worker(run: LoadRun, mix: dict[str, float], rng: random.Random,
+                 deadline: float):
+    """Выполняет операции по смеси до истечения времени."""
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        await run.request(rng.choices(names, weights)[0], rng)
+
+
+async def in_process_client(url: str) -> tuple[httpx.AsyncClient, object]:
+    """Создает клиента для приложения в процессе поверх базы url.
+
+    Сессии подменяются, а контроль допуска запросов сохраняется.
+    """
+    from app.main import app
+
+    engine = create_async_engine(url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_benchmark_db(_: None = Depends(admit_write)):
+        async with session_factory() as session:
+            yield session
+
+    async def get_benchmark_read_db(_: None = Depends(admit_read)):
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_benchmark_db
+    app.dependency_overrides[get_read_db] = get_benchmark_read_db
+    client = httpx.AsyncClient(app=app, base_url="http://benchmark")
+    return client, engine
+
+
+async def main(args):
+    """Заполняет базу, прогревает приложение и подает нагрузку."""
+    mix = parse_mix(args.mix)
+    engine = None
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+    else:
+        client, engine = await in_process_client(args.url)
+
+    run = LoadRun(client, args.list_limit)
+    try:
+        await run.seed(args.seed_rows)
+
+        async def phase(seconds: float, seed_offset: int):
+            deadline = time.perf_counter() + seconds
+            await asyncio.gather(*(
+                worker(run, mix, random.Random(args.seed + seed_offset + i),
+                       deadline)
+                for i in range(args.concurrency)
+            ))
+
+        await phase(args.warmup, 0)
+        run.recording = True
+        started = time.perf_counter()
+        await phase(args.duration, args.concurrency)
+        elapsed = time.perf_counter() - started
+    finally:
+        await client.aclose()
+        if engine is not None:
+            await engine.dispose()
+
+    write_report({
+        "benchmark": "load",
+        "environment": environment(),
+        "config": {
+            "target": args.base_url or args.url,
+            "in_process": not args.base_url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "seed_rows": args.seed_rows,
+            "list_limit": args.list_limit,
+            "mix": mix,
+            "seed": args.seed,
+        },
+        **run.report(elapsed),
+    }, args.output)
+
+
+def parse_args(argv: Optional[list[str]] = None):
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///./bench.db")
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--seed-rows", type=int, default=1000)
+    parser.add_argument("--list-limit", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,117 @@
+"""Общие функции бенчмарков: окружение, перцентили и отчеты в JSON.
+
+Сравнение двух отчетов, например до и после обновления зависимостей:
+
+    python -m benchmarks.report baseline.json current.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Optional
+
+PACKAGES = ("fastapi", "starlette", "pydantic", "sqlalchemy", "httpx",
+            "aiosqlite", "asyncpg", "orjson")
+
+
+def environment() -> dict:
+    """Возвращает версии Python, пакетов и ревизию репозитория."""
+    packages = {}
+    for package in PACKAGES:
+        try:
+            packages[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            packages[package] = None
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "revision": revision,
+        "packages": packages,
+    }
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Возвращает перцентиль отсортированной выборки по ближайшему рангу."""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(durations: list[float], scale: float = 1000.0) -> dict:
+    """Сводка длительностей в секундах: среднее, p50/p95/p99 и максимум."""
+    ordered = sorted(durations)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered) * scale, 3),
+        "p50": round(percentile(ordered, 0.50) * scale, 3),
+        "p95": round(percentile(ordered, 0.95) * scale, 3),
+        "p99": round(percentile(ordered, 0.99) * scale, 3),
+        "max": round(ordered[-1] * scale, 3),
+    }
+
+
+def write_report(report: dict, output: Optional[str]):
+    """Печатает отчет и при необходимости сохраняет его в файл."""
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+
+
+def flatten(value, prefix: str = "") -> dict:
+    """Разворачивает числовые значения отчета в словарь путей."""
+    if isinstance(value, dict):
+        items = {}
+        for key, item in value.items():
+            items.update(flatten(item, f"{prefix}{key}."))
+        return items
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix[:-1]: value}
+    return {}
+
+
+def compare(baseline: dict, current: dict) -> list[tuple]:
+    """Возвращает (путь, было, стало, изменение в %) для общих метрик."""
+    before = flatten({
+        key: value for key, value in baseline.items()
+        if key not in ("environment", "config")})
+    after = flatten({
+        key: value for key, value in current.items()
+        if key not in ("environment", "config")})
+    rows = []
+    for path in sorted(before.keys() & after.keys()):
+        change = ((after[path] - before[path]) / before[path] * 100
+                  if before[path] else None)
+        rows.append((path, before[path], after[path], change))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare benchmark reports")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    args = parser.parse_args()
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline_report = json.load(file)
+    with open(args.current, encoding="utf-8") as file:
+        current_report = json.load(file)
+    for path, before_value, after_value, change in compare(
+            baseline_report, current_report):
+        change_text = f"{change:+.1f}%" if change is not None else "n/a"
+        print(f"{path:60} {before_value:>12} {after_value:>12} "
+              f"{change_text:>9}")
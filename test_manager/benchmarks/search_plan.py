@@ -0,0 +1,113 @@
+"""Бенчмарк поиска задач: полнотекстовый индекс против полного сканирования.
+
+Запуск из каталога проекта:
+
+    python -m benchmarks.search_plan --rows 100000
+    python -m benchmarks.search_plan --url postgresql+asyncpg://...
+
+Для каждого запроса печатается план выполнения и среднее время.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Optional
+
+from sqlalchemy import insert, or_, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import models
+from app.database import Base
+from app.search import search_condition
+from benchmarks.report import environment, write_report
+
+WORDS = [
+    "deploy", "release", "bug", "docs", "review", "refactor", "database",
+    "index", "migration", "backend", "frontend", "cache", "metrics",
+    "report", "customer", "invoice", "billing", "search", "export",
+]
+NEEDLE = "zeppelin"
+
+
+def make_rows(count: int, needle_every: int) -> list[dict]:
+    """Генерирует строки задач, каждая needle_every-я содержит NEEDLE."""
+    rows = []
+    for index in range(count):
+        words = random.choices(WORDS, k=12)
+        if index % needle_every == 0:
+            words[random.randrange(len(words))] = NEEDLE
+        rows.append({
+            "title": " ".join(words[:4]),
+            "description": " ".join(words[4:]),
+            "status": random.choice(list(models.TaskStatus)),
+        })
+    return rows
+
+
+async def explain(connection, query) -> list[str]:
+    """Возвращает план выполнения запроса."""
+    compiled = query.compile(
+        connection.engine, compile_kwargs={"literal_binds": True})
+    prefix = ("EXPLAIN QUERY PLAN" if connection.dialect.name == "sqlite"
+              else "EXPLAIN")
+    result = await connection.execute(text(f"{prefix} {compiled}"))
+    return [" ".join(str(value) for value in row) for row in result]
+
+
+async def measure(connection, query, repeat: int) -> dict:
+    """Измеряет среднее время выполнения запроса."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        found = len((await connection.execute(query)).all())
+    elapsed = (time.perf_counter() - started) / repeat
+    return {"rows": found, "avg_ms": round(elapsed * 1000, 3)}
+
+
+async def main(url: str, rows: int, repeat: int, output: Optional[str] = None):
+    """Заполняет базу и сравнивает планы и время запросов."""
+    engine = create_async_engine(url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+        for start in range(0, rows, 10000):
+            await connection.execute(
+                insert(models.Task),
+                make_rows(min(10000, rows - start), needle_every=1000))
+        if connection.dialect.name == "postgresql":
+            await connection.execute(text("ANALYZE tasks"))
+
+    task = models.Task
+    queries = {
+        "fulltext_index": select(task.uuid).where(search_condition(
+            engine.dialect.name, NEEDLE, task.title, task.description)),
+        "sequential_scan": select(task.uuid).where(or_(
+            task.title.like(f"%{NEEDLE}%"),
+            task.description.like(f"%{NEEDLE}%"))),
+        "status_index": select(task.uuid)
+        .where(task.status == models.TaskStatus.COMPLETED)
+        .order_by(task.created_at, task.uuid).limit(100),
+    }
+
+    report = {
+        "benchmark": "search_plan", "environment": environment(),
+        "dialect": engine.dialect.name, "rows": rows, "queries": {},
+    }
+    async with engine.connect() as connection:
+        for name, query in queries.items():
+            report["queries"][name] = {
+                "plan": await explain(connection, query),
+                **await measure(connection, query, repeat),
+            }
+    await engine.dispose()
+    write_report(report, output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///./bench.db")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.rows, args.repeat, args.output))
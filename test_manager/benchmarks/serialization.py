@@ -0,0 +1,105 @@
+"""Микробенчмарк сериализации списка задач.
+
+Сравнивает прежний путь (ORM-объекты и валидация List[schemas.Task]
+с from_attributes) с быстрым путем (выборка колонок и прямое
+кодирование в JSON). Запуск из каталога проекта:
+
+    python -m benchmarks.serialization --rows 1000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import List, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, encoding, models, schemas
+from app.database import Base
+from benchmarks.report import environment, write_report
+
+TASK_LIST = TypeAdapter(List[schemas.Task])
+
+
+async def orm_path(session: AsyncSession, limit: int) -> bytes:
+    """Прежний путь: ORM-объекты, валидация схемой и JSONResponse."""
+    tasks = await crud.TaskCRUD(session).get_tasks(limit=limit)
+    content = TASK_LIST.dump_python(
+        TASK_LIST.validate_python(tasks, from_attributes=True), mode="json")
+    session.expunge_all()
+    return JSONResponse(content).body
+
+
+async def fast_path(session: AsyncSession, limit: int) -> bytes:
+    """Быстрый путь: выборка колонок и прямое кодирование."""
+    rows = await crud.TaskCRUD(session).get_task_rows(limit=limit)
+    return encoding.encode_tasks(rows)
+
+
+async def measure(path, session_factory, limit: int, seconds: float) -> dict:
+    """Измеряет число вызовов в секунду и пиковые выделения памяти."""
+    async with session_factory() as session:
+        body = await path(session, limit)
+
+        tracemalloc.start()
+        await path(session, limit)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        calls = 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < seconds:
+            await path(session, limit)
+            calls += 1
+        elapsed = time.perf_counter() - started
+
+    return {
+        "calls_per_sec": round(calls / elapsed, 1),
+        "peak_alloc_kib": round(peak / 1024, 1),
+        "body_bytes": len(body),
+        "body": body,
+    }
+
+
+async def main(url: str, rows: int, seconds: float,
+               output: Optional[str] = None):
+    """Заполняет базу и сравнивает оба пути сериализации."""
+    engine = create_async_engine(url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(insert(models.Task), [
+            {"title": f"Task {index}", "description": "x" * 200}
+            for index in range(rows)
+        ])
+    session_factory = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False)
+
+    report = {"benchmark": "serialization", "environment": environment(),
+              "rows": rows}
+    for name, path in (("orm_path", orm_path), ("fast_path", fast_path)):
+        report[name] = await measure(path, session_factory, rows, seconds)
+    assert (json.loads(report["orm_path"].pop("body"))
+            == json.loads(report["fast_path"].pop("body")))
+    report["speedup"] = round(
+        report["fast_path"]["calls_per_sec"]
+        / report["orm_path"]["calls_per_sec"], 2)
+
+    await engine.dispose()
+    write_report(report, output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///./bench.db")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.rows, args.seconds, args.output))
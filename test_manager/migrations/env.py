@@ -0,0 +1,56 @@
+"""Окружение Alembic для асинхронного движка приложения."""
+
+import asyncio
+import os
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import models  # noqa: F401
+from app.database import SQLALCHEMY_DATABASE_URL, Base
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def get_url() -> str:
+    """Возвращает адрес базы данных для миграций."""
+    return os.environ.get("DATABASE_URL", SQLALCHEMY_DATABASE_URL)
+
+
+def run_migrations_offline():
+    """Генерирует SQL миграций без подключения к базе."""
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection):
+    """Применяет миграции на синхронном соединении."""
+    context.configure(connection=connection, target_metadata=target_metadata)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online():
+    """Применяет миграции через асинхронный движок."""
+    engine = create_async_engine(get_url())
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,35 @@
+"""create tasks table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tasks",
+        sa.Column("uuid", sa.Uuid(), primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("CREATED", "IN_PROGRESS", "COMPLETED",
+                    name="taskstatus"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table("tasks")
+    sa.Enum(name="taskstatus").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,36 @@
+"""add tasks.created_at and keyset pagination index
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("tasks") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            )
+        )
+    op.create_index(
+        "ix_tasks_created_at_uuid", "tasks", ["created_at", "uuid"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_tasks_created_at_uuid", table_name="tasks")
+    with op.batch_alter_table("tasks") as batch_op:
+        batch_op.drop_column("created_at")
@@ -0,0 +1,39 @@
+"""add tasks.updated_at and task_counters
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("tasks") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            )
+        )
+    counters = op.create_table(
+        "task_counters",
+        sa.Column("name", sa.String(64), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+    )
+    op.bulk_insert(counters, [{"name": "revision", "value": 0}])
+
+
+def downgrade():
+    op.drop_table("task_counters")
+    with op.batch_alter_table("tasks") as batch_op:
+        batch_op.drop_column("updated_at")
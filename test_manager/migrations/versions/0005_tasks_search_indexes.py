@@ -0,0 +1,67 @@
+"""add status filter index and full-text search index
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR = (
+    "to_tsvector('simple', "
+    "coalesce(title, '') || ' ' || coalesce(description, ''))"
+)
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='rowid')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au "
+    "AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+    "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade():
+    op.create_index(
+        "ix_tasks_status_created_at_uuid", "tasks",
+        ["status", "created_at", "uuid"]
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.create_index(
+            "ix_tasks_search", "tasks", [sa.text(SEARCH_VECTOR)],
+            postgresql_using="gin"
+        )
+    elif dialect == "sqlite":
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.drop_index("ix_tasks_search", table_name="tasks")
+    elif dialect == "sqlite":
+        for trigger in ("tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS tasks_fts")
+
+    op.drop_index("ix_tasks_status_created_at_uuid", table_name="tasks")
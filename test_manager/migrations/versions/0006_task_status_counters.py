@@ -0,0 +1,33 @@
+"""add per-status task counters
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+STATUSES = {
+    "created": "CREATED",
+    "in_progress": "IN_PROGRESS",
+    "completed": "COMPLETED",
+}
+
+
+def upgrade():
+    for value, name in STATUSES.items():
+        op.execute(
+            "INSERT INTO task_counters (name, value) "
+            f"SELECT 'status:{value}', count(*) FROM tasks "
+            f"WHERE status = '{name}'"
+        )
+
+
+def downgrade():
+    op.execute("DELETE FROM task_counters WHERE name LIKE 'status:%'")
@@ -0,0 +1,67 @@
+"""add tasks.completed_at and tasks_archive
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+TASK_COLUMNS = (
+    "uuid, title, description, status, created_at, version, updated_at, "
+    "completed_at"
+)
+
+
+def upgrade():
+    # Колонка добавляется без пересоздания таблицы: на SQLite это
+    # сохраняет rowid, на которые ссылается таблица FTS5.
+    op.add_column(
+        "tasks",
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.execute(
+        "UPDATE tasks SET completed_at = updated_at "
+        "WHERE status = 'COMPLETED'"
+    )
+    op.create_index(
+        "ix_tasks_status_completed_at", "tasks", ["status", "completed_at"])
+
+    status = sa.Enum(
+        "CREATED", "IN_PROGRESS", "COMPLETED", name="taskstatus"
+    ).with_variant(
+        postgresql.ENUM(name="taskstatus", create_type=False), "postgresql")
+    op.create_table(
+        "tasks_archive",
+        sa.Column("uuid", sa.Uuid(), primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("status", status, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_tasks_archive_created_at_uuid", "tasks_archive",
+        ["created_at", "uuid"]
+    )
+
+
+def downgrade():
+    op.execute(
+        f"INSERT INTO tasks ({TASK_COLUMNS}) "
+        f"SELECT {TASK_COLUMNS} FROM tasks_archive"
+    )
+    op.drop_table("tasks_archive")
+    op.drop_index("ix_tasks_status_completed_at", table_name="tasks")
+    op.drop_column("tasks", "completed_at")
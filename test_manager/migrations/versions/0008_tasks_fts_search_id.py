@@ -0,0 +1,86 @@
+"""map SQLite full-text index to tasks.search_id instead of rowid
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+FTS_TRIGGERS = ("tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au")
+
+SQLITE_FTS_DDL = [
+    "ALTER TABLE tasks ADD COLUMN search_id INTEGER",
+    "UPDATE tasks SET search_id = rowid WHERE search_id IS NULL",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_tasks_search_id "
+    "ON tasks (search_id)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='search_id')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "UPDATE tasks SET search_id = ("
+    "SELECT coalesce(max(search_id), 0) + 1 FROM tasks) "
+    "WHERE rowid = new.rowid; "
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "SELECT search_id, title, description FROM tasks "
+    "WHERE rowid = new.rowid; END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.search_id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au "
+    "AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.search_id, old.title, old.description); "
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "VALUES (new.search_id, new.title, new.description); END",
+    "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+]
+
+ROWID_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='rowid')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au "
+    "AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+    "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+]
+
+
+def drop_fts():
+    for trigger in FTS_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS tasks_fts")
+
+
+def upgrade():
+    # Первичный ключ tasks — UUID, и неявный rowid может перенумероваться
+    # при VACUUM; индекс FTS5 переводится на собственную колонку.
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    drop_fts()
+    for statement in SQLITE_FTS_DDL:
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    drop_fts()
+    op.execute("DROP INDEX IF EXISTS ix_tasks_search_id")
+    op.execute("ALTER TABLE tasks DROP COLUMN search_id")
+    for statement in ROWID_FTS_DDL:
+        op.execute(statement)
@@ -0,0 +1,36 @@
+"""number PostgreSQL collection changes with task_revision_seq
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Строка "revision" блокируется каждой записью; на PostgreSQL номер
+    # изменения берется из последовательности, продолжающей ее значение.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE SEQUENCE task_revision_seq")
+    op.execute(
+        "SELECT setval('task_revision_seq', greatest(value, 1), value > 0) "
+        "FROM task_counters WHERE name = 'revision'"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        "UPDATE task_counters SET value = ("
+        "SELECT last_value FROM task_revision_seq) WHERE name = 'revision'"
+    )
+    op.execute("DROP SEQUENCE task_revision_seq")
@@ -1,13 +1,16 @@
 """Модуль с фикстурами для тестирования FastAPI приложения."""
 
 import asyncio
+from uuid import uuid4
 
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
-from app.database import Base, get_db
+from app import models
+from app.database import Base, get_db, get_read_db, get_session_factory
+from app.instrumentation import instrument_engine
 from app.main import app
 
 
@@ -16,6 +19,7 @@ TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 engine = create_async_engine(
     TEST_DATABASE_URL, connect_args={"check_same_thread": False}
 )
+instrument_engine(engine, slow_query_ms=1000)
 
 TestingSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
@@ -49,8 +53,23 @@ async def async_client(test_db):
             yield session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
 
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def make_task():
+    """Фикстура фабрики задач, не привязанных к сессии."""
+    def factory(title: str = "Task", version: int = 1) -> models.Task:
+        return models.Task(
+            uuid=uuid4(), title=title, description=None,
+            status=models.TaskStatus.CREATED,
+            created_at=models.utcnow(), updated_at=models.utcnow(),
+            version=version
+        )
+    return factory
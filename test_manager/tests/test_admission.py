@@ -0,0 +1,133 @@
+"""Модуль с тестами для контроля допуска запросов."""
+
+import asyncio
+
+import pytest
+from fastapi import Depends
+
+from app import admission
+from app.admission import (
+    AdmissionBudget, ConcurrencyLimiter, Rejected, TokenBucketLimiter
+)
+from app.database import get_db, get_read_db
+from app.main import app
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def budgets(async_client, monkeypatch):
+    """Фикстура с малыми бюджетами, подключенными к сессиям API."""
+    read_budget = AdmissionBudget(
+        "read", ConcurrencyLimiter(1, 0, 0.05), TokenBucketLimiter(1, 2))
+    write_budget = AdmissionBudget("write", ConcurrencyLimiter(1, 0, 0.05))
+    monkeypatch.setattr(admission, "read_budget", read_budget)
+    monkeypatch.setattr(admission, "write_budget", write_budget)
+
+    async def override_get_db(_: None = Depends(admission.admit_write)):
+        async with TestingSessionLocal() as session:
+            yield session
+
+    async def override_get_read_db(_: None = Depends(admission.admit_read)):
+        async with TestingSessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    return read_budget, write_budget
+
+
+@pytest.mark.asyncio
+class TestConcurrencyLimiter:
+    """Класс тестов для ограничения одновременных запросов."""
+
+    async def test_full_queue_rejects_immediately(self):
+        """Тест немедленного отказа при заполненной очереди."""
+        limiter = ConcurrencyLimiter(1, 0, 10)
+        await limiter.acquire()
+
+        with pytest.raises(Rejected):
+            await limiter.acquire()
+        assert limiter.stats()["rejected"] == 1
+
+    async def test_wait_deadline(self):
+        """Тест отказа по истечении срока ожидания в очереди."""
+        limiter = ConcurrencyLimiter(1, 1, 0.01)
+        await limiter.acquire()
+
+        with pytest.raises(Rejected):
+            await limiter.acquire()
+        assert limiter.stats()["timeouts"] == 1
+        assert limiter.stats()["waiting"] == 0
+
+    async def test_release_hands_over_in_order(self):
+        """Тест передачи места ожидающим по порядку."""
+        limiter = ConcurrencyLimiter(1, 2, 1)
+        await limiter.acquire()
+        order = []
+
+        async def wait(name):
+            await limiter.acquire()
+            order.append(name)
+
+        waiters = [asyncio.create_task(wait(name)) for name in "ab"]
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*waiters)
+        limiter.release()
+
+        assert order == ["a", "b"]
+        assert limiter.stats()["active"] == 0
+
+
+class TestTokenBucketLimiter:
+    """Класс тестов для ограничения частоты запросов клиента."""
+
+    def test_burst_then_limit(self):
+        """Тест отказа после исчерпания ведра только для этого клиента."""
+        limiter = TokenBucketLimiter(rate=1, burst=2)
+
+        assert [limiter.take("a") for _ in range(2)] == [0, 0]
+        assert limiter.take("a") > 0
+        assert limiter.take("b") == 0
+        assert limiter.limited == 1
+
+    def test_evicts_idle_clients(self):
+        """Тест ограничения числа хранимых ведер."""
+        limiter = TokenBucketLimiter(rate=1, burst=1, max_clients=2)
+        for client in "abc":
+            limiter.take(client)
+
+        assert limiter.take("a") == 0
+
+
+@pytest.mark.asyncio
+class TestAdmissionAPI:
+    """Класс тестов для допуска запросов API."""
+
+    async def test_write_storm_does_not_block_reads(self, async_client,
+                                                    budgets):
+        """Тест отказа записи с Retry-After при доступных чтениях."""
+        _, write_budget = budgets
+        created = await async_client.post("/tasks/", json={"title": "Task"})
+        await write_budget.concurrency.acquire()
+
+        rejected = await async_client.post("/tasks/", json={"title": "Task"})
+        read = await async_client.get(f"/tasks/{created.json()['uuid']}")
+        write_budget.concurrency.release()
+
+        assert rejected.status_code == 503
+        assert rejected.headers["Retry-After"] == "1"
+        assert read.status_code == 200
+
+    async def test_rate_limit(self, async_client, budgets):
+        """Тест ответа 429 после исчерпания ведра клиента."""
+        responses = [await async_client.get("/tasks/") for _ in range(3)]
+
+        assert [response.status_code for response in responses] == [
+            200, 200, 429]
+        assert responses[-1].headers["Retry-After"] == "1"
+
+        stats = await async_client.get("/internal/admission")
+        assert stats.json()["budgets"][0]["rate_limited"] == 1
@@ -1,10 +1,16 @@
 """Модуль с тестами для API эндпоинтов управления задачами."""
 
+import json
 from uuid import UUID
 
 import pytest
+from sqlalchemy import event, update
 
-from app.models import TaskStatus
+from app import crud, schemas
+from app.cache import task_cache
+from app.events import RESET, task_events
+from app.models import TaskCounter, TaskStatus
+from tests.conftest import TestingSessionLocal, engine
 
 
 @pytest.mark.asyncio
@@ -59,6 +65,194 @@ class TestTaskAPI:
         assert len(data) == 3
         assert all("uuid" in task for task in data)
 
+    async def test_get_tasks_matches_schema_api(self):
+        """Тест совпадения быстрого кодирования списка со схемой Task."""
+        await self.client.post("/tasks/", json=self.test_task_data)
+        await self.client.post(
+            "/tasks/", json={"title": "Задача \"в кавычках\""})
+
+        response = await self.client.get("/tasks/", params={"fields": "*"})
+
+        assert response.headers["content-type"] == "application/json"
+        items = [
+            json.loads(schemas.Task.model_validate(task).model_dump_json())
+            for task in response.json()
+        ]
+        assert response.json() == items
+        assert [list(task) for task in response.json()] == [
+            list(schemas.Task.model_fields) for _ in items]
+
+    async def test_get_tasks_cursor_pagination_api(self):
+        """Тест курсорной пагинации списка задач через API."""
+        created = set()
+        for i in range(5):
+            task_data = {**self.test_task_data, "title": f"Task {i}"}
+            response = await self.client.post("/tasks/", json=task_data)
+            created.add(response.json()["uuid"])
+
+        seen = []
+        response = await self.client.get("/tasks/", params={"limit": 2})
+        while True:
+            assert response.status_code == 200
+            seen.extend(task["uuid"] for task in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            response = await self.client.get(
+                "/tasks/", params={"limit": 2, "after": cursor})
+
+        assert len(seen) == 5
+        assert set(seen) == created
+
+    async def test_get_tasks_invalid_cursor_api(self):
+        """Тест передачи некорректного курсора через API."""
+        response = await self.client.get(
+            "/tasks/", params={"after": "not-a-cursor"})
+
+        assert response.status_code == 400
+
+    async def test_get_tasks_status_filter_api(self):
+        """Тест фильтрации списка задач по статусу через API."""
+        await self.client.post("/tasks/", json=self.test_task_data)
+        await self.client.post(
+            "/tasks/",
+            json={**self.test_task_data,
+                  "status": TaskStatus.IN_PROGRESS.value})
+
+        response = await self.client.get(
+            "/tasks/", params={"status": TaskStatus.IN_PROGRESS.value})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["status"] == TaskStatus.IN_PROGRESS.value
+
+    async def test_search_tasks_api(self):
+        """Тест полнотекстового поиска задач с фильтром статуса."""
+        tasks = [
+            ("Deploy release", "Roll out to staging", TaskStatus.CREATED),
+            ("Fix bug", "Release blocker", TaskStatus.IN_PROGRESS),
+            ("Write docs", "Nothing special", TaskStatus.IN_PROGRESS),
+        ]
+        for title, description, task_status in tasks:
+            await self.client.post("/tasks/", json={
+                "title": title, "description": description,
+                "status": task_status.value})
+
+        response = await self.client.get("/tasks/", params={"q": "release"})
+        assert {task["title"] for task in response.json()} == {
+            "Deploy release", "Fix bug"}
+
+        response = await self.client.get(
+            "/tasks/",
+            params={"q": "release", "status": TaskStatus.IN_PROGRESS.value})
+        assert [task["title"] for task in response.json()] == ["Fix bug"]
+
+        response = await self.client.get(
+            "/tasks/", params={"q": 'docs "special'})
+        assert [task["title"] for task in response.json()] == ["Write docs"]
+
+    async def test_search_reflects_updates_api(self):
+        """Тест актуальности поискового индекса после изменений."""
+        create_response = await self.client.post(
+            "/tasks/", json={"title": "Alpha"})
+        task_uuid = create_response.json()["uuid"]
+
+        await self.client.put(f"/tasks/{task_uuid}", json={"title": "Beta"})
+        assert (await self.client.get(
+            "/tasks/", params={"q": "alpha"})).json() == []
+        assert len((await self.client.get(
+            "/tasks/", params={"q": "beta"})).json()) == 1
+
+        await self.client.delete(f"/tasks/{task_uuid}")
+        assert (await self.client.get(
+            "/tasks/", params={"q": "beta"})).json() == []
+
+    async def test_search_survives_rowid_renumbering_api(self):
+        """Тест поиска после перенумерации rowid задач.
+
+        VACUUM и пересоздание таблицы могут сменить неявный rowid
+        таблицы без INTEGER PRIMARY KEY; здесь это делается явно.
+        """
+        for title in ("Alpha", "Beta", "Gamma"):
+            response = await self.client.post("/tasks/", json={"title": title})
+            if title == "Alpha":
+                await self.client.delete(f"/tasks/{response.json()['uuid']}")
+
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("UPDATE tasks SET rowid = rowid + 100")
+        await self.client.post("/tasks/", json={"title": "Delta"})
+
+        for title in ("Beta", "Gamma", "Delta"):
+            response = await self.client.get("/tasks/", params={"q": title})
+            assert [task["title"] for task in response.json()] == [title]
+
+    async def test_export_tasks_api(self):
+        """Тест потоковой выгрузки задач в формате NDJSON через API."""
+        for i in range(5):
+            task_data = {**self.test_task_data, "title": f"Task {i}"}
+            await self.client.post("/tasks/", json=task_data)
+        await self.client.post(
+            "/tasks/",
+            json={**self.test_task_data,
+                  "status": TaskStatus.COMPLETED.value})
+
+        response = await self.client.get(
+            "/tasks/export",
+            params={"status": TaskStatus.CREATED.value, "batch_size": 2})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(
+            "application/x-ndjson")
+        lines = response.text.splitlines()
+        assert len(lines) == 5
+        assert {json.loads(line)["title"] for line in lines} == {
+            f"Task {i}" for i in range(5)}
+
+    async def test_get_task_not_modified_api(self):
+        """Тест условного получения задачи с If-None-Match."""
+        create_response = await self.client.post(
+            "/tasks/", json=self.test_task_data)
+        task_uuid = create_response.json()["uuid"]
+
+        response = await self.client.get(f"/tasks/{task_uuid}")
+        etag = response.headers["ETag"]
+        assert "Last-Modified" in response.headers
+
+        not_modified = await self.client.get(
+            f"/tasks/{task_uuid}", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+
+        since = await self.client.get(
+            f"/tasks/{task_uuid}",
+            headers={"If-Modified-Since": response.headers["Last-Modified"]})
+        assert since.status_code == 304
+
+        await self.client.put(
+            f"/tasks/{task_uuid}", json={"title": "Updated"})
+        modified = await self.client.get(
+            f"/tasks/{task_uuid}", headers={"If-None-Match": etag})
+        assert modified.status_code == 200
+        assert modified.json()["title"] == "Updated"
+
+    async def test_get_tasks_not_modified_api(self):
+        """Тест условного получения списка задач с If-None-Match."""
+        await self.client.post("/tasks/", json=self.test_task_data)
+        response = await self.client.get("/tasks/")
+        etag = response.headers["ETag"]
+
+        not_modified = await self.client.get(
+            "/tasks/", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+
+        await self.client.post("/tasks/", json=self.test_task_data)
+        modified = await self.client.get(
+            "/tasks/", headers={"If-None-Match": etag})
+        assert modified.status_code == 200
+        assert len(modified.json()) == 2
+        assert modified.headers["ETag"] != etag
+
     async def test_update_task_api(self):
         """Тест обновления задачи через API."""
         create_response = await self.client.post(
@@ -78,6 +272,50 @@ class TestTaskAPI:
         assert data["title"] == update_data["title"]
         assert data["status"] == update_data["status"]
 
+    async def test_update_task_if_match_api(self):
+        """Тест условного обновления задачи с заголовком If-Match."""
+        create_response = await self.client.post(
+            "/tasks/", json=self.test_task_data)
+        task_uuid = create_response.json()["uuid"]
+        etag = create_response.headers["ETag"]
+
+        response = await self.client.put(
+            f"/tasks/{task_uuid}", json={"title": "First"},
+            headers={"If-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+        stale_response = await self.client.put(
+            f"/tasks/{task_uuid}", json={"title": "Second"},
+            headers={"If-Match": etag})
+
+        assert stale_response.status_code == 412
+        get_response = await self.client.get(f"/tasks/{task_uuid}")
+        assert get_response.json()["title"] == "First"
+        assert get_response.headers["ETag"] == response.headers["ETag"]
+
+    async def test_update_task_forbidden_transition_api(self):
+        """Тест запрещенного перехода статуса при обновлении через API."""
+        create_response = await self.client.post(
+            "/tasks/",
+            json={**self.test_task_data,
+                  "status": TaskStatus.IN_PROGRESS.value})
+        task_uuid = create_response.json()["uuid"]
+
+        response = await self.client.put(
+            f"/tasks/{task_uuid}", json={"status": TaskStatus.CREATED.value})
+
+        assert response.status_code == 400
+
+    async def test_update_nonexistent_task_api(self):
+        """Тест обновления несуществующей задачи через API."""
+        response = await self.client.put(
+            "/tasks/00000000-0000-0000-0000-000000000000",
+            json={"title": "Missing"}, headers={"If-Match": '"1"'})
+
+        assert response.status_code == 404
+
     async def test_delete_task_api(self):
         """Тест удаления задачи через API."""
         create_response = await self.client.post(
@@ -118,3 +356,330 @@ class TestTaskValidationAPI:
         """Тест создания задачи с невалидными данными через API."""
         response = await async_client.post("/tasks/", json=invalid_data)
         assert response.status_code == expected_status
+
+
+@pytest.mark.asyncio
+class TestTaskBatchAPI:
+    """Класс тестов для пакетных эндпоинтов задач."""
+
+    async def test_create_tasks_batch(self, async_client):
+        """Тест пакетного создания задач с невалидным элементом."""
+        items = [
+            {"title": "Task 1"},
+            {"title": "x" * 256},
+            {"title": "Task 3", "status": TaskStatus.IN_PROGRESS.value},
+        ]
+        response = await async_client.post(
+            "/tasks/batch", json={"items": items})
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["status_code"] for r in results] == [201, 422, 201]
+        assert results[0]["task"]["title"] == "Task 1"
+        assert results[2]["task"]["status"] == TaskStatus.IN_PROGRESS.value
+
+        list_response = await async_client.get("/tasks/")
+        assert len(list_response.json()) == 2
+
+    async def test_update_tasks_batch(self, async_client):
+        """Тест пакетного обновления задач с проверкой переходов."""
+        create_response = await async_client.post(
+            "/tasks/batch",
+            json={"items": [
+                {"title": "Task 1"},
+                {"title": "Task 2", "status": TaskStatus.COMPLETED.value},
+            ]})
+        first, second = [
+            r["uuid"] for r in create_response.json()["results"]]
+
+        items = [
+            {"uuid": first, "status": TaskStatus.IN_PROGRESS.value},
+            {"uuid": second, "status": TaskStatus.CREATED.value},
+            {"uuid": "00000000-0000-0000-0000-000000000000",
+             "title": "Missing"},
+        ]
+        response = await async_client.patch(
+            "/tasks/batch", json={"items": items})
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["status_code"] for r in results] == [200, 400, 404]
+        assert results[0]["task"]["status"] == TaskStatus.IN_PROGRESS.value
+
+        get_response = await async_client.get(f"/tasks/{second}")
+        assert get_response.json()["status"] == TaskStatus.COMPLETED.value
+
+    async def test_update_tasks_batch_repeated_uuid(self, async_client):
+        """Тест последовательных изменений одной задачи в пакете."""
+        create_response = await async_client.post(
+            "/tasks/", json={"title": "Task 1"})
+        task_uuid = create_response.json()["uuid"]
+
+        response = await async_client.patch("/tasks/batch", json={"items": [
+            {"uuid": task_uuid, "status": TaskStatus.IN_PROGRESS.value},
+            {"uuid": task_uuid, "status": TaskStatus.COMPLETED.value},
+            {"uuid": task_uuid, "status": TaskStatus.CREATED.value},
+            {"uuid": task_uuid, "title": "Renamed"},
+        ]})
+
+        results = response.json()["results"]
+        assert [r["status_code"] for r in results] == [200, 200, 400, 200]
+        task = await async_client.get(f"/tasks/{task_uuid}")
+        assert task.json()["title"] == "Renamed"
+        assert task.json()["status"] == TaskStatus.COMPLETED.value
+        assert task.headers["ETag"] == '"4"'
+        stats = await async_client.get("/tasks/stats")
+        assert stats.json()["counts"] == {
+            "created": 0, "in_progress": 0, "completed": 1}
+
+    async def test_delete_tasks_batch(self, async_client):
+        """Тест пакетного удаления задач."""
+        create_response = await async_client.post(
+            "/tasks/batch", json={"items": [{"title": "Task 1"}]})
+        task_uuid = create_response.json()["results"][0]["uuid"]
+        missing = "00000000-0000-0000-0000-000000000000"
+
+        response = await async_client.request(
+            "DELETE", "/tasks/batch", json={"uuids": [task_uuid, missing]})
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["status_code"] for r in results] == [204, 404]
+
+        get_response = await async_client.get(f"/tasks/{task_uuid}")
+        assert get_response.status_code == 404
+
+    async def test_delete_tasks_batch_duplicates(self, async_client):
+        """Тест повтора UUID в пакете удаления."""
+        create_response = await async_client.post(
+            "/tasks/batch", json={"items": [{"title": "Task 1"}]})
+        task_uuid = create_response.json()["results"][0]["uuid"]
+
+        response = await async_client.request(
+            "DELETE", "/tasks/batch", json={"uuids": [task_uuid, task_uuid]})
+
+        results = response.json()["results"]
+        assert [r["status_code"] for r in results] == [204, 404]
+        stats = await async_client.get("/tasks/stats")
+        assert stats.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+class TestTaskImportAPI:
+    """Класс тестов для импорта задач из файлов."""
+
+    async def test_import_ndjson(self, async_client):
+        """Тест импорта задач из NDJSON с ошибочными строками."""
+        lines = [
+            json.dumps({"title": "Task 1"}),
+            "",
+            "{not json",
+            json.dumps({"title": "x" * 256}),
+            json.dumps({"title": "Task 2", "status": "in_progress"}),
+            json.dumps(["not", "an", "object"]),
+        ]
+        content = "\n".join(lines).encode()
+        subscription = await task_events.subscribe()
+
+        try:
+            response = await async_client.post(
+                "/tasks/import", params={"chunk_size": 2},
+                files={"file": ("tasks.ndjson", content)})
+            events = [await subscription.get(0.1) for _ in range(2)]
+        finally:
+            task_events.unsubscribe(subscription)
+
+        assert [event and event.type for event in events] == [RESET, None]
+        assert response.status_code == 200
+        data = response.json()
+        assert data["accepted"] == 2
+        assert data["rejected"] == 3
+        assert [error["line"] for error in data["errors"]] == [3, 4, 6]
+
+        list_response = await async_client.get("/tasks/")
+        assert {task["title"] for task in list_response.json()} == {
+            "Task 1", "Task 2"}
+
+    async def test_import_csv(self, async_client):
+        """Тест импорта задач из CSV."""
+        content = (
+            "title,description,status\n"
+            "Task 1,,\n"
+            "\"Task, 2\",\"Multi\nline\",completed\n"
+            "Task 3,,unknown\n"
+        ).encode()
+
+        response = await async_client.post(
+            "/tasks/import", files={"file": ("tasks.csv", content)})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["accepted"] == 2
+        assert data["rejected"] == 1
+        assert data["errors"][0]["line"] == 5
+
+        list_response = await async_client.get("/tasks/", params={
+            "status": TaskStatus.COMPLETED.value,
+            "fields": "title,description"})
+        assert list_response.json()[0]["description"] == "Multi\nline"
+
+    async def test_import_unknown_format(self, async_client):
+        """Тест импорта файла неизвестного формата."""
+        response = await async_client.post(
+            "/tasks/import", files={"file": ("tasks.xml", b"<tasks/>")})
+
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+class TestTaskFieldsAPI:
+    """Класс тестов выбора полей задач через параметр fields."""
+
+    async def test_list_defers_description(self, async_client):
+        """Тест списка без описания по умолчанию и с ним по запросу."""
+        await async_client.post(
+            "/tasks/", json={"title": "Task", "description": "x" * 4096})
+
+        default = await async_client.get("/tasks/")
+        selected = await async_client.get(
+            "/tasks/", params={"fields": "description,title"})
+
+        assert list(default.json()[0]) == ["title", "status", "uuid"]
+        assert selected.json() == [
+            {"title": "Task", "description": "x" * 4096}]
+
+    async def test_list_schema_allows_sparse_rows(self, async_client):
+        """Тест схемы ответа списка, в которой все поля необязательны."""
+        response = await async_client.get("/openapi.json")
+
+        spec = response.json()
+        content = spec["paths"]["/tasks/"]["get"]["responses"]["200"][
+            "content"]
+        assert content["application/json"]["schema"]["items"] == {
+            "$ref": "#/components/schemas/TaskListItem"}
+        assert "application/msgpack" in content
+        assert "required" not in spec["components"]["schemas"]["TaskListItem"]
+
+    async def test_list_fields_keep_cursor(self, async_client):
+        """Тест курсорной пагинации при выборе полей без uuid."""
+        for i in range(3):
+            await async_client.post("/tasks/", json={"title": f"Task {i}"})
+
+        first = await async_client.get(
+            "/tasks/", params={"fields": "title", "limit": 2})
+        second = await async_client.get("/tasks/", params={
+            "fields": "title", "after": first.headers["X-Next-Cursor"]})
+
+        assert [task["title"] for task in first.json() + second.json()] == [
+            "Task 0", "Task 1", "Task 2"]
+
+    async def test_get_task_fields(self, async_client):
+        """Тест выбора полей задачи с сохранением заголовков."""
+        created = await async_client.post(
+            "/tasks/", json={"title": "Task", "description": "Body"})
+        task_uuid = created.json()["uuid"]
+        await task_cache.invalidate(UUID(task_uuid))
+
+        response = await async_client.get(
+            f"/tasks/{task_uuid}", params={"fields": "status"})
+
+        assert response.json() == {"status": TaskStatus.CREATED.value}
+        assert response.headers["ETag"] == created.headers["ETag"]
+        assert await task_cache.get(UUID(task_uuid)) is None
+
+    @pytest.mark.parametrize("fields", ["", "title,version"])
+    async def test_invalid_fields(self, async_client, fields):
+        """Тест отказа при пустом или неизвестном наборе полей."""
+        response = await async_client.get(
+            "/tasks/", params={"fields": fields})
+
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+class TestTaskStatsAPI:
+    """Класс тестов для статистики задач по статусам."""
+
+    async def get_counts(self, client):
+        """Возвращает счетчики задач по статусам."""
+        response = await client.get("/tasks/stats")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == sum(data["counts"].values())
+        return data["counts"]
+
+    async def test_stats_follow_writes(self, async_client):
+        """Тест поддержания счетчиков при всех видах записи."""
+        assert await self.get_counts(async_client) == {
+            "created": 0, "in_progress": 0, "completed": 0}
+
+        create_response = await async_client.post(
+            "/tasks/", json={"title": "Task"})
+        task_uuid = create_response.json()["uuid"]
+        batch_response = await async_client.post(
+            "/tasks/batch", json={"items": [
+                {"title": "Batch 1"},
+                {"title": "Batch 2", "status": "completed"},
+            ]})
+        batch_uuids = [
+            r["uuid"] for r in batch_response.json()["results"]]
+        await async_client.post(
+            "/tasks/import",
+            files={"file": ("tasks.csv", b"title,status\nA,in_progress\n")})
+        assert await self.get_counts(async_client) == {
+            "created": 2, "in_progress": 1, "completed": 1}
+
+        await async_client.put(
+            f"/tasks/{task_uuid}", json={"status": "in_progress"})
+        await async_client.put(
+            f"/tasks/{task_uuid}", json={"title": "Renamed"})
+        await async_client.patch("/tasks/batch", json={"items": [
+            {"uuid": batch_uuids[0], "status": "completed"},
+            {"uuid": batch_uuids[1], "status": "created"},
+        ]})
+        assert await self.get_counts(async_client) == {
+            "created": 0, "in_progress": 2, "completed": 2}
+
+        await async_client.delete(f"/tasks/{task_uuid}")
+        await async_client.request(
+            "DELETE", "/tasks/batch", json={"uuids": batch_uuids})
+        assert await self.get_counts(async_client) == {
+            "created": 0, "in_progress": 1, "completed": 0}
+
+    async def test_status_counters_untouched(self, async_client):
+        """Тест записи без смены статуса без обновления его счетчика."""
+        create_response = await async_client.post(
+            "/tasks/", json={"title": "Task"})
+        task_uuid = create_response.json()["uuid"]
+        updated = []
+
+        def record(conn, cursor, statement, parameters, context, many):
+            if statement.startswith("UPDATE task_counters"):
+                updated.append(parameters)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            await async_client.put(
+                f"/tasks/{task_uuid}", json={"title": "Renamed"})
+        finally:
+            event.remove(
+                engine.sync_engine, "before_cursor_execute", record)
+
+        assert updated == [(1, TaskCounter.REVISION)]
+
+    async def test_reconcile_fixes_drift(self, async_client):
+        """Тест пересчета счетчиков после расхождения."""
+        await async_client.post("/tasks/", json={"title": "Task"})
+        async with TestingSessionLocal() as session:
+            await session.execute(
+                update(TaskCounter)
+                .where(TaskCounter.name == "status:created")
+                .values(value=42))
+            await session.commit()
+        assert (await self.get_counts(async_client))["created"] == 42
+
+        async with TestingSessionLocal() as session:
+            stats = await crud.TaskCRUD(session).reconcile_stats()
+
+        assert stats.counts[TaskStatus.CREATED] == 1
+        assert (await self.get_counts(async_client))["created"] == 1
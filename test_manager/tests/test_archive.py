@@ -0,0 +1,234 @@
+"""Модуль с тестами для переноса завершенных задач в архив."""
+
+from datetime import timedelta
+from uuid import UUID
+
+import pytest
+from sqlalchemy import select, update
+
+from app import archive, crud, models, schemas
+from app.cache import task_cache
+from app.events import RESET, task_events
+from tests.conftest import TestingSessionLocal
+
+
+async def complete_task(client, title: str, days_ago: float = 0) -> str:
+    """Создает завершенную задачу с заданным временем завершения."""
+    response = await client.post(
+        "/tasks/", json={"title": title, "status": "completed"})
+    task_uuid = response.json()["uuid"]
+    async with TestingSessionLocal() as session:
+        await session.execute(
+            update(models.Task)
+            .where(models.Task.uuid == UUID(task_uuid))
+            .values(completed_at=models.utcnow() - timedelta(days=days_ago))
+        )
+        await session.commit()
+    await task_cache.backend.clear()
+    return task_uuid
+
+
+async def archived_uuids() -> set[str]:
+    """Возвращает UUID задач в архиве."""
+    async with TestingSessionLocal() as session:
+        result = await session.execute(select(models.ArchivedTask.uuid))
+        return {str(task_uuid) for task_uuid in result.scalars()}
+
+
+@pytest.mark.asyncio
+class TestTaskArchive:
+    """Класс тестов для архива завершенных задач."""
+
+    async def test_archive_old_completed_tasks(self, async_client):
+        """Тест переноса пакетами только давно завершенных задач."""
+        old = [await complete_task(async_client, f"Old {index}", days_ago=40)
+               for index in range(3)]
+        recent = await complete_task(async_client, "Recent", days_ago=1)
+        await async_client.post("/tasks/", json={"title": "Open"})
+
+        moved = await archive.archive_once(
+            30, batch_size=2, session_factory=TestingSessionLocal)
+
+        assert moved == 3
+        assert await archived_uuids() == set(old)
+        listed = await async_client.get("/tasks/")
+        assert {task["title"] for task in listed.json()} == {"Recent", "Open"}
+        stats = await async_client.get("/tasks/stats")
+        assert stats.json()["counts"]["completed"] == 4
+        response = await async_client.get(f"/tasks/{old[0]}")
+        assert response.status_code == 200
+        assert response.json()["title"] == "Old 0"
+        assert recent not in await archived_uuids()
+
+    async def test_list_include_archived(self, async_client):
+        """Тест списка вместе с архивом в общем порядке и по курсору."""
+        archived = await complete_task(async_client, "Archived", days_ago=40)
+        await async_client.post("/tasks/", json={"title": "Hot"})
+        await archive.archive_once(30, 100, TestingSessionLocal)
+
+        first = await async_client.get(
+            "/tasks/", params={"include_archived": True, "limit": 1})
+        second = await async_client.get("/tasks/", params={
+            "include_archived": True, "limit": 1,
+            "after": first.headers["X-Next-Cursor"]})
+        searched = await async_client.get(
+            "/tasks/", params={"include_archived": True, "q": "archived"})
+
+        assert [task["uuid"] for task in first.json()] == [archived]
+        assert [task["title"] for task in second.json()] == ["Hot"]
+        assert [task["uuid"] for task in searched.json()] == [archived]
+
+    async def test_reopen_restores_task(self, async_client):
+        """Тест возврата задачи из архива при переходе в in_progress."""
+        task_uuid = await complete_task(async_client, "Task", days_ago=40)
+        await archive.archive_once(30, 100, TestingSessionLocal)
+
+        invalid = await async_client.put(
+            f"/tasks/{task_uuid}", json={"status": "created"})
+        assert invalid.status_code == 400
+        assert await archived_uuids() == {task_uuid}
+
+        response = await async_client.put(
+            f"/tasks/{task_uuid}", json={"status": "in_progress"})
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "in_progress"
+        assert await archived_uuids() == set()
+        async with TestingSessionLocal() as session:
+            task = await session.get(models.Task, UUID(task_uuid))
+        assert task is not None and task.completed_at is None
+
+    async def test_edit_keeps_task_archived(self, async_client):
+        """Тест изменения задачи архива без смены статуса."""
+        task_uuid = await complete_task(async_client, "Task", days_ago=40)
+        other = await complete_task(async_client, "Other", days_ago=40)
+        await archive.archive_once(30, 100, TestingSessionLocal)
+
+        response = await async_client.put(f"/tasks/{task_uuid}", json={
+            "title": "Renamed", "status": "completed"})
+        batch = await async_client.patch("/tasks/batch", json={"items": [
+            {"uuid": other, "description": "Note"}]})
+
+        assert response.status_code == 200
+        assert response.json()["title"] == "Renamed"
+        assert response.headers["ETag"] == '"2"'
+        assert batch.json()["results"][0]["task"]["description"] == "Note"
+        assert await archived_uuids() == {task_uuid, other}
+        stale = await async_client.put(
+            f"/tasks/{task_uuid}", json={"title": "Stale"},
+            headers={"If-Match": '"1"'})
+        assert stale.status_code == 412
+
+    async def test_update_after_concurrent_restore(self, async_client):
+        """Тест обновления задачи, уже возвращенной из архива."""
+        task_uuid = await complete_task(async_client, "Task", days_ago=40)
+        await archive.archive_once(30, 100, TestingSessionLocal)
+        await async_client.put(
+            f"/tasks/{task_uuid}", json={"status": "in_progress"})
+
+        async with TestingSessionLocal() as session:
+            db_task = await crud.TaskCRUD(session)._update_archived(
+                UUID(task_uuid), {"title": "Renamed"}, None)
+
+        assert isinstance(db_task, models.Task)
+        assert (db_task.title, db_task.version) == ("Renamed", 3)
+
+    async def test_delete_archived_task(self, async_client):
+        """Тест удаления задачи из архива."""
+        task_uuid = await complete_task(async_client, "Task", days_ago=40)
+        await archive.archive_once(30, 100, TestingSessionLocal)
+
+        response = await async_client.delete(f"/tasks/{task_uuid}")
+
+        assert response.status_code == 204
+        assert await archived_uuids() == set()
+        stats = await async_client.get("/tasks/stats")
+        assert stats.json()["total"] == 0
+
+    async def test_archive_publishes_reset(self, async_client):
+        """Тест одного события reset после переноса всех пакетов."""
+        for title in ("Task 1", "Task 2"):
+            await complete_task(async_client, title, days_ago=40)
+        subscription = await task_events.subscribe()
+        try:
+            await archive.archive_once(30, 1, TestingSessionLocal)
+            events = [await subscription.get(0.1) for _ in range(2)]
+        finally:
+            task_events.unsubscribe(subscription)
+
+        assert events[0].type == RESET
+        assert events[1] is None
+
+    async def test_batch_paths_see_archive(self, async_client):
+        """Тест пакетного обновления и удаления задач архива."""
+        reopened, invalid, removed = [
+            await complete_task(async_client, f"Task {index}", days_ago=40)
+            for index in range(3)]
+        await archive.archive_once(30, 100, TestingSessionLocal)
+
+        response = await async_client.patch("/tasks/batch", json={"items": [
+            {"uuid": reopened, "status": "in_progress"},
+            {"uuid": invalid, "status": "created"},
+        ]})
+        deleted = await async_client.request(
+            "DELETE", "/tasks/batch", json={"uuids": [removed]})
+
+        results = response.json()["results"]
+        assert [result["status_code"] for result in results] == [200, 400]
+        assert results[0]["task"]["status"] == "in_progress"
+        assert deleted.json()["results"][0]["status_code"] == 204
+        assert await archived_uuids() == {invalid}
+        stats = await async_client.get("/tasks/stats")
+        assert stats.json()["counts"] == {
+            "created": 0, "in_progress": 1, "completed": 1}
+
+    async def test_transition_restores_archived(self, async_client):
+        """Тест массового перехода задач архива в in_progress."""
+        archived = await complete_task(async_client, "Old", days_ago=40)
+        await complete_task(async_client, "Recent", days_ago=1)
+        await archive.archive_once(30, 100, TestingSessionLocal)
+
+        skipped = await async_client.post("/tasks/transition", json={
+            "status": "completed", "target": "completed"})
+        response = await async_client.post("/tasks/transition", json={
+            "status": "completed", "target": "in_progress",
+            "chunk_size": 1})
+
+        assert skipped.json()["skipped"] == 2
+        assert response.json() == {
+            "matched": 2, "changed": 2, "skipped": 0, "dry_run": False}
+        assert await archived_uuids() == set()
+        task = await async_client.get(f"/tasks/{archived}")
+        assert task.json()["status"] == "in_progress"
+
+    async def test_transition_restores_in_chunks(
+            self, async_client, monkeypatch):
+        """Тест возврата архива порциями и без chunk_size."""
+        monkeypatch.setattr(schemas, "TRANSITION_CHUNK_SIZE", 1)
+        for title in ("Task 1", "Task 2"):
+            await complete_task(async_client, title, days_ago=40)
+        await archive.archive_once(30, 100, TestingSessionLocal)
+
+        response = await async_client.post("/tasks/transition", json={
+            "status": "completed", "target": "in_progress",
+            "chunk_size": None})
+
+        assert response.json()["changed"] == 2
+        assert await archived_uuids() == set()
+
+    async def test_completed_at_follows_status(self, async_client):
+        """Тест заполнения и сброса времени завершения задачи."""
+        created = await async_client.post("/tasks/", json={"title": "Task"})
+        task_uuid = created.json()["uuid"]
+
+        await async_client.put(
+            f"/tasks/{task_uuid}", json={"status": "completed"})
+        async with TestingSessionLocal() as session:
+            completed = await session.get(models.Task, UUID(task_uuid))
+        await async_client.put(
+            f"/tasks/{task_uuid}", json={"status": "in_progress"})
+        async with TestingSessionLocal() as session:
+            reopened = await session.get(models.Task, UUID(task_uuid))
+
+        assert completed.completed_at is not None
+        assert reopened.completed_at is None
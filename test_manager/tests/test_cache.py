@@ -0,0 +1,180 @@
+"""Модуль с тестами для кэша чтения задач."""
+
+import time
+
+import pytest
+
+from app import models
+from app.cache import (
+    InMemorySharedClient, LRUCache, RedisCacheClient, SharedCache, TaskCache,
+    create_task_cache, task_cache
+)
+from app.config import Settings
+
+
+class TestCacheFactory:
+    """Класс тестов для выбора хранилища кэша по настройкам."""
+
+    def test_backends(self):
+        """Тест локального и общего хранилища."""
+        local = create_task_cache(Settings(cache_backend="local"))
+        pytest.importorskip("redis")
+        shared = create_task_cache(Settings(
+            cache_backend="redis", cache_url="redis://cache:6379/1"))
+
+        assert isinstance(local.backend, LRUCache)
+        assert isinstance(shared.backend, SharedCache)
+        assert isinstance(shared.backend.client, RedisCacheClient)
+
+    def test_unknown_backend(self):
+        """Тест отказа для неизвестного хранилища."""
+        with pytest.raises(ValueError):
+            create_task_cache(Settings(cache_backend="memcached"))
+
+
+@pytest.mark.asyncio
+class TestTaskCache:
+    """Класс тестов для хранилищ кэша задач."""
+
+    @pytest.fixture(params=["lru", "shared"])
+    def cache(self, request):
+        """Фикстура кэша задач для каждого хранилища."""
+        if request.param == "lru":
+            return TaskCache(LRUCache(maxsize=2, ttl=60))
+        return TaskCache(SharedCache(InMemorySharedClient(), ttl=60))
+
+    async def test_hit_and_miss(self, cache, make_task):
+        """Тест попадания и промаха кэша."""
+        task = make_task()
+
+        assert await cache.get(task.uuid) is None
+        await cache.set(task)
+        cached = await cache.get(task.uuid)
+
+        assert cached.title == task.title
+        assert cached.status == task.status
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    async def test_patch_many(self, cache, make_task):
+        """Тест обновления полей следующей версией или инвалидации."""
+        task, other, cold = make_task(), make_task(), make_task()
+        await cache.set(task)
+        await cache.set(other)
+
+        await cache.patch_many([
+            (task.uuid, 2, {"status": "completed"}),
+            (other.uuid, 3, {"status": "completed"}),
+            (cold.uuid, 2, {"status": "completed"}),
+        ])
+
+        patched = await cache.get(task.uuid)
+        assert (patched.version, patched.status) == (
+            2, models.TaskStatus.COMPLETED)
+        assert patched.title == task.title
+        assert await cache.get(other.uuid) is None
+        assert await cache.backend.peek_many([str(cold.uuid)]) == {}
+
+    async def test_patch_many_batches_shared_calls(self, make_task):
+        """Тест одного чтения и одной записи общего хранилища на порцию."""
+        client = InMemorySharedClient()
+        calls = []
+
+        class RecordingClient:
+            """Клиент, записывающий имена вызванных методов."""
+
+            def __getattr__(self, name):
+                calls.append(name)
+                return getattr(client, name)
+
+        cache = TaskCache(SharedCache(RecordingClient(), ttl=60))
+        tasks = [make_task() for _ in range(3)]
+        for task in tasks:
+            await cache.set(task)
+        calls.clear()
+
+        await cache.patch_many(
+            [(task.uuid, 2, {"status": "completed"}) for task in tasks])
+
+        assert calls == ["get_many", "set_many"]
+
+    async def test_stale_write_is_ignored(self, cache, make_task):
+        """Тест отбрасывания записи устаревшей версии."""
+        task = make_task(version=2, title="New")
+        stale = models.Task(
+            uuid=task.uuid, title="Old", description=None,
+            status=task.status, created_at=task.created_at,
+            updated_at=task.updated_at, version=1)
+
+        await cache.set(task)
+        await cache.set(stale)
+
+        assert (await cache.get(task.uuid)).title == "New"
+
+    async def test_invalidate(self, cache, make_task):
+        """Тест инвалидации задачи."""
+        task = make_task()
+        await cache.set(task)
+        await cache.invalidate(task.uuid)
+        await cache.set(task)
+
+        assert await cache.get(task.uuid) is None
+
+    async def test_lru_eviction(self, make_task):
+        """Тест вытеснения по размеру и по TTL."""
+        backend = LRUCache(maxsize=2, ttl=60)
+        cache = TaskCache(backend)
+        first, second, third = make_task(), make_task(), make_task()
+
+        await cache.set(first)
+        await cache.set(second)
+        await cache.get(first.uuid)
+        await cache.set(third)
+
+        assert await cache.get(second.uuid) is None
+        assert await cache.get(first.uuid) is not None
+        assert backend.stats()["evictions"] == 1
+
+    async def test_lru_expiration(self, make_task):
+        """Тест истечения TTL записи."""
+        backend = LRUCache(maxsize=2, ttl=0)
+        cache = TaskCache(backend)
+        task = make_task()
+
+        await cache.set(task)
+        time.sleep(0.001)
+
+        assert await cache.get(task.uuid) is None
+        assert backend.stats()["size"] == 0
+        assert backend.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+class TestTaskCacheAPI:
+    """Класс тестов кэша задач через API."""
+
+    async def test_cache_invalidated_on_write(self, async_client):
+        """Тест согласованности кэша при обновлении и удалении."""
+        create_response = await async_client.post(
+            "/tasks/", json={"title": "Task"})
+        task_uuid = create_response.json()["uuid"]
+        hits = task_cache.stats()["hits"]
+
+        await async_client.get(f"/tasks/{task_uuid}")
+        await async_client.put(
+            f"/tasks/{task_uuid}", json={"title": "Updated"})
+        get_response = await async_client.get(f"/tasks/{task_uuid}")
+
+        assert get_response.json()["title"] == "Updated"
+        assert task_cache.stats()["hits"] == hits + 2
+
+        await async_client.delete(f"/tasks/{task_uuid}")
+        get_response = await async_client.get(f"/tasks/{task_uuid}")
+        assert get_response.status_code == 404
+
+    async def test_cache_stats_endpoint(self, async_client):
+        """Тест эндпоинта статистики кэша."""
+        response = await async_client.get("/internal/cache")
+
+        assert response.status_code == 200
+        assert {"hits", "misses", "evictions"} <= set(response.json())
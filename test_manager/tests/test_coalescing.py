@@ -0,0 +1,107 @@
+"""Модуль с тестами для объединения созданий задач в одну транзакцию."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app import crud, main, models, schemas
+from app.cache import task_cache
+from app.coalescing import TaskCreateCoalescer
+from app.metrics import http_metrics
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.mark.asyncio
+class TestTaskCreateCoalescer:
+    """Класс тестов для групповой фиксации созданий задач."""
+
+    async def test_concurrent_creates_share_batch(self, test_db):
+        """Тест объединения конкурентных созданий в один пакет."""
+        http_metrics.clear()
+        coalescer = TaskCreateCoalescer(TestingSessionLocal, window_ms=50)
+
+        tasks = await asyncio.gather(*(
+            coalescer.create_task(schemas.TaskCreate(title=f"Task {index}"))
+            for index in range(10)
+        ))
+
+        assert [task.title for task in tasks] == [
+            f"Task {index}" for index in range(10)]
+        assert len({task.uuid for task in tasks}) == 10
+        assert "write_coalesced_batch_size_count" \
+            '{operation="create"} 1' in http_metrics.render()
+        async with TestingSessionLocal() as session:
+            stats = await crud.TaskCRUD(session).get_stats()
+        assert stats.total == 10
+
+    async def test_max_batch_flushes_without_window(self, test_db):
+        """Тест немедленной записи пакета при наборе max_batch."""
+        coalescer = TaskCreateCoalescer(
+            TestingSessionLocal, window_ms=60000, max_batch=3)
+
+        tasks = await asyncio.wait_for(asyncio.gather(*(
+            coalescer.create_task(schemas.TaskCreate(title="Task"))
+            for _ in range(3)
+        )), timeout=5)
+
+        assert len(tasks) == 3
+
+    async def test_error_isolated_to_caller(self, test_db, monkeypatch):
+        """Тест ошибки только у вызывающего с некорректной строкой."""
+        insert_tasks = crud.TaskCRUD.insert_tasks
+
+        async def failing_insert(self, rows):
+            if any(row["title"] == "fail" for row in rows):
+                raise ValueError("constraint violated")
+            return await insert_tasks(self, rows)
+
+        monkeypatch.setattr(crud.TaskCRUD, "insert_tasks", failing_insert)
+        coalescer = TaskCreateCoalescer(TestingSessionLocal, window_ms=50)
+
+        results = await asyncio.gather(*(
+            coalescer.create_task(schemas.TaskCreate(title=title))
+            for title in ("ok 1", "fail", "ok 2")
+        ), return_exceptions=True)
+
+        assert results[0].title == "ok 1"
+        assert isinstance(results[1], ValueError)
+        assert results[2].title == "ok 2"
+
+    async def test_cache_error_after_commit(self, test_db, monkeypatch):
+        """Тест ошибки кэша после фиксации без повторной вставки."""
+        async def failing_set(task):
+            raise ConnectionError("cache is down")
+
+        monkeypatch.setattr(task_cache, "set", failing_set)
+        coalescer = TaskCreateCoalescer(TestingSessionLocal, window_ms=50)
+
+        tasks = await asyncio.gather(*(
+            coalescer.create_task(schemas.TaskCreate(title=f"Task {index}"))
+            for index in range(3)
+        ))
+
+        assert [task.title for task in tasks] == [
+            "Task 0", "Task 1", "Task 2"]
+        async with TestingSessionLocal() as session:
+            count = await session.scalar(
+                select(func.count()).select_from(models.Task))
+            single = await crud.TaskCRUD(session).create_task(
+                schemas.TaskCreate(title="Single"))
+        assert count == 3
+        assert single.title == "Single"
+
+    async def test_api_create_with_coalescing(
+            self, async_client, monkeypatch):
+        """Тест создания задач через API в режиме объединения записей."""
+        monkeypatch.setattr(main, "create_coalescer", TaskCreateCoalescer(
+            TestingSessionLocal, window_ms=20))
+
+        responses = await asyncio.gather(*(
+            async_client.post("/tasks/", json={"title": f"Task {index}"})
+            for index in range(5)
+        ))
+
+        assert [response.status_code for response in responses] == [201] * 5
+        assert all(response.headers["ETag"] == '"1"'
+                   for response in responses)
@@ -0,0 +1,305 @@
+"""Модуль с тестами для ленты изменений задач."""
+
+import asyncio
+import json
+from uuid import uuid4
+
+import asyncpg
+import pytest
+from sqlalchemy import func, select
+
+from app import crud, models, schemas
+from app.events import (
+    CREATED, DELETED, RESET, UPDATED, ChannelEventBackend, EventBackend,
+    EventBroker, InMemoryEventChannel, PostgresNotifyChannel, sse_stream,
+    task_events
+)
+from tests.conftest import TestingSessionLocal
+
+
+class FailingBackend(EventBackend):
+    """Канал, отправка в который всегда завершается ошибкой."""
+
+    async def start(self, deliver, lost=None) -> None:
+        """Подписывает брокер на сообщения канала."""
+
+    async def publish(self, messages: list[dict]) -> None:
+        """Отправляет сообщения всем подписанным брокерам."""
+        raise ConnectionError("channel is down")
+
+
+class TransactionalChannel:
+    """Транзакционный канал, записывающий состояние транзакции."""
+
+    transactional = True
+
+    def __init__(self, error: Exception = None):
+        """Инициализация класса TransactionalChannel."""
+        self.error = error
+        self.sent = []
+
+    async def listen(self, callback, reconnected=None) -> None:
+        """Подписывается на сообщения канала."""
+
+    async def notify(self, payload: str, session=None) -> None:
+        """Записывает сообщение и то, открыта ли транзакция."""
+        if self.error is not None:
+            raise self.error
+        self.sent.append((payload, session.in_transaction()))
+
+    async def close(self) -> None:
+        """Закрывает соединения канала."""
+
+
+class FakeSession:
+    """Сессия, записывающая выполненные запросы."""
+
+    def __init__(self):
+        """Инициализация класса FakeSession."""
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        """Записывает запрос и его параметры."""
+        self.statements.append((str(statement), params))
+
+
+class FakeConnection:
+    """Соединение asyncpg с ручным обрывом."""
+
+    def __init__(self):
+        """Инициализация класса FakeConnection."""
+        self.listeners = {}
+        self.on_terminate = None
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        """Подписывается на канал."""
+        self.listeners[channel] = callback
+
+    def add_termination_listener(self, callback):
+        """Регистрирует обработчик обрыва."""
+        self.on_terminate = callback
+
+    def terminate(self):
+        """Обрывает соединение."""
+        self.closed = True
+        self.on_terminate(self)
+
+    async def close(self):
+        """Закрывает соединение."""
+        self.closed = True
+
+
+@pytest.mark.asyncio
+class TestEventBroker:
+    """Класс тестов для рассылки событий и возобновления."""
+
+    async def test_publish_and_resume(self, make_task):
+        """Тест доставки события и дочитывания истории по Last-Event-ID."""
+        broker = EventBroker()
+        subscription = await broker.subscribe()
+        task = make_task()
+
+        await broker.publish(1, [(CREATED, task)])
+        await broker.publish(2, [(UPDATED, task), (DELETED, task.uuid)])
+
+        event = await subscription.get(1)
+        assert (event.id, event.type, event.uuid) == (
+            "1-0", CREATED, str(task.uuid))
+        assert event.task["title"] == "Task"
+
+        resumed = await broker.subscribe("1-0")
+        replayed = [await resumed.get(1) for _ in range(2)]
+        assert [event.id for event in replayed] == ["2-0", "2-1"]
+        assert replayed[1].task is None
+
+    async def test_resume_in_arrival_order(self, make_task):
+        """Тест дочитывания истории, если номера пришли не по порядку."""
+        broker = EventBroker()
+        for revision in (1, 3, 2, 4):
+            await broker.publish(revision, [(CREATED, make_task())])
+
+        resumed = await broker.subscribe("3-0")
+        replayed = [await resumed.get(1) for _ in range(2)]
+
+        assert [event.id for event in replayed] == ["2-0", "4-0"]
+        assert await resumed.get(0.01) is None
+
+    async def test_resume_outside_history(self, make_task):
+        """Тест события reset, если пропущенные события вытеснены."""
+        broker = EventBroker(history_size=2)
+        for revision in range(1, 5):
+            await broker.publish(revision, [(CREATED, make_task())])
+
+        subscription = await broker.subscribe("1-0")
+        reset = await subscription.get(1)
+
+        assert (reset.type, reset.id) == (RESET, "4-0")
+        resumed = await broker.subscribe(reset.id)
+        assert await resumed.get(0.01) is None
+
+    async def test_resume_without_history(self):
+        """Тест reset для брокера без истории, если клиент отстал."""
+        broker = EventBroker()
+
+        behind = await broker.subscribe("3-0", revision=5)
+        current = await broker.subscribe("5-0", revision=5)
+
+        reset = await behind.get(1)
+        assert (reset.type, reset.id) == (RESET, "5-0")
+        assert await current.get(0.01) is None
+        stream = sse_stream(broker, "3-0", revision=5)
+        assert (await stream.__anext__()).startswith(b"id: 5-0\nevent: reset")
+        await stream.aclose()
+
+    async def test_slow_consumer_reset(self, make_task):
+        """Тест сброса очереди медленного подписчика."""
+        broker = EventBroker(queue_size=2)
+        subscription = await broker.subscribe()
+        for revision in range(1, 5):
+            await broker.publish(revision, [(CREATED, make_task())])
+
+        assert subscription.overflowed
+        assert (await subscription.get(1)).type == RESET
+        assert await subscription.get(0.01) is None
+
+    async def test_shared_channel(self, make_task):
+        """Тест доставки событий брокерам всех процессов через канал."""
+        channel = InMemoryEventChannel()
+        brokers = [
+            EventBroker(ChannelEventBackend(channel, payload_limit=400))
+            for _ in range(2)
+        ]
+        subscriptions = [await broker.subscribe() for broker in brokers]
+        tasks = [make_task(), make_task("x" * 500)]
+
+        await brokers[0].publish(
+            7, [(CREATED, tasks[0]), (CREATED, tasks[1])])
+
+        for subscription in subscriptions:
+            first, second = [await subscription.get(1) for _ in range(2)]
+            assert first.task["uuid"] == str(tasks[0].uuid)
+            assert (second.uuid, second.task) == (str(tasks[1].uuid), None)
+
+    async def test_publish_failure(self, make_task):
+        """Тест reset вместо ошибки, если канал недоступен."""
+        broker = EventBroker(FailingBackend())
+        subscription = await broker.subscribe()
+
+        await broker.publish(4, [(CREATED, make_task())])
+
+        reset = await subscription.get(1)
+        assert (reset.type, reset.id) == (RESET, "4-0")
+        assert broker.stats()["failed"] == 1
+
+    async def test_listener_reconnect(self, monkeypatch):
+        """Тест переподключения слушателя и reset после разрыва."""
+        connections = []
+
+        async def connect(dsn):
+            if len(connections) == 1:
+                connections.append(None)
+                raise OSError("connection refused")
+            connections.append(FakeConnection())
+            return connections[-1]
+
+        monkeypatch.setattr(asyncpg, "connect", connect)
+        monkeypatch.setattr("app.events.RECONNECT_DELAY", 0.01)
+        channel = PostgresNotifyChannel("postgresql://db/taskdb")
+        broker = EventBroker(ChannelEventBackend(channel))
+        subscription = await broker.subscribe()
+
+        connections[0].terminate()
+        for _ in range(100):
+            if channel.reconnects:
+                break
+            await asyncio.sleep(0.01)
+
+        assert channel.reconnects == 1
+        assert (await subscription.get(1)).type == RESET
+        connections[-1].listeners["task_events"](
+            None, 1, "task_events",
+            '[{"revision": 9, "index": 0, "type": "deleted"}]')
+        assert broker.history[-1].id == "9-0"
+        await channel.close()
+
+    async def test_notify_in_transaction(self):
+        """Тест NOTIFY через сессию записи, а не отдельное соединение."""
+        channel = PostgresNotifyChannel("postgresql://db/taskdb")
+        session = FakeSession()
+
+        await channel.notify("payload", session)
+
+        assert session.statements == [(
+            "SELECT pg_notify(:channel, :payload)",
+            {"channel": "task_events", "payload": "payload"})]
+        with pytest.raises(ValueError):
+            await channel.notify("payload")
+
+    async def test_sse_format(self):
+        """Тест формата text/event-stream и комментария при простое."""
+        broker = EventBroker()
+        stream = sse_stream(broker, heartbeat=0.01)
+
+        assert await stream.__anext__() == b": keep-alive\n\n"
+        await broker.publish(3, [(DELETED, uuid4())])
+        chunk = await stream.__anext__()
+        await stream.aclose()
+
+        assert chunk.startswith(b"id: 3-0\nevent: deleted\ndata: {")
+        assert broker.stats()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+class TestTaskEventsAPI:
+    """Класс тестов для публикации событий при записи через API."""
+
+    async def test_write_events(self, async_client):
+        """Тест событий создания, обновления и удаления задачи."""
+        subscription = await task_events.subscribe()
+        try:
+            created = await async_client.post(
+                "/tasks/", json={"title": "Задача"})
+            task_uuid = created.json()["uuid"]
+            await async_client.put(
+                f"/tasks/{task_uuid}", json={"title": "Новая"})
+            await async_client.delete(f"/tasks/{task_uuid}")
+
+            events = [await subscription.get(1) for _ in range(3)]
+        finally:
+            task_events.unsubscribe(subscription)
+
+        assert [event.type for event in events] == [CREATED, UPDATED, DELETED]
+        assert {event.uuid for event in events} == {task_uuid}
+        assert events[1].task["title"] == "Новая"
+        assert events[0].revision < events[1].revision < events[2].revision
+
+    async def test_transactional_channel(self, test_db):
+        """Тест отправки событий до фиксации и отмены записи при ошибке."""
+        channel = TransactionalChannel()
+        broker = EventBroker(ChannelEventBackend(channel))
+        async with TestingSessionLocal() as session:
+            task = await crud.TaskCRUD(session, events=broker).create_task(
+                schemas.TaskCreate(title="Задача"))
+
+        assert [in_transaction for _, in_transaction in channel.sent] == [
+            True]
+        assert json.loads(channel.sent[0][0])[0]["uuid"] == str(task.uuid)
+
+        broker = EventBroker(ChannelEventBackend(
+            TransactionalChannel(ConnectionError("channel is down"))))
+        async with TestingSessionLocal() as session:
+            with pytest.raises(ConnectionError):
+                await crud.TaskCRUD(session, events=broker).create_task(
+                    schemas.TaskCreate(title="Потерянная"))
+        async with TestingSessionLocal() as session:
+            count = await session.scalar(
+                select(func.count()).select_from(models.Task))
+        assert count == 1
+
+    async def test_invalid_event_id(self, async_client):
+        """Тест ошибки 400 для неверного Last-Event-ID."""
+        response = await async_client.get(
+            "/tasks/events", headers={"Last-Event-ID": "abc"})
+
+        assert response.status_code == 400
@@ -0,0 +1,91 @@
+"""Модуль с тестами для двоичных форматов списка и выгрузки задач."""
+
+from uuid import UUID
+
+import pytest
+
+from app import formats
+
+msgpack = pytest.importorskip("msgpack")
+pa = pytest.importorskip("pyarrow")
+
+
+class TestNegotiate:
+    """Класс тестов для выбора формата по заголовку Accept."""
+
+    @pytest.mark.parametrize("accept, expected", [
+        (None, formats.JSON),
+        ("*/*", formats.JSON),
+        ("application/x-msgpack", formats.MSGPACK),
+        ("application/json;q=0.5, application/vnd.apache.arrow.stream",
+         formats.ARROW_STREAM),
+        ("application/*;q=0.2, application/msgpack;q=0", formats.JSON),
+        ("text/html", formats.JSON),
+    ])
+    def test_negotiate(self, accept, expected):
+        """Тест выбора формата с учетом q и точности диапазона."""
+        assert formats.negotiate(accept, formats.LIST_MEDIA_TYPES) == expected
+
+
+@pytest.mark.asyncio
+class TestFormatsAPI:
+    """Класс тестов для ответов API в двоичных форматах."""
+
+    @pytest.fixture(autouse=True)
+    async def setup(self, async_client):
+        """Фикстура с тремя задачами."""
+        self.client = async_client
+        for index, task_status in enumerate(
+                ("created", "completed", "created")):
+            await async_client.post("/tasks/", json={
+                "title": f"Task {index}", "description": f"Body {index}",
+                "status": task_status})
+
+    async def test_list_msgpack(self):
+        """Тест совпадения ответа MessagePack с JSON."""
+        params = {"fields": "*"}
+        json_response = await self.client.get("/tasks/", params=params)
+        response = await self.client.get("/tasks/", params=params, headers={
+            "Accept": formats.MSGPACK})
+
+        assert response.headers["content-type"] == formats.MSGPACK
+        assert response.headers["vary"] == "Accept"
+        assert response.headers["ETag"] != json_response.headers["ETag"]
+        assert msgpack.unpackb(response.content) == json_response.json()
+
+    async def test_list_arrow(self):
+        """Тест колоночного ответа Arrow со словарным статусом."""
+        json_response = await self.client.get("/tasks/")
+        response = await self.client.get("/tasks/", headers={
+            "Accept": formats.ARROW_STREAM})
+
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.schema.names == ["title", "status", "uuid"]
+        assert pa.types.is_dictionary(table.schema.field("status").type)
+        assert table.schema.field("uuid").type == pa.binary(16)
+        assert [
+            {**row, "uuid": str(UUID(bytes=row["uuid"]))}
+            for row in table.to_pylist()
+        ] == json_response.json()
+
+    async def test_export_arrow_batches(self):
+        """Тест выгрузки Arrow пакетом колонок на порцию строк."""
+        response = await self.client.get(
+            "/tasks/export", params={"batch_size": 2},
+            headers={"Accept": formats.ARROW_STREAM})
+
+        reader = pa.ipc.open_stream(response.content)
+        batches = list(reader)
+        assert [batch.num_rows for batch in batches] == [2, 1]
+        assert pa.Table.from_batches(batches).column(
+            "description").to_pylist() == ["Body 0", "Body 1", "Body 2"]
+
+    async def test_export_msgpack_stream(self):
+        """Тест выгрузки последовательностью значений MessagePack."""
+        response = await self.client.get(
+            "/tasks/export", headers={"Accept": formats.MSGPACK})
+
+        unpacker = msgpack.Unpacker()
+        unpacker.feed(response.content)
+        assert [task["title"] for task in unpacker] == [
+            "Task 0", "Task 1", "Task 2"]
@@ -0,0 +1,126 @@
+"""Модуль с тестами для прогрева, проб готовности и останова сервера."""
+
+import asyncio
+import signal
+
+import pytest
+import uvicorn
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app import main, server
+from app.config import Settings
+from app.database import Base
+from app.instrumentation import pool_value
+from app.lifecycle import Lifecycle
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.mark.asyncio
+class TestLifecycle:
+    """Класс тестов для прогрева рабочего процесса."""
+
+    async def test_warmup_fills_pool(self, tmp_path):
+        """Тест прогрева пула соединений и запросов."""
+        pooled = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pooled.db'}",
+            poolclass=AsyncAdaptedQueuePool, pool_size=3)
+        async with pooled.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        lifecycle = Lifecycle()
+
+        assert await lifecycle.warmup([pooled], TestingSessionLocal)
+
+        assert lifecycle.ready
+        assert pool_value(pooled.pool, "checkedin") == 3
+        await pooled.dispose()
+
+    async def test_warmup_failure_keeps_unready(self, tmp_path):
+        """Тест неготовности процесса при недоступной базе."""
+        missing = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'db.sqlite'}")
+        lifecycle = Lifecycle()
+
+        assert not await lifecycle.warmup([missing], TestingSessionLocal)
+        assert not lifecycle.ready
+
+
+@pytest.mark.asyncio
+class TestHealthAPI:
+    """Класс тестов для проб живости и готовности."""
+
+    async def test_readiness_follows_draining(self, async_client,
+                                              monkeypatch):
+        """Тест отказа пробы готовности после начала останова."""
+        lifecycle = Lifecycle()
+        lifecycle.warmed = True
+        monkeypatch.setattr(main, "lifecycle", lifecycle)
+
+        ready = await async_client.get("/health/ready")
+        lifecycle.start_draining()
+        draining = await async_client.get("/health/ready")
+        live = await async_client.get("/health/live")
+
+        assert ready.status_code == 200
+        assert draining.status_code == 503
+        assert draining.json()["draining"] is True
+        assert live.status_code == 200
+
+
+@pytest.mark.asyncio
+class TestDrainingServer:
+    """Класс тестов для останова сервера с выводом из балансировки."""
+
+    async def test_exit_after_drain(self, monkeypatch):
+        """Тест останова сервера только после паузы."""
+        lifecycle = Lifecycle()
+        monkeypatch.setattr(server, "lifecycle", lifecycle)
+        draining_server = server.DrainingServer(
+            uvicorn.Config(server.APP), drain_seconds=0.05)
+
+        draining_server.handle_exit(signal.SIGTERM, None)
+
+        assert lifecycle.draining
+        assert not draining_server.should_exit
+        await asyncio.sleep(0.1)
+        assert draining_server.should_exit
+
+    async def test_second_signal_exits(self, monkeypatch):
+        """Тест немедленного останова по повторному сигналу."""
+        monkeypatch.setattr(server, "lifecycle", Lifecycle())
+        draining_server = server.DrainingServer(
+            uvicorn.Config(server.APP), drain_seconds=10)
+
+        draining_server.handle_exit(signal.SIGTERM, None)
+        draining_server.handle_exit(signal.SIGTERM, None)
+
+        assert draining_server.should_exit
+
+
+class TestWorkers:
+    """Класс тестов для выбора числа рабочих процессов."""
+
+    def test_single_worker_without_shared_state(self):
+        """Тест одного процесса с локальным кэшем и событиями."""
+        settings = Settings(cache_backend="local", events_backend="local")
+
+        assert server.resolve_workers(settings) == 1
+        with pytest.raises(ValueError):
+            server.resolve_workers(settings, 2)
+
+    def test_workers_with_shared_state(self, monkeypatch):
+        """Тест процессов по числу ядер с общим кэшем и событиями."""
+        monkeypatch.setattr(server, "default_workers", lambda: 4)
+        settings = Settings(
+            cache_backend="redis", events_backend="postgres", web_workers=0)
+
+        assert server.resolve_workers(settings) == 4
+        assert server.resolve_workers(settings, 2) == 2
+
+    def test_pool_split_between_workers(self):
+        """Тест деления пула соединений между процессами."""
+        settings = Settings(
+            db_pool_size=10, db_max_overflow=10, web_workers=4)
+
+        assert settings.worker_pool_size == 2
+        assert settings.worker_max_overflow == 2
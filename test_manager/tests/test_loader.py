@@ -0,0 +1,103 @@
+"""Модуль с тестами для пакетного чтения задач по UUID."""
+
+import asyncio
+from uuid import UUID, uuid4
+
+import pytest
+
+from app import main
+from app.cache import task_cache
+from app.loader import TaskLoader
+from tests.conftest import TestingSessionLocal
+
+
+class CountingSessionFactory:
+    """Фабрика тестовых сессий, считающая открытые сессии."""
+
+    def __init__(self):
+        """Инициализация класса CountingSessionFactory."""
+        self.sessions = 0
+
+    def __call__(self, **kwargs):
+        """Открывает тестовую сессию."""
+        self.sessions += 1
+        return TestingSessionLocal(**kwargs)
+
+
+@pytest.mark.asyncio
+class TestTaskLookupAPI:
+    """Класс тестов для запроса задач по списку UUID."""
+
+    async def test_lookup(self, async_client):
+        """Тест порядка, повторов и отсутствующих UUID."""
+        uuids = []
+        for index in range(3):
+            response = await async_client.post(
+                "/tasks/", json={"title": f"Task {index}"})
+            uuids.append(response.json()["uuid"])
+        missing = str(uuid4())
+
+        response = await async_client.post("/tasks/lookup", json={
+            "uuids": [uuids[2], missing, uuids[0], uuids[2]]})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [task["uuid"] for task in data["tasks"]] == [
+            uuids[2], uuids[0]]
+        assert data["tasks"][0]["title"] == "Task 2"
+        assert data["missing"] == [missing]
+
+    async def test_lookup_limits(self, async_client):
+        """Тест отказа для пустого списка UUID."""
+        response = await async_client.post(
+            "/tasks/lookup", json={"uuids": []})
+
+        assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+class TestTaskLoader:
+    """Класс тестов для объединения одиночных чтений."""
+
+    async def test_concurrent_loads_share_query(self, async_client):
+        """Тест одной выборки для чтений одного такта."""
+        created = await async_client.post("/tasks/", json={"title": "Task"})
+        task_uuid = UUID(created.json()["uuid"])
+        sessions = CountingSessionFactory()
+        loader = TaskLoader(sessions)
+
+        results = await asyncio.gather(
+            loader.load(task_uuid), loader.load(uuid4()),
+            loader.load(task_uuid))
+
+        assert sessions.sessions == 1
+        assert loader.batches == 1
+        assert results[0].title == "Task"
+        assert results[1] is None
+        assert results[2] is results[0]
+
+    async def test_max_batch(self, async_client):
+        """Тест немедленной выборки заполненного пакета."""
+        loader = TaskLoader(CountingSessionFactory(), max_batch=2)
+
+        await asyncio.gather(*(loader.load(uuid4()) for _ in range(5)))
+
+        assert loader.batches == 3
+
+    async def test_get_task_uses_loader(self, async_client, monkeypatch):
+        """Тест загрузки промахов кэша GET /tasks/{uuid} пакетом."""
+        uuids = []
+        for index in range(3):
+            response = await async_client.post(
+                "/tasks/", json={"title": f"Task {index}"})
+            uuids.append(response.json()["uuid"])
+            await task_cache.invalidate(UUID(uuids[-1]))
+        loader = TaskLoader(CountingSessionFactory())
+        monkeypatch.setattr(main, "task_loader", loader)
+
+        responses = await asyncio.gather(*(
+            async_client.get(f"/tasks/{task_uuid}") for task_uuid in uuids))
+
+        assert [response.json()["uuid"] for response in responses] == uuids
+        assert loader.loads == 3
+        assert loader.batches == 1
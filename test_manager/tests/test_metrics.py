@@ -0,0 +1,84 @@
+"""Модуль с тестами для метрик HTTP-запросов и профилировщика."""
+
+import time
+
+import pytest
+
+from app.metrics import Histogram, SlowRequestProfiler, http_metrics
+
+
+class TestHistogram:
+    """Класс тестов для гистограммы метрик."""
+
+    def test_render_cumulative_buckets(self):
+        """Тест накопительных корзин, суммы и количества."""
+        histogram = Histogram("latency", "Latency.", ("route",), (0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(("/tasks/",), value)
+
+        lines = histogram.render()
+
+        assert 'latency_bucket{route="/tasks/",le="0.1"} 1' in lines
+        assert 'latency_bucket{route="/tasks/",le="1.0"} 2' in lines
+        assert 'latency_bucket{route="/tasks/",le="+Inf"} 3' in lines
+        assert 'latency_sum{route="/tasks/"} 5.55' in lines
+        assert 'latency_count{route="/tasks/"} 3' in lines
+
+
+@pytest.mark.asyncio
+class TestMetricsAPI:
+    """Класс тестов для эндпоинта метрик."""
+
+    async def test_metrics_by_route_template(self, async_client):
+        """Тест учета запросов по шаблону маршрута и числа запросов к БД."""
+        http_metrics.clear()
+        created = await async_client.post("/tasks/", json={"title": "Задача"})
+        await async_client.get(f"/tasks/{created.json()['uuid']}")
+        await async_client.get("/unknown")
+
+        response = await async_client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert ('http_request_duration_seconds_count{method="GET",'
+                'route="/tasks/{task_uuid}",status="200"} 1') in body
+        assert ('http_request_duration_seconds_count{method="GET",'
+                'route="unmatched",status="404"} 1') in body
+        assert ('http_request_db_statements_bucket{method="POST",'
+                'route="/tasks/",le="0"} 0') in body
+        assert "db_pool_acquisitions_total" in body
+
+
+class TestSlowRequestProfiler:
+    """Класс тестов для сэмплирующего профилировщика."""
+
+    def test_reports_slow_request(self):
+        """Тест отчета со стеками для запроса дольше порога."""
+        profiler = SlowRequestProfiler(threshold_ms=20, interval_ms=1)
+        reports = []
+        profiler.hooks.append(reports.append)
+
+        profiler.start_request()
+        started = time.perf_counter()
+        while time.perf_counter() - started < 0.1:
+            pass
+        profiler.finish_request(
+            "GET", "/tasks/", started, time.perf_counter() - started)
+
+        assert len(reports) == 1
+        assert reports[0]["route"] == "/tasks/"
+        assert reports[0]["samples"] > 0
+        stack, _ = reports[0]["top_stacks"][0]
+        assert any("test_reports_slow_request" in frame for frame in stack)
+
+    def test_fast_request_not_reported(self):
+        """Тест отсутствия отчета для быстрого запроса."""
+        profiler = SlowRequestProfiler(threshold_ms=1000)
+        reports = []
+        profiler.hooks.append(reports.append)
+
+        profiler.start_request()
+        profiler.finish_request("GET", "/tasks/", time.perf_counter(), 0.001)
+
+        assert reports == []
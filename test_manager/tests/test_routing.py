@@ -0,0 +1,123 @@
+"""Модуль с тестами для маршрутизации чтений между базами данных."""
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app import database
+from app.database import Base, get_db, get_read_db
+from app.main import app
+from app.routing import LEAST_BUSY, PRIMARY_COOKIE, ReplicaRouter
+from tests.conftest import TestingSessionLocal, engine
+
+
+@pytest.fixture
+async def replica(tmp_path):
+    """Фикстура отдельной базы SQLite в роли реплики."""
+    replica_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}",
+        poolclass=AsyncAdaptedQueuePool)
+    async with replica_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield replica_engine
+    await replica_engine.dispose()
+
+
+@pytest.mark.asyncio
+class TestReplicaRouter:
+    """Класс тестов для выбора базы данных для чтения."""
+
+    async def test_round_robin(self, replica, tmp_path):
+        """Тест поочередного выбора реплик."""
+        second = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'second.db'}")
+        router = ReplicaRouter(engine, [replica, second])
+
+        assert [router.choose() for _ in range(4)] == [
+            replica, second, replica, second]
+        assert ReplicaRouter(engine).choose() is engine
+
+    async def test_least_busy(self, replica, tmp_path):
+        """Тест выбора реплики с меньшим числом занятых соединений."""
+        second = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'second.db'}",
+            poolclass=AsyncAdaptedQueuePool)
+        router = ReplicaRouter(engine, [replica, second], LEAST_BUSY)
+
+        async with replica.connect():
+            assert {router.choose() for _ in range(4)} == {second}
+        await second.dispose()
+
+    async def test_unhealthy_replica_falls_back(self, test_db, tmp_path):
+        """Тест чтения с основной базы, если реплика недоступна."""
+        broken = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        router = ReplicaRouter(engine, [broken], retry_seconds=60)
+
+        session = await router.read_session(TestingSessionLocal)
+        async with session:
+            assert await session.scalar(text("SELECT 1")) == 1
+            assert session.get_bind() is engine.sync_engine
+
+        assert router.choose() is engine
+        stats = router.stats()
+        assert stats["fallbacks"] == 1
+        assert [item["healthy"] for item in stats["engines"]] == [True, False]
+
+    async def test_session_connects_lazily(self, replica):
+        """Тест сессии реплики без соединения до первого запроса."""
+        checkouts = []
+        event.listen(replica.sync_engine, "checkout",
+                     lambda *args: checkouts.append(args))
+        router = ReplicaRouter(engine, [replica])
+
+        session = await router.read_session(TestingSessionLocal)
+        async with session:
+            assert checkouts == []
+            await session.execute(text("SELECT 1"))
+
+        assert len(checkouts) == 1
+        assert session.get_bind() is replica.sync_engine
+
+
+@pytest.mark.asyncio
+class TestReadRoutingAPI:
+    """Класс тестов для чтения своих записей через API."""
+
+    async def test_read_your_writes(self, async_client, replica, monkeypatch):
+        """Тест чтения с основной базы после записи клиента."""
+        monkeypatch.setattr(database, "AsyncSessionLocal", TestingSessionLocal)
+        monkeypatch.setattr(
+            database, "read_router", ReplicaRouter(engine, [replica]))
+        app.dependency_overrides.pop(get_db)
+        app.dependency_overrides.pop(get_read_db)
+
+        created = await async_client.post("/tasks/", json={"title": "Задача"})
+        assert PRIMARY_COOKIE in created.cookies
+
+        sticky = await async_client.get("/tasks/")
+        async_client.cookies.clear()
+        routed = await async_client.get("/tasks/")
+
+        assert [task["uuid"] for task in sticky.json()] == [
+            created.json()["uuid"]]
+        assert routed.json() == []
+
+    async def test_cache_hit_skips_replica(
+            self, async_client, replica, monkeypatch):
+        """Тест чтения из кэша без соединения с репликой."""
+        checkouts = []
+        event.listen(replica.sync_engine, "checkout",
+                     lambda *args: checkouts.append(args))
+        monkeypatch.setattr(database, "AsyncSessionLocal", TestingSessionLocal)
+        monkeypatch.setattr(
+            database, "read_router", ReplicaRouter(engine, [replica]))
+        app.dependency_overrides.pop(get_read_db)
+
+        created = await async_client.post("/tasks/", json={"title": "Задача"})
+        async_client.cookies.clear()
+        response = await async_client.get(f"/tasks/{created.json()['uuid']}")
+
+        assert response.status_code == 200
+        assert checkouts == []
@@ -0,0 +1,110 @@
+"""Модуль с тестами для массового перехода задач в статус."""
+
+from datetime import timedelta
+
+import pytest
+
+from app import crud, models
+from app.events import RESET, task_events
+from tests.conftest import TestingSessionLocal
+
+
+async def get_revision() -> int:
+    """Возвращает счетчик изменений коллекции."""
+    async with TestingSessionLocal() as session:
+        return await crud.TaskCRUD(session).get_revision()
+
+
+@pytest.mark.asyncio
+class TestTaskTransitionAPI:
+    """Класс тестов для POST /tasks/transition."""
+
+    @pytest.fixture(autouse=True)
+    async def setup(self, async_client):
+        """Фикстура с задачами в разных статусах."""
+        self.client = async_client
+        self.uuids = {}
+        for title, task_status in (
+                ("Task 0", "created"), ("Task 1", "in_progress"),
+                ("Task 2", "in_progress"), ("Task 3", "in_progress"),
+                ("Report", "completed")):
+            response = await async_client.post("/tasks/", json={
+                "title": title, "status": task_status})
+            self.uuids[title] = response.json()["uuid"]
+
+    async def test_transition_in_chunks(self):
+        """Тест перехода порциями с обновлением счетчиков и кэша."""
+        cached = await self.client.get(f"/tasks/{self.uuids['Task 1']}")
+        revision = await get_revision()
+        subscription = await task_events.subscribe()
+
+        try:
+            response = await self.client.post("/tasks/transition", json={
+                "status": "in_progress", "target": "completed",
+                "chunk_size": 2})
+            events = [await subscription.get(0.1) for _ in range(2)]
+        finally:
+            task_events.unsubscribe(subscription)
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "matched": 3, "changed": 3, "skipped": 0, "dry_run": False}
+        assert await get_revision() == revision + 3
+        assert events[0].type == RESET
+        assert events[1] is None
+        task = await self.client.get(f"/tasks/{self.uuids['Task 1']}")
+        assert task.json()["status"] == "completed"
+        assert task.headers["ETag"] == '"2"'
+        assert task.headers["ETag"] != cached.headers["ETag"]
+        stats = await self.client.get("/tasks/stats")
+        assert stats.json()["counts"] == {
+            "created": 1, "in_progress": 0, "completed": 4}
+
+    async def test_invalid_predecessors_skipped(self):
+        """Тест пропуска задач в недопустимом и целевом статусе."""
+        response = await self.client.post("/tasks/transition", json={
+            "uuids": list(self.uuids.values()), "target": "in_progress",
+            "chunk_size": None})
+
+        assert response.json() == {
+            "matched": 5, "changed": 2, "skipped": 3, "dry_run": False}
+        listed = await self.client.get("/tasks/")
+        assert {task["title"]: task["status"] for task in listed.json()} == {
+            "Task 0": "in_progress", "Task 1": "in_progress",
+            "Task 2": "in_progress", "Task 3": "in_progress",
+            "Report": "in_progress"}
+
+        response = await self.client.post("/tasks/transition", json={
+            "status": "in_progress", "target": "created"})
+
+        assert response.json()["changed"] == 0
+        assert response.json()["skipped"] == 5
+
+    async def test_dry_run(self):
+        """Тест подсчета задач без записи."""
+        revision = await get_revision()
+
+        response = await self.client.post("/tasks/transition", json={
+            "q": "task", "target": "completed", "dry_run": True})
+
+        assert response.json() == {
+            "matched": 4, "changed": 4, "skipped": 0, "dry_run": True}
+        assert await get_revision() == revision
+        stats = await self.client.get("/tasks/stats")
+        assert stats.json()["counts"]["completed"] == 1
+
+    async def test_updated_before(self):
+        """Тест фильтра по времени последнего изменения."""
+        response = await self.client.post("/tasks/transition", json={
+            "status": "in_progress", "target": "completed",
+            "updated_before": (
+                models.utcnow() - timedelta(hours=1)).isoformat()})
+
+        assert response.json()["matched"] == 0
+
+    async def test_filter_required(self):
+        """Тест отказа без фильтра."""
+        response = await self.client.post(
+            "/tasks/transition", json={"target": "completed", "q": " "})
+
+        assert response.status_code == 422